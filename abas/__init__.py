@@ -0,0 +1,4 @@
+"""
+Abas do Empire Control. Cada modulo expoe render(cotacao_dolar) e so e
+executado quando e a aba ativa (ver a navegacao em app.py).
+"""
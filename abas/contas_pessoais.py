@@ -0,0 +1,126 @@
+"""
+Aba Contas Pessoais: despesas individuais dos socios.
+"""
+
+from datetime import date
+
+import streamlit as st
+import pandas as pd
+
+from dados import (
+    carregar_vendas,
+    carregar_despesas_pessoais,
+    salvar_despesa_pessoal,
+    limpar_despesas_pessoais_socio,
+)
+
+
+def render(cotacao_dolar):
+    """Desenha a aba (so roda quando ela e a aba ativa)."""
+    st.markdown("### 👥 Contas Pessoais dos Sócios")
+    st.markdown("Controle individual de despesas fixas - **não afeta o caixa da empresa**")
+    
+    # Calcula lucro para dividir 50/50
+    lucro_empresa = 0
+    if st.session_state.stipchat_data:
+        tokens = st.session_state.stipchat_data['tokens']
+        lucro_empresa += tokens * 0.05 * cotacao_dolar
+    
+    vendas_calculo = carregar_vendas()
+    if vendas_calculo:
+        lucro_empresa += sum(v.get('lucro', 0) for v in vendas_calculo)
+    
+    # Subtrai despesas da empresa
+    if len(st.session_state.despesas_df) > 0:
+        lucro_empresa -= st.session_state.despesas_df['valor'].sum()
+    
+    parte_cada = lucro_empresa / 2
+    
+    # Header com o lucro distribuido
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, rgba(30,30,30,0.9), rgba(50,50,50,0.7)); 
+                border-radius: 15px; padding: 20px; margin-bottom: 20px; border: 1px solid #333;">
+        <h4 style="color: #ffd700; margin: 0 0 10px 0;">💰 Distribuição do Lucro (50/50)</h4>
+        <p style="color: #888; margin: 0;">Lucro Líquido da Empresa: <span style="color: #00ff88; font-weight: bold;">R$ {lucro_empresa:,.2f}</span></p>
+        <p style="color: #888; margin: 5px 0 0 0;">Cada sócio recebe: <span style="color: #00ff88; font-weight: bold;">R$ {parte_cada:,.2f}</span></p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Duas colunas para cada socio - cada uma e um fragment: salvar/limpar
+    # despesa reroda so a coluna do socio (o lucro acima nao depende disso)
+    col_lkz, col_nad = st.columns(2)
+    
+    # ===== COLUNA LKZ =====
+    with col_lkz:
+        _coluna_socio("LKZ", parte_cada, cor="#00aaff", fundo="0,100,200")
+    
+    # ===== COLUNA NAD =====
+    with col_nad:
+        _coluna_socio("NAD", parte_cada, cor="#ffaa00", fundo="200,100,0")
+
+
+@st.fragment
+def _coluna_socio(socio, parte_cada, cor, fundo):
+    """Resumo, formulario e historico de um socio (rerun isolado)."""
+    chave = socio.lower()
+
+    # Carrega despesas pessoais (aqui dentro: o rerun do fragment le o dado novo)
+    despesas_pessoais_df = carregar_despesas_pessoais()
+    despesas_socio = despesas_pessoais_df[despesas_pessoais_df['socio'] == socio] if len(despesas_pessoais_df) > 0 else pd.DataFrame()
+    
+    total_socio = despesas_socio['valor'].sum() if len(despesas_socio) > 0 else 0
+    sobra_socio = parte_cada - total_socio
+
+    st.markdown(f"""
+    <div style="background: rgba({fundo},0.1); border-radius: 10px; padding: 15px; border: 1px solid rgba({fundo},0.3);">
+        <h4 style="color: {cor}; margin: 0;">👤 {socio}</h4>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Resumo financeiro
+    st.markdown(f"""
+    <div style="margin: 15px 0;">
+        <p style="color: #888; margin: 5px 0;">Recebido: <span style="color: #00ff88;">R$ {parte_cada:,.2f}</span></p>
+        <p style="color: #888; margin: 5px 0;">Despesas: <span style="color: #ff4444;">R$ {total_socio:,.2f}</span></p>
+        <p style="color: #fff; margin: 5px 0; font-weight: bold;">Sobra: <span style="color: {'#00ff88' if sobra_socio >= 0 else '#ff4444'};">R$ {sobra_socio:,.2f}</span></p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Formulario para adicionar despesa
+    with st.expander(f"➕ Adicionar Despesa {socio}"):
+        with st.form(f"form_desp_{chave}", clear_on_submit=True):
+            desp_data = st.date_input("📅 Data", value=date.today(), key=f"{chave}_data")
+            desp_desc = st.text_input("📝 Descrição", key=f"{chave}_desc")
+            desp_valor = st.number_input("💰 Valor (R$)", min_value=0.0, step=10.0, key=f"{chave}_valor")
+            desp_cat = st.selectbox("📁 Categoria", ["Moradia", "Alimentação", "Transporte", "Lazer", "Saúde", "Outros"], key=f"{chave}_cat")
+            
+            if st.form_submit_button("💾 Salvar", type="primary"):
+                if desp_desc and desp_valor > 0:
+                    if salvar_despesa_pessoal(desp_data, desp_desc, desp_valor, socio, desp_cat):
+                        st.success("Despesa salva!")
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error("Erro ao salvar")
+    
+    # Lista de despesas
+    if len(despesas_socio) > 0:
+        st.markdown("**📋 Histórico:**")
+        display_socio = despesas_socio.sort_values('data', ascending=False) if 'data' in despesas_socio.columns else despesas_socio
+        st.dataframe(
+            display_socio[['data', 'descricao', 'valor', 'categoria']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "data": st.column_config.DateColumn("📅"),
+                "descricao": st.column_config.TextColumn("📝 Item"),
+                "valor": st.column_config.NumberColumn("💰", format="R$ %.2f"),
+                "categoria": st.column_config.TextColumn("📁")
+            }
+        )
+        
+        if st.button(f"🗑️ Limpar Todas ({socio})", key=f"limpar_{chave}"):
+            if limpar_despesas_pessoais_socio(socio):
+                st.success(f"Despesas de {socio} limpas!")
+                st.rerun(scope="fragment")
+    else:
+        st.info("Nenhuma despesa registrada")
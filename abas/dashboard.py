@@ -0,0 +1,220 @@
+"""
+Aba Executive Dashboard: visao consolidada de todas as fontes.
+"""
+
+import streamlit as st
+
+from dados import carregar_vendas, ler_aba
+from graficos import mostrar_figura, figura_composicao_receita
+
+
+def calcular_totais(cotacao_dolar, stipchat_data, despesas_df):
+    """
+    Totais de cada fonte + grand total (sem desenhar nada), para a aba e
+    para o benchmark.
+    """
+    # 1. Revenue Revenue
+    stipchat_revenue = 0
+    if stipchat_data:
+        tokens = stipchat_data['tokens']
+        stipchat_revenue = tokens * 0.05 * cotacao_dolar
+
+    # 2. Stock Profit (lucro das vendas do Google Sheets)
+    stock_profit = 0
+    vendas_dashboard = carregar_vendas()
+    if vendas_dashboard:
+        stock_profit = sum(v.get('lucro', 0) for v in vendas_dashboard)
+
+    # 3. Total Expenses
+    total_expenses = 0
+    if len(despesas_df) > 0:
+        total_expenses = despesas_df['valor'].sum()
+
+    # 4. Bot Telegram Revenue (from VendasBot worksheet)
+    bot_revenue = 0
+    try:
+        all_bot_values = ler_aba("VendasBot") or []
+        if len(all_bot_values) > 1:
+            headers = all_bot_values[0]
+            valor_idx = headers.index("valor") if "valor" in headers else -1
+            if valor_idx >= 0:
+                for row in all_bot_values[1:]:
+                    if len(row) > valor_idx:
+                        try:
+                            bot_revenue += float(str(row[valor_idx]).replace(',', '.'))
+                        except:
+                            pass
+    except:
+        pass
+
+    # GRAND TOTAL LOGIC
+    grand_total = stipchat_revenue + stock_profit + bot_revenue - total_expenses
+
+    return {
+        'stipchat_revenue': stipchat_revenue,
+        'stock_profit': stock_profit,
+        'bot_revenue': bot_revenue,
+        'total_expenses': total_expenses,
+        'grand_total': grand_total,
+    }
+
+
+def render(cotacao_dolar):
+    """Desenha a aba (so roda quando ela e a aba ativa)."""
+    st.markdown("### 📊 Executive Dashboard - Visao Consolidada")
+
+    totais = calcular_totais(
+        cotacao_dolar, st.session_state.stipchat_data, st.session_state.despesas_df
+    )
+    stipchat_revenue = totais['stipchat_revenue']
+    stock_profit = totais['stock_profit']
+    bot_revenue = totais['bot_revenue']
+    total_expenses = totais['total_expenses']
+    grand_total = totais['grand_total']
+
+    # Display Grand Total
+    st.markdown("#### 💎 GRAND TOTAL (Lucro Global)")
+
+    if grand_total > 0:
+        st.markdown(f"""
+        <div class="success-box">
+            <p style="color: #888; margin: 0; font-size: 0.9rem; text-transform: uppercase;">LUCRO GLOBAL (POSITIVO)</p>
+            <p class="neon-green" style="margin: 10px 0;">R$ {grand_total:,.2f}</p>
+            <p style="color: #00ff88; font-size: 1rem; margin: 0;">O imperio esta crescendo!</p>
+        </div>
+        """, unsafe_allow_html=True)
+    elif grand_total < 0:
+        st.markdown(f"""
+        <div class="warning-box">
+            <p style="color: #888; margin: 0; font-size: 0.9rem; text-transform: uppercase;">PREJUIZO GLOBAL (NEGATIVO)</p>
+            <p class="neon-red" style="margin: 10px 0;">R$ {grand_total:,.2f}</p>
+            <p style="color: #ff4444; font-size: 1rem; margin: 0;">Atencao: gastos superaram receitas</p>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="info-box">
+            <p style="color: #888; margin: 0; font-size: 0.9rem; text-transform: uppercase;">LUCRO GLOBAL (EQUILIBRIO)</p>
+            <p style="color: #fff; font-size: 2rem; font-weight: bold; margin: 10px 0;">R$ 0,00</p>
+            <p style="color: #888; font-size: 1rem; margin: 0;">Receitas e gastos empatados</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Breakdown por fonte
+    st.markdown("#### 📊 Breakdown por Fonte")
+
+    col_b1, col_b2, col_b3, col_b4 = st.columns(4)
+
+    with col_b1:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <p class="kpi-title">🔴 STRIPCHAT REVENUE</p>
+            <p class="kpi-value-green">R$ {stipchat_revenue:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col_b2:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <p class="kpi-title">📦 STOCK PROFIT</p>
+            <p class="kpi-value-green">R$ {stock_profit:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col_b3:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <p class="kpi-title">🤖 BOT TELEGRAM</p>
+            <p class="kpi-value-blue">R$ {bot_revenue:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col_b4:
+        st.markdown(f"""
+        <div class="kpi-card">
+            <p class="kpi-title">💸 TOTAL EXPENSES</p>
+            <p class="kpi-value-red">R$ {total_expenses:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Acerto de contas (Split 50/50)
+    st.markdown("#### 💸 Acerto de Contas (Split 50/50)")
+
+    if len(st.session_state.despesas_df) > 0:
+        total_lo = st.session_state.despesas_df[st.session_state.despesas_df['pagador'] == 'LO']['valor'].sum()
+        total_companheira = st.session_state.despesas_df[st.session_state.despesas_df['pagador'] == 'Companheira']['valor'].sum()
+        total_geral = total_lo + total_companheira
+
+        cada_um_deve = total_geral / 2
+
+        saldo_lo = total_lo - cada_um_deve
+        saldo_companheira = total_companheira - cada_um_deve
+
+        col_s1, col_s2, col_s3 = st.columns(3)
+
+        with col_s1:
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">👩‍💼 LO Pagou</p>
+                <p class="kpi-value-gold">R$ {total_lo:,.2f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col_s2:
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">👩 Companheira Pagou</p>
+                <p class="kpi-value-gold">R$ {total_companheira:,.2f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col_s3:
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">📊 Total Geral</p>
+                <p style="color: #fff; font-size: 2rem; font-weight: bold;">R$ {total_geral:,.2f}</p>
+                <p style="color: #888; font-size: 0.9rem;">Cada um: R$ {cada_um_deve:,.2f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        # Quem deve para quem
+        if abs(saldo_lo) > 0.01:
+            if saldo_lo > 0:
+                st.markdown(f"""
+                <div class="settlement-box">
+                    <p style="color: #ffd700; font-size: 0.9rem; margin: 0; text-transform: uppercase;">⚠️ ACERTO PENDENTE</p>
+                    <h2 style="color: #fff; margin: 15px 0; font-size: 1.3rem;">Companheira deve para LO</h2>
+                    <p class="neon-green" style="margin: 0;">R$ {abs(saldo_lo):,.2f}</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="settlement-box">
+                    <p style="color: #ffd700; font-size: 0.9rem; margin: 0; text-transform: uppercase;">⚠️ ACERTO PENDENTE</p>
+                    <h2 style="color: #fff; margin: 15px 0; font-size: 1.3rem;">LO deve para Companheira</h2>
+                    <p class="neon-green" style="margin: 0;">R$ {abs(saldo_lo):,.2f}</p>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown("""
+            <div class="success-box">
+                <h2 style="color: #00ff88; margin: 0; font-size: 1.4rem;">Tudo Acertado!</h2>
+                <p style="color: #888; margin: 10px 0 0 0;">As contas estao equilibradas</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("Registre despesas para ver o acerto de contas")
+
+    st.markdown("---")
+
+    # Grafico de composicao de receita
+    st.markdown("#### 📊 Composicao da Receita")
+
+    if stipchat_revenue > 0 or stock_profit > 0:
+        mostrar_figura(figura_composicao_receita(stipchat_revenue, stock_profit))
+    else:
+        st.info("Nenhuma receita registrada ainda")
@@ -0,0 +1,76 @@
+"""
+Aba Household Expenses: despesas da casa (split 50/50).
+"""
+
+from datetime import date
+
+import streamlit as st
+import pandas as pd
+
+from dados import salvar_despesas
+
+
+def render(cotacao_dolar):
+    """Desenha a aba (so roda quando ela e a aba ativa)."""
+    st.markdown("### 🏠 Household Expenses (Split 50/50)")
+
+    _painel_despesas()
+
+
+@st.fragment
+def _painel_despesas():
+    """Formulario + historico: adicionar/limpar reroda so este fragment."""
+    col_form, col_hist = st.columns([1, 1.5])
+
+    with col_form:
+        st.markdown("#### ➕ Adicionar Despesa")
+
+        with st.form("form_despesa", clear_on_submit=True):
+            desp_data = st.date_input("📅 Data", value=date.today())
+            desp_item = st.text_input("📝 Item/Descricao")
+            desp_valor = st.number_input("💰 Valor (R$)", min_value=0.0, max_value=100000.0, value=0.0, step=5.0)
+            desp_pagador = st.selectbox("👤 Pagador", options=["LO", "Companheira"])
+
+            btn_add = st.form_submit_button("✅ Adicionar Gasto", use_container_width=True, type="primary")
+
+            if btn_add and desp_valor > 0 and desp_item:
+                nova_despesa = pd.DataFrame([{
+                    'data': desp_data,
+                    'item': desp_item,
+                    'valor': round(desp_valor, 2),
+                    'pagador': desp_pagador
+                }])
+
+                st.session_state.despesas_df = pd.concat([st.session_state.despesas_df, nova_despesa], ignore_index=True)
+                salvar_despesas(st.session_state.despesas_df)
+                st.success(f"Gasto de R$ {desp_valor:.2f} adicionado!")
+                st.rerun(scope="fragment")
+
+    with col_hist:
+        st.markdown("#### 📋 Historico de Despesas")
+
+        if len(st.session_state.despesas_df) > 0:
+            display_desp = st.session_state.despesas_df.copy()
+            display_desp = display_desp.sort_values('data', ascending=False)
+
+            st.dataframe(
+                display_desp,
+                use_container_width=True,
+                column_config={
+                    "data": st.column_config.DateColumn("📅 Data"),
+                    "item": st.column_config.TextColumn("📝 Item"),
+                    "valor": st.column_config.NumberColumn("💰 Valor", format="R$ %.2f"),
+                    "pagador": st.column_config.TextColumn("👤 Pagador")
+                },
+                hide_index=True
+            )
+
+            total_despesas = display_desp['valor'].sum()
+            st.markdown(f"**Total de Despesas: R$ {total_despesas:,.2f}**")
+
+            if st.button("🗑️ Limpar Historico", type="secondary"):
+                st.session_state.despesas_df = pd.DataFrame(columns=['data', 'item', 'valor', 'pagador'])
+                salvar_despesas(st.session_state.despesas_df)
+                st.rerun(scope="fragment")
+        else:
+            st.info("Nenhuma despesa registrada")
@@ -0,0 +1,243 @@
+"""
+Aba Inventory: gestao de produtos, estoque e vendas.
+"""
+
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+from dados import (
+    carregar_produtos,
+    carregar_vendas,
+    adicionar_produto,
+    registrar_venda,
+    remover_produto,
+)
+
+
+def render(cotacao_dolar):
+    """Desenha a aba (so roda quando ela e a aba ativa)."""
+    st.markdown("### 📦 Gestão de Produtos & Estoque")
+    st.markdown("Controle completo de produtos, vendas e lucro")
+
+    _painel_produtos()
+
+
+@st.fragment
+def _painel_produtos():
+    """
+    Formularios, estoque e historico de vendas. Cadastro/venda/remocao
+    rerodam so este fragment (nao o app inteiro) e recarregam os dados daqui.
+    """
+    # Carrega dados
+    produtos = carregar_produtos()
+    vendas = carregar_vendas()
+
+    # Layout em 3 colunas
+    col_add, col_sell, col_dashboard = st.columns([1, 1, 2])
+
+    # COLUNA 1: Adicionar Produto
+    with col_add:
+        st.markdown("#### ➕ Novo Produto")
+
+        with st.form("form_produto", clear_on_submit=True):
+            prod_nome = st.text_input("📝 Nome", placeholder="Ex: Creatina")
+            prod_desc = st.text_area("💬 Descrição", placeholder="Ex: Creatina monohidratada pura", height=80)
+            prod_gramas = st.text_input("⚖️ Quantidade (gramas)", placeholder="Ex: 200")
+            prod_preco_compra = st.text_input("💰 Preço Compra Total (R$)", placeholder="Ex: 150")
+
+            btn_add_prod = st.form_submit_button("✅ Adicionar Produto", use_container_width=True, type="primary")
+
+            if btn_add_prod and prod_nome:
+                try:
+                    gramas = float(prod_gramas.replace(',', '.')) if prod_gramas else 0
+                    preco = float(prod_preco_compra.replace(',', '.')) if prod_preco_compra else 0
+                    if gramas > 0:
+                        novo_prod = adicionar_produto(prod_nome, gramas, preco, prod_desc)
+                        st.success(f"✅ {novo_prod['nome']} adicionado com sucesso!")
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error("Informe a quantidade em gramas!")
+                except ValueError:
+                    st.error("Valores inválidos! Use apenas números.")
+
+    # COLUNA 2: Registrar Venda
+    with col_sell:
+        st.markdown("#### 💸 Registrar Venda")
+
+        if produtos:
+            with st.form("form_venda", clear_on_submit=True):
+                # Seletor de produto
+                produto_opcoes = {f"{p['nome']} ({p['quantidade_gramas']}g disponível)": p['id'] for p in produtos if p['quantidade_gramas'] > 0}
+
+                if produto_opcoes:
+                    produto_selecionado = st.selectbox("📦 Produto", list(produto_opcoes.keys()))
+                    produto_id = produto_opcoes[produto_selecionado]
+
+                    # Pega produto para mostrar info
+                    produto = next(p for p in produtos if p['id'] == produto_id)
+
+                    # Calcula custo por grama para referência
+                    custo_por_grama = produto['preco_compra_total'] / produto['quantidade_inicial'] if produto['quantidade_inicial'] > 0 else 0
+                    st.caption(f"💡 Custo por grama: R$ {custo_por_grama:.2f}/g")
+
+                    venda_cliente = st.text_input("👤 Nome do Cliente", placeholder="Ex: João Silva")
+                    venda_gramas_str = st.text_input("⚖️ Gramas Vendidas", placeholder="Ex: 10")
+                    preco_grama_venda_str = st.text_input("💵 Preço por Grama (R$)", placeholder="Ex: 25")
+
+                    # Parse inputs for preview
+                    try:
+                        venda_gramas = float(venda_gramas_str.replace(',', '.')) if venda_gramas_str else 0.0
+                        preco_grama_venda = float(preco_grama_venda_str.replace(',', '.')) if preco_grama_venda_str else 0.0
+                    except ValueError:
+                        venda_gramas = 0.0
+                        preco_grama_venda = 0.0
+                        st.warning("Valores de gramas ou preço inválidos para pré-visualização. Use apenas números.")
+
+                    # Calcula valor total automaticamente
+                    venda_valor = preco_grama_venda * venda_gramas
+
+                    # Preview do cálculo
+                    custo_estimado = custo_por_grama * venda_gramas
+                    lucro_estimado = venda_valor - custo_estimado
+                    cor_lucro = "green" if lucro_estimado >= 0 else "red"
+                    
+                    st.markdown(f"""
+                    **📊 Resumo da Venda:**
+                    - Valor Total: **R$ {venda_valor:.2f}** ({venda_gramas}g × R$ {preco_grama_venda:.2f})
+                    - Custo: R$ {custo_estimado:.2f}
+                    - Lucro: <span style='color: {cor_lucro}; font-weight: bold;'>R$ {lucro_estimado:.2f}</span>
+                    """, unsafe_allow_html=True)
+
+                    btn_vender = st.form_submit_button("✅ Confirmar Venda", use_container_width=True, type="primary")
+
+                    if btn_vender:
+                        if venda_gramas <= 0:
+                            st.error("Informe a quantidade em gramas!")
+                        elif preco_grama_venda <= 0:
+                            st.error("Informe o preço por grama!")
+                        elif venda_gramas > produto['quantidade_gramas']:
+                            st.error(f"Estoque insuficiente! Disponível: {produto['quantidade_gramas']}g")
+                        else:
+                            sucesso, msg = registrar_venda(produto_id, venda_gramas, venda_valor, venda_cliente)
+                            if sucesso:
+                                st.success(msg)
+                                st.rerun(scope="fragment")
+                            else:
+                                st.error(msg)
+
+                else:
+                    st.warning("Nenhum produto com estoque disponível")
+        else:
+            st.info("Adicione produtos primeiro")
+
+    # COLUNA 3: Dashboard de Produtos
+    with col_dashboard:
+        st.markdown("#### 📊 Dashboard de Produtos")
+
+        if produtos:
+            # KPIs Gerais
+            investimento_total = sum(p['preco_compra_total'] for p in produtos)
+            valor_vendido = sum(v['valor_venda'] for v in vendas)
+            lucro_bruto = valor_vendido - sum(
+                (p['vendido_gramas'] / p['quantidade_inicial']) * p['preco_compra_total']
+                for p in produtos if p['quantidade_inicial'] > 0
+            )
+
+            col_k1, col_k2, col_k3 = st.columns(3)
+
+            with col_k1:
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">💰 Investido</p>
+                    <p class="kpi-value-blue">R$ {investimento_total:.2f}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_k2:
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">💵 Vendido</p>
+                    <p class="kpi-value-green">R$ {valor_vendido:.2f}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_k3:
+                cor_lucro = "green" if lucro_bruto > 0 else "red"
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">📈 Lucro</p>
+                    <p class="kpi-value-{cor_lucro}">R$ {lucro_bruto:.2f}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            # Tabela de Produtos
+            st.markdown("**📦 Estoque Atual**")
+
+            produtos_df = pd.DataFrame([
+                {
+                    'Produto': p['nome'],
+                    'Estoque': f"{p['quantidade_gramas']}g",
+                    'Vendido': f"{p['vendido_gramas']}g",
+                    '% Vendido': f"{(p['vendido_gramas']/p['quantidade_inicial']*100):.0f}%" if p['quantidade_inicial'] > 0 else "0%",
+                    'Custo/g': f"R$ {(p['preco_compra_total']/p['quantidade_inicial']):.2f}" if p['quantidade_inicial'] > 0 else "R$ 0.00",
+                    'ID': p['id']
+                }
+                for p in produtos
+            ])
+
+            st.dataframe(produtos_df.drop('ID', axis=1), use_container_width=True, hide_index=True)
+
+            # Botões de ação
+            col_del1, col_del2 = st.columns(2)
+
+            with col_del1:
+                produto_para_remover = st.selectbox("🗑️ Remover produto", [f"{p['nome']}" for p in produtos], key="del_prod")
+
+            with col_del2:
+                if st.button("🗑️ Confirmar Remoção", use_container_width=True):
+                    produto_id = next(p['id'] for p in produtos if p['nome'] == produto_para_remover)
+                    remover_produto(produto_id)
+                    st.success(f"{produto_para_remover} removido!")
+                    st.rerun(scope="fragment")
+
+        else:
+            st.info("Nenhum produto cadastrado ainda")
+
+    # VENDAS: Histórico completo
+    st.markdown("---")
+    st.markdown("### 📊 Histórico de Vendas")
+
+    if vendas:
+        vendas_df = pd.DataFrame([
+            {
+                'Data': datetime.fromisoformat(v['data']).strftime('%d/%m/%Y %H:%M'),
+                'Cliente': v['cliente'] if v['cliente'] else '-',
+                'Produto': v['produto_nome'],
+                'Gramas': f"{v['gramas']}g",
+                'Valor': f"R$ {v['valor_venda']:.2f}",
+                'Custo': f"R$ {v['custo']:.2f}",
+                'Lucro': f"R$ {v['lucro']:.2f}"
+            }
+            for v in reversed(vendas)
+        ])
+
+        st.dataframe(vendas_df, use_container_width=True, hide_index=True)
+
+        # Resumo de lucro total
+        lucro_total = sum(v['lucro'] for v in vendas)
+        receita_total = sum(v['valor_venda'] for v in vendas)
+        custo_total = sum(v['custo'] for v in vendas)
+
+        col_l1, col_l2, col_l3 = st.columns(3)
+        with col_l1:
+            st.metric("💰 Receita Total", f"R$ {receita_total:.2f}")
+        with col_l2:
+            st.metric("💸 Custo Total", f"R$ {custo_total:.2f}")
+        with col_l3:
+            st.metric("📈 Lucro Líquido", f"R$ {lucro_total:.2f}")
+    else:
+        st.info("Nenhuma venda registrada ainda")
@@ -0,0 +1,622 @@
+"""
+Aba Revenue API: sync da conta e analytics de sessoes/clientes.
+"""
+
+import os
+import json
+import calendar as cal
+from datetime import datetime, date, timedelta, timezone
+
+import streamlit as st
+import pandas as pd
+
+from revenue import (
+    iniciar_agendador_revenue,
+    salvar_cookies,
+    calcular_duracao_sessao_inteligente,
+    faturamento_mensal_df,
+    top_clientes_k,
+    sessoes_no_periodo,
+    resumo_periodo,
+    clientes_periodo,
+)
+from graficos import (
+    mostrar_figura,
+    figura_distribuicao_clientes,
+    figura_tokens_por_dia,
+    figura_taxa_por_sessao,
+)
+
+
+def render(cotacao_dolar):
+    """Desenha a aba (so roda quando ela e a aba ativa)."""
+    # Worker de sync da Revenue (um por processo, ja iniciado pelo app)
+    agendador_revenue = iniciar_agendador_revenue()
+
+    st.markdown("### 🔴 Revenue Revenue Tracking")
+    st.markdown("Rastreamento em tempo real via API escondida da plataforma")
+
+    col_sync, col_result = st.columns([1, 2])
+
+    with col_sync:
+        st.markdown("#### 🔄 Sincronizar Dados")
+
+        # Verifica se ja tem cookies salvos
+        if st.session_state.cookies_salvos:
+            st.success("✅ Cookies salvos encontrados")
+
+            col_btn1, col_btn2 = st.columns(2)
+
+            with col_btn1:
+                atualizar_cookies = st.checkbox("Atualizar cookies", value=False)
+
+            with col_btn2:
+                if st.button("🗑️ Limpar cookies", use_container_width=True):
+                    os.remove('cookies_saved.json')
+                    st.session_state.cookies_salvos = None
+                    st.rerun()
+        else:
+            atualizar_cookies = True
+            st.info("📁 Faça upload dos cookies pela primeira vez")
+
+        # Upload de cookies (só mostra se não tiver salvos ou se quiser atualizar)
+        uploaded_cookies = None
+        if atualizar_cookies:
+            uploaded_cookies = st.file_uploader(
+                "📁 Upload cookies.json",
+                type=['json'],
+                help="Arquivo JSON exportado da extensao de cookies"
+            )
+
+        # Periodo de historico
+        dias_historico = st.selectbox(
+            "📅 Período",
+            options=[7, 15, 30, 60, 90],
+            index=2,
+            format_func=lambda x: f"{x} dias",
+            help="Quantos dias de histórico buscar"
+        )
+
+        if st.button("🚀 SINCRONIZAR", type="primary", use_container_width=True):
+            # Decide de onde pegar os cookies
+            cookies_dict = None
+
+            if uploaded_cookies:
+                # Upload novo - processa e salva
+                try:
+                    cookies_raw = uploaded_cookies.read().decode('utf-8')
+                    cookies_list = json.loads(cookies_raw)
+
+                    # Converte lista de cookies para dict
+                    cookies_dict = {}
+                    for cookie in cookies_list:
+                        if isinstance(cookie, dict) and 'name' in cookie and 'value' in cookie:
+                            cookies_dict[cookie['name']] = cookie['value']
+
+                    if cookies_dict:
+                        # Salva os cookies novos
+                        salvar_cookies(cookies_dict)
+                        st.session_state.cookies_salvos = cookies_dict
+                except json.JSONDecodeError:
+                    st.error("JSON invalido! Verifique o arquivo.")
+                except Exception as e:
+                    st.error(f"Erro: {str(e)}")
+            elif st.session_state.cookies_salvos:
+                # Usa cookies salvos
+                cookies_dict = st.session_state.cookies_salvos
+            else:
+                st.error("Faca upload do arquivo cookies.json primeiro!")
+
+            if cookies_dict:
+                # Pede uma rodada imediata ao agendador (os cookies ja estao salvos)
+                agendador_revenue.estado['dias'] = dias_historico
+                agendador_revenue.acordar.set()
+                st.info(f"🔄 Sincronizando {dias_historico} dias em segundo plano - os dados aparecem assim que terminar.")
+
+        # Status do sync em segundo plano
+        estado_sync = agendador_revenue.estado
+        if estado_sync['rodando']:
+            st.caption("🔄 Sincronização em andamento...")
+            if st.button("🔃 Verificar", use_container_width=True):
+                st.rerun()
+        elif estado_sync['ultimo_resultado']:
+            ultimo = estado_sync['ultimo_resultado']
+            if ultimo['success']:
+                st.caption(f"✅ Último sync: {estado_sync['ultima_execucao'].strftime('%d/%m %H:%M')}")
+            elif ultimo['etapa'] == 'transacoes':
+                st.error(f"Erro ao buscar transações: {ultimo['error']}")
+            elif ultimo['etapa'] != 'cookies':
+                st.error(f"Erro: {ultimo['error']}")
+                st.warning("Cookies expirados? Atualize fazendo novo upload.")
+
+    with col_result:
+        st.markdown("#### 📊 Analytics Dashboard")
+
+        if st.session_state.sessoes_data:
+            sessoes = st.session_state.sessoes_data
+            data = st.session_state.stipchat_data
+
+            tokens_total = data['tokens']
+
+            # Frame tipado + indice de agregados (montados no sync / snapshot)
+            df_transacoes = st.session_state.df_transacoes
+            indice = st.session_state.indice_revenue
+
+            if st.session_state.revenue_atualizado_em:
+                st.caption(f"Dados de {st.session_state.revenue_atualizado_em.strftime('%d/%m %H:%M')}")
+
+            # Calcula metricas avancadas
+            revenue_total = tokens_total * 0.05 * cotacao_dolar
+            total_transacoes = len(df_transacoes)
+            clientes_unicos = df_transacoes['username'].nunique()
+
+            # Horas totais trabalhadas
+            horas_totais = float(indice['horas_acum'][-1])
+            taxa_hora_geral = revenue_total / horas_totais if horas_totais > 0 else 0
+
+            # Ticket medio
+            ticket_medio = tokens_total / total_transacoes if total_transacoes > 0 else 0
+
+            # KPIs Principais - Linha 1
+            col_k1, col_k2, col_k3, col_k4 = st.columns(4)
+
+            with col_k1:
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">💰 Revenue Total</p>
+                    <p class="kpi-value-green">R$ {revenue_total:,.2f}</p>
+                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{tokens_total:,} tokens</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_k2:
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">📈 R$/Hora Média</p>
+                    <p class="kpi-value-blue">R$ {taxa_hora_geral:,.2f}/h</p>
+                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{horas_totais:.1f}h trabalhadas</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_k3:
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">👥 Clientes Únicos</p>
+                    <p class="kpi-value-purple">{clientes_unicos:,}</p>
+                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{total_transacoes} transações</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            with col_k4:
+                st.markdown(f"""
+                <div class="kpi-card">
+                    <p class="kpi-title">🎯 Ticket Médio</p>
+                    <p class="kpi-value-gold">{ticket_medio:.1f} tokens</p>
+                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">R$ {ticket_medio * 0.05 * cotacao_dolar:.2f} média</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            # META DIARIA - Barra de Progresso
+            st.markdown("#### 🎯 Meta Diaria: $100 USD")
+            
+            # Calcula quanto fez hoje
+            hoje_inicio = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            hoje_inicio_utc = hoje_inicio.astimezone(timezone.utc)
+            lo_hoje, hi_hoje = sessoes_no_periodo(indice, desde=hoje_inicio_utc)
+            tokens_hoje = resumo_periodo(indice, lo_hoje, hi_hoje)['tokens']
+            usd_hoje = tokens_hoje * 0.05
+            
+            # Progresso da meta
+            meta_usd = 100.0
+            progresso = min(usd_hoje / meta_usd, 1.0)  # Cap em 100%
+            progresso_pct = progresso * 100
+            
+            # Cor baseada no progresso
+            if progresso >= 1.0:
+                cor_barra = "#00ff88"
+                status_meta = "META BATIDA!"
+            elif progresso >= 0.75:
+                cor_barra = "#ffd700"
+                status_meta = "Quase la!"
+            elif progresso >= 0.5:
+                cor_barra = "#4da6ff"
+                status_meta = "Metade do caminho"
+            else:
+                cor_barra = "#ff4444"
+                status_meta = "Foco na live!"
+            
+            st.markdown(f"""
+            <div style="background: #1a1a1a; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
+                <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
+                    <span style="color: #888;">Progresso Hoje</span>
+                    <span style="color: {cor_barra}; font-weight: bold;">${usd_hoje:.2f} / ${meta_usd:.0f} USD ({progresso_pct:.0f}%)</span>
+                </div>
+                <div style="background: #333; border-radius: 10px; height: 20px; overflow: hidden;">
+                    <div style="background: {cor_barra}; width: {progresso_pct}%; height: 100%; border-radius: 10px; transition: width 0.5s;"></div>
+                </div>
+                <p style="text-align: center; color: {cor_barra}; margin-top: 10px; font-weight: bold;">{status_meta}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            # CLIENTES VIP - Top 20 All-Time
+            st.markdown("#### 👑 Clientes VIP (Top 20 All-Time)")
+            st.caption("Maiores gastadores de todo o historico - de atencao especial a eles!")
+            
+            # Gastos all-time por cliente (balde total do indice) -> Top 20 VIP
+            top_vip = [
+                (username, {'tokens': tokens, 'transacoes': qtd, 'revenue': tokens * 0.05 * cotacao_dolar})
+                for username, tokens, qtd in top_clientes_k(indice['clientes_total'], 20)
+            ]
+            
+            if top_vip:
+                col_vip1, col_vip2 = st.columns(2)
+                
+                # Primeira metade (1-10)
+                with col_vip1:
+                    for i, (username, info) in enumerate(top_vip[:10]):
+                        medalha = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"#{i+1}"
+                        st.markdown(f"""
+                        <div style="background: #1a1a1a; border-radius: 8px; padding: 12px; margin: 4px 0; display: flex; justify-content: space-between; align-items: center;">
+                            <span style="color: #00ff88; font-weight: bold;">{medalha} {username[:18]}</span>
+                            <span style="color: #ffd700;">{info['tokens']:,} tk | R$ {info['revenue']:.0f}</span>
+                        </div>
+                        """, unsafe_allow_html=True)
+                
+                # Segunda metade (11-20)
+                with col_vip2:
+                    for i, (username, info) in enumerate(top_vip[10:20]):
+                        st.markdown(f"""
+                        <div style="background: #1a1a1a; border-radius: 8px; padding: 12px; margin: 4px 0; display: flex; justify-content: space-between; align-items: center;">
+                            <span style="color: #888;">#{i+11} {username[:18]}</span>
+                            <span style="color: #4da6ff;">{info['tokens']:,} tk | R$ {info['revenue']:.0f}</span>
+                        </div>
+                        """, unsafe_allow_html=True)
+            else:
+                st.info("Sincronize dados para ver clientes VIP")
+
+            st.markdown("---")
+
+            # Analytics Mensal
+            st.markdown("#### 📅 Performance Mensal")
+
+            # Por mes (ex: 2025-12), mais recente primeiro
+            faturamento_por_mes = faturamento_mensal_df(df_transacoes)
+            faturamento_por_mes['usd'] = faturamento_por_mes['tokens'] * 0.05
+            meses_ordenados = list(zip(faturamento_por_mes.index, faturamento_por_mes.to_dict('records')))
+
+            if meses_ordenados:
+                col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+
+                for idx, (mes_ano, info) in enumerate(meses_ordenados[:4]):  # Mostra últimos 4 meses
+                    ano, mes_num = mes_ano.split('-')
+                    nome_mes = cal.month_name[int(mes_num)]
+                    dias_trabalhados = info['dias']
+                    meta_mes = dias_trabalhados * 100  # $100 por dia de live
+                    percentual_meta = (info['usd'] / meta_mes * 100) if meta_mes > 0 else 0
+                    cor_meta = "green" if percentual_meta >= 100 else "blue" if percentual_meta >= 75 else "red"
+
+                    col = [col_m1, col_m2, col_m3, col_m4][idx]
+                    with col:
+                        st.markdown(f"""
+                        <div class="kpi-card">
+                            <p class="kpi-title">💵 {nome_mes}/{ano}</p>
+                            <p class="kpi-value-{cor_meta}">${info['usd']:.2f} USD</p>
+                            <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">
+                                {dias_trabalhados} dias | {info['sessoes']} sessões<br>
+                                Meta: ${meta_mes:.0f} ({percentual_meta:.0f}%)
+                            </p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+            st.markdown("---")
+
+            _analise_periodo(cotacao_dolar, tokens_total)
+
+        else:
+            st.info("Sincronize com cookies para ver análise de sessões")
+
+
+@st.fragment
+def _analise_periodo(cotacao_dolar, tokens_total):
+    """
+    Filtro de periodo + graficos e tabelas do periodo. Trocar o filtro (ou o
+    dia do calendario) reroda so este fragment, nao o app nem o resto da aba.
+    """
+    sessoes = st.session_state.sessoes_data
+    indice = st.session_state.indice_revenue
+
+    # Seletor de Visualizacao
+    st.markdown("#### 🎯 Visualização")
+
+    col_filtro1, col_filtro2 = st.columns([2, 1])
+
+    with col_filtro1:
+        filtro = st.radio(
+            "Modo:",
+            options=["Ultima Live", "Hoje", "Ontem", "Ultimas 24h", "Ultima Semana", "Mes Atual", "Calendario", "Todas"],
+            horizontal=True,
+            index=0
+        )
+
+    with col_filtro2:
+        if filtro == "Calendario":
+            data_selecionada = st.date_input(
+                "Selecione o dia:",
+                value=date.today(),
+                max_value=date.today()
+            )
+
+    # Aplica filtros
+    agora_utc = datetime.now(timezone.utc)
+    # Intervalo [lo, hi) de sessoes do periodo (busca binaria no indice)
+    lo, hi = 0, len(sessoes)
+
+    if filtro == "Ultima Live":
+        # Mostra apenas a sessao mais recente
+        lo = max(0, len(sessoes) - 1)
+    elif filtro == "Hoje":
+        # Desde 00h de hoje (timezone local)
+        hoje_inicio = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        hoje_inicio_utc = hoje_inicio.astimezone(timezone.utc)
+        lo, hi = sessoes_no_periodo(indice, desde=hoje_inicio_utc)
+    elif filtro == "Ontem":
+        # Dia anterior completo
+        ontem = datetime.now().date() - timedelta(days=1)
+        inicio_ontem = datetime.combine(ontem, datetime.min.time()).astimezone(timezone.utc)
+        fim_ontem = datetime.combine(ontem, datetime.max.time()).astimezone(timezone.utc)
+        lo, hi = sessoes_no_periodo(indice, desde=inicio_ontem, ate=fim_ontem, campo='inicio')
+    elif filtro == "Ultimas 24h":
+        inicio_24h = agora_utc - timedelta(hours=24)
+        lo, hi = sessoes_no_periodo(indice, desde=inicio_24h)
+    elif filtro == "Ultima Semana":
+        inicio_semana = agora_utc - timedelta(days=7)
+        lo, hi = sessoes_no_periodo(indice, desde=inicio_semana)
+    elif filtro == "Mes Atual":
+        hoje = datetime.now().date()
+        inicio_mes = hoje.replace(day=1)
+        inicio_mes_dt = datetime.combine(inicio_mes, datetime.min.time()).astimezone(timezone.utc)
+        lo, hi = sessoes_no_periodo(indice, desde=inicio_mes_dt)
+    elif filtro == "Calendario":
+        # Filtra pelo dia selecionado
+        inicio_dia = datetime.combine(data_selecionada, datetime.min.time()).astimezone(timezone.utc)
+        fim_dia = datetime.combine(data_selecionada, datetime.max.time()).astimezone(timezone.utc)
+        lo, hi = sessoes_no_periodo(indice, desde=inicio_dia, ate=fim_dia)
+
+    sessoes_filtradas = sessoes[lo:hi]
+    resumo_filtrado = resumo_periodo(indice, lo, hi)
+
+    # Top Clientes Analytics
+    st.markdown("---")
+
+    col_chart1, col_chart2 = st.columns(2)
+
+    with col_chart1:
+        st.markdown("#### 👑 Top 10 Clientes (Maiores Gastadores)")
+
+        # Agrupa por cliente (merge dos baldes do indice)
+        gastos_por_cliente = clientes_periodo(indice, lo, hi)
+
+        # Top 10 por tokens (decrescente)
+        top_clientes = [
+            (username, {'tokens': tokens, 'transacoes': qtd, 'revenue': tokens * 0.05 * cotacao_dolar})
+            for username, tokens, qtd in top_clientes_k(gastos_por_cliente, 10)
+        ]
+
+        if top_clientes:
+            # Cria DataFrame
+            top_df = pd.DataFrame([
+                {
+                    'Cliente': username[:20] + '...' if len(username) > 20 else username,
+                    'Tokens': f"{info['tokens']:,}",
+                    'Tips': info['transacoes'],
+                    'Revenue': f"R$ {info['revenue']:.2f}",
+                    'Ticket': f"{info['tokens']/info['transacoes']:.1f}" if info['transacoes'] > 0 else '0'
+                }
+                for username, info in top_clientes
+            ])
+
+            st.dataframe(top_df, use_container_width=True, hide_index=True)
+
+            # Total representado pelos top 10
+            total_top10 = sum(info['tokens'] for _, info in top_clientes)
+            percentual_top10 = (total_top10 / tokens_total * 100) if tokens_total > 0 else 0
+            st.caption(f"Top 10 representa {percentual_top10:.1f}% do total ({total_top10:,} tokens)")
+        else:
+            st.info("Nenhum cliente encontrado neste período")
+
+    with col_chart2:
+        st.markdown("#### 📊 Distribuição de Revenue")
+
+        if top_clientes:
+            # Grafico de pizza
+            labels = [username[:15] + '...' if len(username) > 15 else username for username, _ in top_clientes]
+            values = [info['revenue'] for _, info in top_clientes]
+
+            mostrar_figura(figura_distribuicao_clientes(tuple(labels), tuple(values)))
+
+    # Graficos de Tendencia Temporal
+    st.markdown("---")
+    st.markdown("#### 📈 Análise Temporal")
+
+    col_time1, col_time2 = st.columns(2)
+
+    with col_time1:
+        # Grafico: Tokens por Dia
+        tokens_por_dia = resumo_filtrado['por_dia']
+
+        if tokens_por_dia:
+            mostrar_figura(figura_tokens_por_dia(
+                tuple(dia['data'] for dia in tokens_por_dia),
+                tuple(dia['tokens'] for dia in tokens_por_dia)
+            ))
+
+    with col_time2:
+        # Grafico: R$/Hora por Sessão
+        if sessoes_filtradas:
+            taxas = []
+            for sessao in sessoes_filtradas:
+                horas = calcular_duracao_sessao_inteligente(sessao) / 3600
+                revenue_sessao = sessao['tokens_total'] * 0.05 * cotacao_dolar
+                taxas.append(revenue_sessao / horas if horas > 0 else 0)
+
+            mostrar_figura(figura_taxa_por_sessao(tuple(taxas)))
+
+    # Insights Automaticos
+    st.markdown("---")
+    st.markdown("#### 💡 Insights & Recomendações")
+
+    col_insight1, col_insight2, col_insight3, col_insight4 = st.columns(4)
+
+    with col_insight1:
+        # Melhor sessao
+        if sessoes_filtradas:
+            melhor_sessao = sessoes[lo + int(indice['tokens'][lo:hi].argmax())]
+            melhor_revenue = melhor_sessao['tokens_total'] * 0.05 * cotacao_dolar
+            melhor_data = melhor_sessao['inicio'].astimezone().strftime('%d/%m %H:%M')
+
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">🏆 Melhor Sessão</p>
+                <p class="kpi-value-green">{melhor_sessao['tokens_total']:,} tokens</p>
+                <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{melhor_data} | R$ {melhor_revenue:.2f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col_insight2:
+        # Cliente mais generoso
+        if gastos_por_cliente:
+            top1_cliente, top1_info = top_clientes[0]
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">👑 Top Cliente</p>
+                <p class="kpi-value-purple">{top1_info['tokens']:,} tokens</p>
+                <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{top1_cliente[:20]}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col_insight3:
+        # Meta diaria $100 USD
+        if sessoes_filtradas:
+            tokens_filtradas_total = resumo_filtrado['tokens']
+            usd_total = tokens_filtradas_total * 0.05
+            dias_unicos = len(resumo_filtrado['por_dia'])
+            meta_total = dias_unicos * 100
+            percentual_meta = (usd_total / meta_total * 100) if meta_total > 0 else 0
+            cor_meta = "green" if percentual_meta >= 100 else "blue" if percentual_meta >= 75 else "red"
+
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">🎯 Meta $100/dia</p>
+                <p class="kpi-value-{cor_meta}">{percentual_meta:.0f}%</p>
+                <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">${usd_total:.2f} / ${meta_total:.0f}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with col_insight4:
+        # Crescimento (compara ultima vs penultima sessao)
+        if len(sessoes_filtradas) >= 2:
+            ultima = sessoes_filtradas[-1]['tokens_total']
+            penultima = sessoes_filtradas[-2]['tokens_total']
+            crescimento = ((ultima - penultima) / penultima * 100) if penultima > 0 else 0
+            cor = "green" if crescimento >= 0 else "red"
+            simbolo = "↑" if crescimento >= 0 else "↓"
+
+            st.markdown(f"""
+            <div class="kpi-card">
+                <p class="kpi-title">📊 Tendência</p>
+                <p class="kpi-value-{cor}">{simbolo} {abs(crescimento):.1f}%</p>
+                <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">última vs penúltima</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    # Mostra sessoes filtradas
+    st.markdown("---")
+    st.markdown("#### 🎥 Detalhamento de Sessões")
+
+    if sessoes_filtradas:
+        tokens_filtradas = resumo_filtrado['tokens']
+        revenue_filtradas = tokens_filtradas * 0.05 * cotacao_dolar
+
+        st.markdown(f"**{len(sessoes_filtradas)} sessão(ões) | {tokens_filtradas:,} tokens | R$ {revenue_filtradas:,.2f}**")
+
+        st.markdown("---")
+
+        # Lista de sessoes
+        for i, sessao in enumerate(reversed(sessoes_filtradas)):
+            # Converte para timezone local para exibicao
+            inicio_local = sessao['inicio'].astimezone()
+            fim_local = sessao['fim'].astimezone()
+
+            duracao_real = calcular_duracao_sessao_inteligente(sessao)
+            horas = duracao_real / 3600
+            revenue = sessao['tokens_total'] * 0.05 * cotacao_dolar
+            taxa_hora = revenue / horas if horas > 0 else 0
+
+            data_str = inicio_local.strftime('%d/%m/%Y')
+            hora_inicio = inicio_local.strftime('%H:%M')
+            hora_fim = fim_local.strftime('%H:%M')
+
+            with st.expander(f"🎥 Sessão {len(sessoes_filtradas)-i} - {data_str} ({hora_inicio}-{hora_fim})", expanded=(i==0)):
+                col_s1, col_s2, col_s3 = st.columns(3)
+
+                with col_s1:
+                    st.metric("🪙 Tokens", f"{sessao['tokens_total']:,}")
+                with col_s2:
+                    st.metric("⏱️ Duração", f"{horas:.1f}h")
+                with col_s3:
+                    st.metric("💰 Revenue", f"R$ {revenue:,.2f}")
+
+                st.metric("📈 R$/hora", f"R$ {taxa_hora:,.2f}/h")
+                st.caption(f"{sessao['n_transacoes']} transações | {hora_inicio} - {hora_fim}")
+    else:
+        st.info(f"Nenhuma sessão encontrada para o filtro '{filtro}'")
+
+    # Breakdown Diário
+    st.markdown("---")
+    st.markdown("#### 📅 Breakdown Diário")
+
+    # Sessões por dia (data de inicio, timezone local) - ja vem do indice
+    # Ordena por data (mais recente primeiro)
+    breakdown_ordenado = [
+        (dia['data'], dict(dia, revenue=dia['tokens'] * 0.05 * cotacao_dolar))
+        for dia in reversed(resumo_filtrado['por_dia'])
+    ]
+
+    if breakdown_ordenado:
+        # Cria DataFrame para exibicao
+        breakdown_df = pd.DataFrame([
+            {
+                'Data': data.strftime('%d/%m/%Y'),
+                'Sessões': info['sessoes'],
+                'Tokens': f"{info['tokens']:,}",
+                'Horas': f"{info['horas']:.1f}h",
+                'Revenue': f"R$ {info['revenue']:.2f}",
+                'R$/hora': f"R$ {info['revenue']/info['horas']:.2f}/h" if info['horas'] > 0 else "R$ 0/h"
+            }
+            for data, info in breakdown_ordenado
+        ])
+
+        st.dataframe(breakdown_df, use_container_width=True, hide_index=True)
+
+        # Totais
+        total_dias = len(breakdown_ordenado)
+        total_tokens_breakdown = sum(info['tokens'] for _, info in breakdown_ordenado)
+        total_horas_breakdown = sum(info['horas'] for _, info in breakdown_ordenado)
+        total_revenue_breakdown = sum(info['revenue'] for _, info in breakdown_ordenado)
+        media_hora = total_revenue_breakdown / total_horas_breakdown if total_horas_breakdown > 0 else 0
+
+        col_t1, col_t2, col_t3, col_t4 = st.columns(4)
+        with col_t1:
+            st.metric("📆 Total Dias", total_dias)
+        with col_t2:
+            st.metric("🪙 Total Tokens", f"{total_tokens_breakdown:,}")
+        with col_t3:
+            st.metric("⏱️ Total Horas", f"{total_horas_breakdown:.1f}h")
+        with col_t4:
+            st.metric("💰 Média/hora", f"R$ {media_hora:.2f}/h")
+    else:
+        st.info("Nenhum dado disponível para breakdown diário")
@@ -8,129 +8,29 @@ Sistema de controle financeiro centralizado integrando:
 
 Linguagem da Interface: PORTUGUES (PT-BR)
 Framework: Streamlit + Pandas + Plotly + Requests
+
+Este arquivo monta a pagina (login, CSS, sidebar, navegacao). Dados ficam
+em dados.py (Sheets + espelho local) e revenue.py (Revenue API); cada aba
+fica em abas/ e so roda quando esta ativa.
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, date, timedelta
-import os
 import requests
-import re
-import json
-import pickle
-import random
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium_stealth import stealth
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-from playwright.sync_api import sync_playwright
-import asyncio
-
-# Google Sheets Integration
-try:
-    import gspread
-    from google.oauth2.service_account import Credentials
-    GSPREAD_AVAILABLE = True
-except ImportError:
-    GSPREAD_AVAILABLE = False
-
-# ==================== GOOGLE SHEETS CONFIG ====================
-def get_google_sheets_client():
-    """
-    Conecta ao Google Sheets usando credenciais do Streamlit Secrets.
-    Retorna None se não estiver configurado.
-    """
-    try:
-        if not GSPREAD_AVAILABLE:
-            return None
-        
-        if "gcp_service_account" not in st.secrets:
-            return None
-        
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scopes
-        )
-        
-        client = gspread.authorize(credentials)
-        return client
-    except Exception as e:
-        st.warning(f"Google Sheets não configurado: {e}")
-        return None
-
-
-def get_spreadsheet():
-    """
-    Abre a planilha configurada nos secrets.
-    Cria as abas necessárias se não existirem.
-    Usa cache para evitar múltiplas requisições.
-    """
-    # Usa cache no session_state para evitar múltiplas conexões
-    if 'gsheets_spreadsheet' in st.session_state and st.session_state.gsheets_spreadsheet:
-        return st.session_state.gsheets_spreadsheet
-    
-    try:
-        client = get_google_sheets_client()
-        if not client:
-            return None
-        
-        spreadsheet_url = st.secrets.get("spreadsheet_url", None)
-        if not spreadsheet_url:
-            st.warning("spreadsheet_url não encontrada nos secrets")
-            return None
-        
-        spreadsheet = client.open_by_url(spreadsheet_url)
-        
-        # Garante que as abas existem
-        existing_sheets = [ws.title for ws in spreadsheet.worksheets()]
-        
-        if "Produtos" not in existing_sheets:
-            spreadsheet.add_worksheet(title="Produtos", rows=1000, cols=10)
-            ws = spreadsheet.worksheet("Produtos")
-            ws.append_row(["id", "nome", "descricao", "quantidade_gramas", "quantidade_inicial", "preco_compra_total", "vendido_gramas", "data_cadastro"])
-        
-        if "Vendas" not in existing_sheets:
-            spreadsheet.add_worksheet(title="Vendas", rows=1000, cols=10)
-            ws = spreadsheet.worksheet("Vendas")
-            ws.append_row(["id", "produto_id", "produto_nome", "cliente", "gramas", "valor_venda", "custo", "lucro", "data"])
-        
-        if "Despesas" not in existing_sheets:
-            spreadsheet.add_worksheet(title="Despesas", rows=1000, cols=5)
-            ws = spreadsheet.worksheet("Despesas")
-            ws.append_row(["data", "item", "valor", "pagador"])
-        
-        # Armazena em cache
-        st.session_state.gsheets_spreadsheet = spreadsheet
-        return spreadsheet
-    except Exception as e:
-        st.error(f"Erro ao conectar Google Sheets: {e}")
-        return None
-
 
-
-# Flag para usar Google Sheets ou arquivos locais
-USE_GOOGLE_SHEETS = False
-
-def init_google_sheets():
-    """Inicializa conexão com Google Sheets se disponível."""
-    global USE_GOOGLE_SHEETS
-    spreadsheet = get_spreadsheet()
-    if spreadsheet:
-        USE_GOOGLE_SHEETS = True
-        return True
-    return False
+# Espelho local (SQLite) das abas + sincronizacao com o Sheets
+import local_store
+from dados import _sheets_configurado, iniciar_sincronizador_sheets, carregar_despesas
+from revenue import (
+    carregar_cookies_salvos,
+    iniciar_agendador_revenue,
+    carregar_snapshot_revenue,
+    aplicar_dados_revenue,
+)
+from abas import revenue as aba_revenue
+from abas import produtos as aba_produtos
+from abas import despesas as aba_despesas
+from abas import dashboard as aba_dashboard
+from abas import contas_pessoais as aba_contas_pessoais
 
 
 # ==================== CONFIGURACAO DA PAGINA ====================
@@ -212,27 +112,6 @@ st.markdown("""
         color: #ffffff !important;
     }
 
-    /* Tabs styling */
-    .stTabs [data-baseweb="tab-list"] {
-        background: #1a1a1a;
-        border-radius: 10px;
-        padding: 5px;
-        gap: 5px;
-    }
-
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        color: #888888 !important;
-        border-radius: 8px;
-        padding: 10px 20px;
-    }
-
-    .stTabs [data-baseweb="tab"][aria-selected="true"] {
-        background: #2a2a2a;
-        color: #00ff88 !important;
-        font-weight: bold;
-    }
-
     /* Buttons */
     .stButton > button[kind="primary"] {
         background: linear-gradient(135deg, #00ff88 0%, #00cc6a 100%) !important;
@@ -494,1310 +373,11 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ==================== PATHS ====================
-DATA_DIR = os.path.dirname(os.path.abspath(__file__))
-DESPESAS_FILE = os.path.join(DATA_DIR, "despesas.csv")
-COOKIES_FILE = os.path.join(DATA_DIR, "stipchat_cookies.pkl")
-PRODUTOS_FILE = os.path.join(DATA_DIR, "produtos.json")
-VENDAS_FILE = os.path.join(DATA_DIR, "vendas.json")
-
-# ==================== UTILITY FUNCTIONS ====================
-
-def limpar_currency_br(valor_str):
-    """
-    Limpa valores monetarios brasileiros e converte para float.
-    Exemplo: "R$ 1.234,56" -> 1234.56
-    """
-    try:
-        if pd.isna(valor_str) or valor_str == '':
-            return 0.0
-
-        # Remove "R$" e espacos
-        limpo = str(valor_str).replace('R$', '').strip()
-        # Remove pontos (separador de milhar)
-        limpo = limpo.replace('.', '')
-        # Substitui virgula por ponto (separador decimal)
-        limpo = limpo.replace(',', '.')
-
-        return float(limpo)
-    except:
-        return 0.0
-
-
-def salvar_cookies(driver, filepath):
-    """Salva cookies do driver em arquivo."""
-    cookies = driver.get_cookies()
-    with open(filepath, 'wb') as f:
-        pickle.dump(cookies, f)
-
-
-def carregar_cookies(driver, filepath):
-    """Carrega cookies do arquivo para o driver."""
-    if os.path.exists(filepath):
-        with open(filepath, 'rb') as f:
-            cookies = pickle.load(f)
-            for cookie in cookies:
-                try:
-                    driver.add_cookie(cookie)
-                except:
-                    pass
-        return True
-    return False
-
-
-def inject_advanced_fingerprint_spoofing(driver):
-    """
-    Injeta fingerprint completo com noise reduction - bypassa deteccao avancada.
-    """
-    # Canvas fingerprint com noise
-    canvas_script = """
-    const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
-    const originalGetImageData = CanvasRenderingContext2D.prototype.getImageData;
-
-    const noise = () => Math.random() * 0.0001;
-
-    HTMLCanvasElement.prototype.toDataURL = function() {
-        const context = this.getContext('2d');
-        const imageData = context.getImageData(0, 0, this.width, this.height);
-        for (let i = 0; i < imageData.data.length; i += 4) {
-            imageData.data[i] += noise();
-            imageData.data[i + 1] += noise();
-            imageData.data[i + 2] += noise();
-        }
-        context.putImageData(imageData, 0, 0);
-        return originalToDataURL.apply(this, arguments);
-    };
-    """
-
-    # WebGL fingerprint com GPU real (Intel Iris)
-    webgl_script = """
-    const getParameter = WebGLRenderingContext.prototype.getParameter;
-    WebGLRenderingContext.prototype.getParameter = function(parameter) {
-        if (parameter === 37445) {
-            return 'Intel Inc.';
-        }
-        if (parameter === 37446) {
-            return 'Intel Iris OpenGL Engine';
-        }
-        return getParameter.apply(this, arguments);
-    };
-
-    const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-    WebGL2RenderingContext.prototype.getParameter = function(parameter) {
-        if (parameter === 37445) {
-            return 'Intel Inc.';
-        }
-        if (parameter === 37446) {
-            return 'Intel Iris OpenGL Engine';
-        }
-        return getParameter2.apply(this, arguments);
-    };
-    """
-
-    # Plugins reais
-    plugins_script = """
-    Object.defineProperty(navigator, 'plugins', {
-        get: () => [
-            {
-                name: 'Chrome PDF Plugin',
-                filename: 'internal-pdf-viewer',
-                description: 'Portable Document Format'
-            },
-            {
-                name: 'Chrome PDF Viewer',
-                filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai',
-                description: ''
-            },
-            {
-                name: 'Native Client',
-                filename: 'internal-nacl-plugin',
-                description: ''
-            }
-        ]
-    });
-    """
-
-    # Hardware concurrency randomizado
-    hardware_script = f"""
-    Object.defineProperty(navigator, 'hardwareConcurrency', {{
-        get: () => {random.choice([4, 8, 12, 16])}
-    }});
-    """
-
-    # Device memory
-    memory_script = f"""
-    Object.defineProperty(navigator, 'deviceMemory', {{
-        get: () => {random.choice([4, 8, 16])}
-    }});
-    """
-
-    # Screen resolution com noise
-    screen_script = f"""
-    Object.defineProperty(screen, 'width', {{
-        get: () => {random.randint(1920, 2560)}
-    }});
-    Object.defineProperty(screen, 'height', {{
-        get: () => {random.randint(1080, 1440)}
-    }});
-    Object.defineProperty(screen, 'availWidth', {{
-        get: () => screen.width
-    }});
-    Object.defineProperty(screen, 'availHeight', {{
-        get: () => screen.height - 40
-    }});
-    """
-
-    # Permissions
-    permissions_script = """
-    const originalQuery = window.navigator.permissions.query;
-    window.navigator.permissions.query = (parameters) => (
-        parameters.name === 'notifications' ?
-            Promise.resolve({ state: Notification.permission }) :
-            originalQuery(parameters)
-    );
-    """
-
-    # Battery API
-    battery_script = """
-    Object.defineProperty(navigator, 'getBattery', {
-        get: () => () => Promise.resolve({
-            charging: true,
-            chargingTime: 0,
-            dischargingTime: Infinity,
-            level: 1
-        })
-    });
-    """
-
-    # Audio context fingerprint com noise
-    audio_script = """
-    const AudioContext = window.AudioContext || window.webkitAudioContext;
-    const originalGetChannelData = AudioBuffer.prototype.getChannelData;
-    AudioBuffer.prototype.getChannelData = function() {
-        const data = originalGetChannelData.apply(this, arguments);
-        for (let i = 0; i < data.length; i++) {
-            data[i] += Math.random() * 0.0001;
-        }
-        return data;
-    };
-    """
-
-    # Timezone consistente
-    timezone_script = """
-    Date.prototype.getTimezoneOffset = function() {
-        return 180; // America/Sao_Paulo
-    };
-    """
-
-    # Executa todos os scripts
-    try:
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': canvas_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': webgl_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': plugins_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': hardware_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': memory_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': screen_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': permissions_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': battery_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': audio_script})
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': timezone_script})
-    except:
-        pass
-
-
-def fazer_login_playwright_stealth():
-    """
-    PLAYWRIGHT - Motor de automacao ENTERPRISE com evasao maxima.
-    Playwright nao deixa marcas de WebDriver, mais dificil de detectar que Selenium.
-    """
-    try:
-        # Fix asyncio no Windows - requer ProactorEventLoop
-        import sys
-        if sys.platform == 'win32':
-            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-
-        with sync_playwright() as p:
-            # Lanca Chromium com flags de evasao
-            browser = p.chromium.launch(
-                headless=False,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-site-isolation-trials',
-                ],
-                channel='chrome'  # Usa Chrome instalado ao inves de Chromium
-            )
-
-            # Cria contexto com fingerprint real
-            context = browser.new_context(
-                viewport={'width': random.randint(1920, 2560), 'height': random.randint(1080, 1440)},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-                locale='pt-BR',
-                timezone_id='America/Sao_Paulo',
-                permissions=['geolocation', 'notifications'],
-                geolocation={'latitude': -23.5505, 'longitude': -46.6333},  # Sao Paulo
-                color_scheme='dark',
-                device_scale_factor=1,
-                has_touch=False,
-                is_mobile=False,
-            )
-
-            # Injeta scripts de evasao avancada via CDP
-            page = context.new_page()
-
-            # Script de evasao completa - oculta Playwright
-            evasion_script = """
-            // Remove navigator.webdriver
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-
-            // Chrome com plugins reais
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [
-                    {
-                        name: 'Chrome PDF Plugin',
-                        filename: 'internal-pdf-viewer',
-                        description: 'Portable Document Format'
-                    },
-                    {
-                        name: 'Chrome PDF Viewer',
-                        filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai',
-                        description: ''
-                    },
-                    {
-                        name: 'Native Client',
-                        filename: 'internal-nacl-plugin',
-                        description: ''
-                    }
-                ]
-            });
-
-            // WebGL com GPU real (Intel Iris)
-            const getParameter = WebGLRenderingContext.prototype.getParameter;
-            WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                if (parameter === 37445) return 'Intel Inc.';
-                if (parameter === 37446) return 'Intel Iris OpenGL Engine';
-                return getParameter.apply(this, arguments);
-            };
-
-            const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-            WebGL2RenderingContext.prototype.getParameter = function(parameter) {
-                if (parameter === 37445) return 'Intel Inc.';
-                if (parameter === 37446) return 'Intel Iris OpenGL Engine';
-                return getParameter2.apply(this, arguments);
-            };
-
-            // Canvas com noise
-            const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
-            const noise = () => Math.random() * 0.0001;
-            HTMLCanvasElement.prototype.toDataURL = function() {
-                const context = this.getContext('2d');
-                const imageData = context.getImageData(0, 0, this.width, this.height);
-                for (let i = 0; i < imageData.data.length; i += 4) {
-                    imageData.data[i] += noise();
-                    imageData.data[i + 1] += noise();
-                    imageData.data[i + 2] += noise();
-                }
-                context.putImageData(imageData, 0, 0);
-                return originalToDataURL.apply(this, arguments);
-            };
-
-            // Hardware randomizado
-            Object.defineProperty(navigator, 'hardwareConcurrency', {
-                get: () => """ + str(random.choice([8, 12, 16])) + """
-            });
-
-            Object.defineProperty(navigator, 'deviceMemory', {
-                get: () => """ + str(random.choice([8, 16])) + """
-            });
-
-            // Permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-
-            // Chrome runtime
-            window.chrome = {
-                runtime: {}
-            };
-
-            // Languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['pt-BR', 'pt', 'en-US', 'en']
-            });
-            """
-
-            # Adiciona script antes de qualquer navegacao
-            page.add_init_script(evasion_script)
-
-            def human_delay(min_sec=2, max_sec=5):
-                time.sleep(random.uniform(min_sec, max_sec))
-
-            # Navega para homepage com timing humano
-            page.goto('https://br.stripchat.com', wait_until='networkidle')
-            human_delay(3, 6)
-
-            # Scroll aleatorio (simula leitura)
-            page.evaluate(f"window.scrollTo(0, {random.randint(100, 400)})")
-            human_delay(1, 2)
-
-            # Movimento de mouse aleatorio (comportamento humano)
-            for _ in range(random.randint(2, 4)):
-                x = random.randint(100, 800)
-                y = random.randint(100, 600)
-                page.mouse.move(x, y)
-                time.sleep(random.uniform(0.5, 1.5))
-
-            st.success("Navegador Playwright aberto. Faca login manualmente e aguarde...")
-            st.info("Apos fazer login, aguarde 30 segundos para os cookies serem salvos automaticamente.")
-
-            # Aguarda 90 segundos para usuario fazer login
-            for i in range(90):
-                time.sleep(1)
-                if i % 10 == 0:
-                    st.write(f"Aguardando login... {90-i}s restantes")
-
-            # Salva cookies do contexto
-            cookies = context.cookies()
-
-            # Converte cookies do Playwright para formato Selenium/pickle
-            selenium_cookies = []
-            for cookie in cookies:
-                selenium_cookie = {
-                    'name': cookie['name'],
-                    'value': cookie['value'],
-                    'domain': cookie.get('domain', ''),
-                    'path': cookie.get('path', '/'),
-                    'secure': cookie.get('secure', False),
-                    'httpOnly': cookie.get('httpOnly', False),
-                    'sameSite': cookie.get('sameSite', 'Lax'),
-                }
-                if 'expires' in cookie:
-                    selenium_cookie['expiry'] = int(cookie['expires'])
-                selenium_cookies.append(selenium_cookie)
-
-            with open(COOKIES_FILE, 'wb') as f:
-                pickle.dump(selenium_cookies, f)
-
-            st.success(f"Cookies salvos com sucesso! Total: {len(selenium_cookies)} cookies")
-
-            browser.close()
-
-            return {'success': True, 'cookies_count': len(selenium_cookies)}
-
-    except Exception as e:
-        return {'success': False, 'error': str(e)}
-
-
-def fazer_login_interativo():
-    """
-    Perfil temporário persistente - mais estável que perfil real.
-    """
-    try:
-        # Cria diretório de perfil temporário persistente
-        temp_profile = os.path.join(DATA_DIR, "chrome_temp_profile")
-        if not os.path.exists(temp_profile):
-            os.makedirs(temp_profile)
-
-        # Chrome SIMPLES - sem firulas que causam crash
-        options = Options()
-
-        # Perfil temporário dedicado
-        options.add_argument(f"user-data-dir={temp_profile}")
-
-        # Flags MÍNIMAS anti-detecção
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-
-        # Desabilita verificações de segurança excessivas
-        options.add_argument('--disable-web-security')
-        options.add_argument('--allow-running-insecure-content')
-
-        # Ignora erros de certificado
-        options.add_argument('--ignore-certificate-errors')
-
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-        # Só stealth básico (sem injeção complexa que causa crash)
-        stealth(driver,
-            languages=["pt-BR", "pt", "en-US", "en"],
-            vendor="Google Inc.",
-            platform="Win32",
-            webgl_vendor="Intel Inc.",
-            renderer="Intel Iris OpenGL Engine",
-            fix_hairline=True,
-        )
-
-        # Delays MUITO humanos
-        def human_delay(min_sec=2, max_sec=5):
-            time.sleep(random.uniform(min_sec, max_sec))
-
-        try:
-            # Vai para homepage primeiro (comportamento humano)
-            driver.get('https://br.stripchat.com')
-            human_delay(3, 6)
-
-            # Scroll aleatorio (simula leitura)
-            driver.execute_script(f"window.scrollTo(0, {random.randint(100, 300)})")
-            human_delay(1, 2)
-
-            # Agora vai para login
-            driver.get('https://br.stripchat.com/login')
-            human_delay(2, 4)
-
-            st.info("Navegador aberto! Faca login manualmente e marque 'Confiar neste dispositivo'. Aguardando...")
-
-            # Aguarda usuario fazer login
-            WebDriverWait(driver, 300).until(
-                lambda d: 'earnings' in d.current_url or d.current_url == 'https://br.stripchat.com/'
-            )
-
-            # Usuario logou! Salvar cookies
-            salvar_cookies(driver, COOKIES_FILE)
-            human_delay(2, 4)
-
-            # Vai para página de earnings
-            driver.get('https://br.stripchat.com/earnings/tokens-history')
-            human_delay(5, 8)
-
-            # Extrai dados via JavaScript
-            script = """
-            return fetch('https://br.stripchat.com/api/front/v3/config/initial?requestPath=%2Fearnings%2Ftokens-history')
-                .then(r => r.json())
-                .then(d => d);
-            """
-
-            data = driver.execute_script(script)
-
-            if data and 'initial' in data:
-                user_data = data.get('initial', {}).get('client', {}).get('user', {})
-                tokens = user_data.get('tokens', 0)
-
-                return {
-                    'success': True,
-                    'tokens': tokens,
-                    'secondsOnline': 0,
-                    'username': user_data.get('username', ''),
-                    'data': data
-                }
-            else:
-                return {'success': False, 'error': 'Nao foi possivel extrair dados'}
-
-        finally:
-            driver.quit()
-
-    except Exception as e:
-        return {'success': False, 'error': f'Erro: {str(e)}'}
-
-
-def fetch_stipchat_stats_com_cookies_salvos():
-    """
-    Usa cookies salvos anteriormente com anti-deteccao (headless).
-    """
-    try:
-        if not os.path.exists(COOKIES_FILE):
-            return {'success': False, 'error': 'Cookies nao encontrados. Faca login interativo primeiro.'}
-
-        # Chrome headless com stealth
-        options = Options()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-        # INJETA FINGERPRINT COMPLETO COM NOISE
-        inject_advanced_fingerprint_spoofing(driver)
-
-        # Aplica stealth
-        stealth(driver,
-            languages=["pt-BR", "pt", "en-US", "en"],
-            vendor="Google Inc.",
-            platform="Win32",
-            webgl_vendor="Intel Inc.",
-            renderer="Intel Iris OpenGL Engine",
-            fix_hairline=True,
-        )
-
-        try:
-            # Vai para site primeiro
-            driver.get('https://br.stripchat.com')
-            time.sleep(random.uniform(2, 4))
-
-            # Carrega cookies salvos
-            carregar_cookies(driver, COOKIES_FILE)
-
-            # Vai para página de earnings
-            driver.get('https://br.stripchat.com/earnings/tokens-history')
-            time.sleep(random.uniform(4, 6))
-
-            # Extrai dados via JavaScript
-            script = """
-            return fetch('https://br.stripchat.com/api/front/v3/config/initial?requestPath=%2Fearnings%2Ftokens-history')
-                .then(r => r.json())
-                .then(d => d);
-            """
-
-            data = driver.execute_script(script)
-
-            if data and 'initial' in data:
-                user_data = data.get('initial', {}).get('client', {}).get('user', {})
-
-                if not user_data:
-                    return {'success': False, 'error': 'Cookies expiraram. Faca login interativo novamente.'}
-
-                tokens = user_data.get('tokens', 0)
-
-                return {
-                    'success': True,
-                    'tokens': tokens,
-                    'secondsOnline': 0,
-                    'username': user_data.get('username', ''),
-                    'data': data
-                }
-            else:
-                return {'success': False, 'error': 'Nao foi possivel extrair dados'}
-
-        finally:
-            driver.quit()
-
-    except Exception as e:
-        return {'success': False, 'error': f'Erro: {str(e)}'}
-
-
-def fetch_stipchat_stats_selenium(username, password):
-    """
-    Usa Selenium para fazer scraping direto da pagina de earnings.
-    Login automatico + extracao de dados.
-    """
-    try:
-        # Configurar Chrome headless
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-        # Iniciar driver
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-
-        try:
-            # Acessa página de login
-            driver.get('https://br.stripchat.com/login')
-            time.sleep(3)
-
-            # Faz login
-            username_field = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "username"))
-            )
-            password_field = driver.find_element(By.NAME, "password")
-
-            username_field.send_keys(username)
-            password_field.send_keys(password)
-
-            # Clica no botão de login
-            login_button = driver.find_element(By.XPATH, "//button[@type='submit']")
-            login_button.click()
-
-            time.sleep(5)  # Aguarda login processar
-
-            # Intercepta requisições de rede via CDP
-            driver.execute_cdp_cmd('Network.enable', {})
-
-            # Vai para página de earnings
-            driver.get('https://br.stripchat.com/earnings/tokens-history')
-            time.sleep(5)
-
-            # Captura dados via JavaScript
-            script = """
-            return fetch('https://br.stripchat.com/api/front/v3/config/initial?requestPath=%2Fearnings%2Ftokens-history')
-                .then(r => r.json())
-                .then(d => d);
-            """
-
-            data = driver.execute_script(script)
-
-            if data and 'initial' in data:
-                user_data = data.get('initial', {}).get('client', {}).get('user', {})
-                tokens = user_data.get('tokens', 0)
-
-                return {
-                    'success': True,
-                    'tokens': tokens,
-                    'secondsOnline': 0,
-                    'username': user_data.get('username', ''),
-                    'data': data
-                }
-            else:
-                return {'success': False, 'error': 'Nao foi possivel extrair dados'}
-
-        finally:
-            driver.quit()
-
-    except Exception as e:
-        return {'success': False, 'error': f'Erro no Selenium: {str(e)}'}
-
-
-def fetch_stipchat_stats_requests(session_key, all_cookies=None):
-    """
-    Usa requests com TODOS os cookies do browser.
-    """
-    try:
-        url = "https://br.stripchat.com/api/front/v3/config/initial"
-
-        params = {'requestPath': '/earnings/tokens-history'}
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': 'https://br.stripchat.com/earnings/tokens-history',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin'
-        }
-
-        # Usa todos os cookies se fornecidos
-        if all_cookies:
-            cookies = all_cookies
-        else:
-            cookies = {
-                'platform_com_sessionId': session_key,
-                'localeDomain': 'br'
-            }
-
-        response = requests.get(url, headers=headers, cookies=cookies, params=params, timeout=10)
-
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                user_data = data.get('initial', {}).get('client', {}).get('user', {})
-
-                if not user_data:
-                    return {'success': False, 'error': 'Usuario nao encontrado. Cookie invalido.'}
-
-                return {
-                    'success': True,
-                    'tokens': user_data.get('tokens', 0),
-                    'secondsOnline': 0,
-                    'username': user_data.get('username', ''),
-                    'data': data
-                }
-            except:
-                return {'success': False, 'error': 'Erro ao processar JSON'}
-        else:
-            return {'success': False, 'error': f'Status {response.status_code}'}
-
-    except Exception as e:
-        return {'success': False, 'error': f'Erro: {str(e)}'}
-
-
-def fetch_transacoes_periodo(user_id, all_cookies, dias=30):
-    """
-    Busca transacoes detalhadas dos ultimos N dias.
-    Endpoint: /api/front/users/{userId}/transactions
-    AGORA COM PAGINACAO COMPLETA!
-    """
-    try:
-        # Calcula datas
-        from datetime import datetime, timedelta
-
-        agora = datetime.utcnow()
-        inicio = agora - timedelta(days=dias)
-
-        # Formata datas no formato ISO 8601 (SEM encoding - requests faz isso automaticamente)
-        until = agora.strftime('%Y-%m-%dT%H:%M:%SZ')
-        from_date = inicio.strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        # Endpoint descoberto
-        url = f'https://br.stripchat.com/api/front/users/{user_id}/transactions'
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': 'https://br.stripchat.com/earnings/tokens-history',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin'
-        }
-
-        # PAGINACAO: busca todas as transacoes
-        todas_transacoes = []
-        offset = 0
-        limit = 200  # Maximo permitido pela API
-        max_paginas = 50  # Limite de seguranca (10000 transacoes max)
-        
-        for pagina in range(max_paginas):
-            params = {
-                'from': from_date,
-                'until': until,
-                'offset': offset,
-                'limit': limit
-            }
-
-            response = requests.get(url, headers=headers, cookies=all_cookies, params=params, timeout=15)
-
-            if response.status_code == 200:
-                data = response.json()
-                transacoes = data.get('transactions', [])
-                
-                if not transacoes:  # Sem mais transacoes
-                    break
-                    
-                todas_transacoes.extend(transacoes)
-                
-                # Se retornou menos que o limit, nao ha mais paginas
-                if len(transacoes) < limit:
-                    break
-                    
-                offset += limit  # Proxima pagina
-                
-            else:
-                # Erro na requisicao mas ja temos algumas transacoes
-                if todas_transacoes:
-                    break
-                    
-                # Debug: captura resposta de erro
-                try:
-                    error_body = response.text[:500]
-                except:
-                    error_body = "Não foi possível ler corpo da resposta"
-
-                return {
-                    'success': False,
-                    'error': f'Status {response.status_code}',
-                    'details': error_body,
-                    'url': response.url
-                }
-
-        return {
-            'success': True,
-            'transacoes': todas_transacoes,
-            'total': len(todas_transacoes),
-            'paginas': pagina + 1
-        }
-
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f'Erro: {str(e)}'
-        }
-
-
-def agrupar_por_sessoes(transacoes, gap_horas=1):
-    """
-    Agrupa transacoes em sessoes baseado em gaps de tempo.
-    Se passar mais de {gap_horas} hora(s) entre transacoes = sessao nova.
-    """
-    from datetime import datetime, timedelta
-
-    if not transacoes:
-        return []
-
-    # Ordena por data (mais antiga primeiro)
-    transacoes_sorted = sorted(transacoes, key=lambda x: x['date'])
-
-    sessoes = []
-    sessao_atual = {
-        'inicio': None,
-        'fim': None,
-        'transacoes': [],
-        'tokens_total': 0,
-        'duracao_segundos': 0
-    }
-
-    gap_limite = timedelta(hours=gap_horas)
-
-    for i, trans in enumerate(transacoes_sorted):
-        data_trans = datetime.fromisoformat(trans['date'].replace('Z', '+00:00'))
-
-        if i == 0:
-            # Primeira transacao = inicio da primeira sessao
-            sessao_atual['inicio'] = data_trans
-            sessao_atual['fim'] = data_trans
-            sessao_atual['transacoes'].append(trans)
-            sessao_atual['tokens_total'] += trans['tokens']
-        else:
-            # Verifica gap com transacao anterior
-            ultima_data = datetime.fromisoformat(transacoes_sorted[i-1]['date'].replace('Z', '+00:00'))
-            gap = data_trans - ultima_data
-
-            if gap > gap_limite:
-                # Gap maior que limite = nova sessao
-                # Finaliza sessao atual
-                sessao_atual['duracao_segundos'] = (sessao_atual['fim'] - sessao_atual['inicio']).total_seconds()
-                sessoes.append(sessao_atual.copy())
-
-                # Inicia nova sessao
-                sessao_atual = {
-                    'inicio': data_trans,
-                    'fim': data_trans,
-                    'transacoes': [trans],
-                    'tokens_total': trans['tokens'],
-                    'duracao_segundos': 0
-                }
-            else:
-                # Mesma sessao
-                sessao_atual['fim'] = data_trans
-                sessao_atual['transacoes'].append(trans)
-                sessao_atual['tokens_total'] += trans['tokens']
-
-    # Adiciona ultima sessao
-    if sessao_atual['transacoes']:
-        sessao_atual['duracao_segundos'] = (sessao_atual['fim'] - sessao_atual['inicio']).total_seconds()
-        sessoes.append(sessao_atual)
-
-    return sessoes
-
-
-def calcular_duracao_sessao_inteligente(sessao):
-    """
-    Calcula duracao real estimada da sessao.
-    Se duracao entre primeira e ultima transacao < 5min, assume pelo menos 30min de live.
-    """
-    duracao_transacoes = sessao['duracao_segundos']
-
-    # Se duracao muito curta (varias gorjetas rapidas), assume tempo minimo
-    if duracao_transacoes < 300:  # Menos de 5 minutos
-        return max(1800, duracao_transacoes)  # Minimo 30min
-    else:
-        # Adiciona 15min no final (geralmente continua transmitindo apos ultima gorjeta)
-        return duracao_transacoes + 900
-
-
-
-
-def processar_csv_estoque(uploaded_file):
-    """
-    Processa CSV de estoque com regras especificas:
-    - skiprows=3 (3 linhas de metadata)
-    - Limpa colunas de currency brasileira
-    """
-    try:
-        # Le CSV pulando 3 primeiras linhas de metadata
-        df = pd.read_csv(uploaded_file, skiprows=3)
-
-        # Identifica colunas de moeda para limpar
-        colunas_moeda = []
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                # Verifica se contem "R$" em alguma celula
-                amostra = df[col].astype(str).head(5)
-                if any('R$' in str(val) for val in amostra):
-                    colunas_moeda.append(col)
-
-        # Limpa colunas de moeda
-        for col in colunas_moeda:
-            df[f'{col}_limpo'] = df[col].apply(limpar_currency_br)
-
-        return {
-            'success': True,
-            'df': df,
-            'colunas_moeda': colunas_moeda
-        }
-
-    except Exception as e:
-        return {
-            'success': False,
-            'error': f'Erro ao processar CSV: {str(e)}'
-        }
-
-
-def carregar_despesas():
-    """Carrega dados de despesas do Google Sheets ou CSV local."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("Despesas")
-            data = ws.get_all_records()
-            if data:
-                df = pd.DataFrame(data)
-                if 'data' in df.columns:
-                    df['data'] = pd.to_datetime(df['data']).dt.date
-                return df
-            return pd.DataFrame(columns=['data', 'item', 'valor', 'pagador'])
-    except:
-        pass
-    
-    # Fallback para arquivo local
-    if os.path.exists(DESPESAS_FILE):
-        df = pd.read_csv(DESPESAS_FILE)
-        df['data'] = pd.to_datetime(df['data']).dt.date
-        return df
-    return pd.DataFrame(columns=['data', 'item', 'valor', 'pagador'])
-
-
-def salvar_despesas(df):
-    """Salva dados de despesas no Google Sheets ou CSV local."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("Despesas")
-            ws.clear()
-            # Header
-            ws.append_row(['data', 'item', 'valor', 'pagador'])
-            # Dados
-            for _, row in df.iterrows():
-                data_str = str(row['data']) if row['data'] else ''
-                ws.append_row([data_str, row['item'], float(row['valor']), row['pagador']])
-            return
-    except:
-        pass
-    
-    # Fallback para arquivo local
-    df.to_csv(DESPESAS_FILE, index=False)
-
-
-# ============ DESPESAS PESSOAIS DOS SOCIOS ============
-
-def carregar_despesas_pessoais():
-    """Carrega despesas pessoais do Google Sheets (aba DespesasPessoais)."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            # Verifica se a aba existe, se nao cria
-            try:
-                ws = spreadsheet.worksheet("DespesasPessoais")
-            except:
-                ws = spreadsheet.add_worksheet(title="DespesasPessoais", rows=1000, cols=10)
-                ws.append_row(['data', 'descricao', 'valor', 'socio', 'categoria'])
-            
-            data = ws.get_all_records()
-            if data:
-                df = pd.DataFrame(data)
-                if 'data' in df.columns:
-                    df['data'] = pd.to_datetime(df['data']).dt.date
-                if 'valor' in df.columns:
-                    df['valor'] = df['valor'].apply(lambda x: float(str(x).replace(',', '.')) if x else 0.0)
-                return df
-            return pd.DataFrame(columns=['data', 'descricao', 'valor', 'socio', 'categoria'])
-    except Exception as e:
-        pass
-    
-    return pd.DataFrame(columns=['data', 'descricao', 'valor', 'socio', 'categoria'])
-
-
-def salvar_despesa_pessoal(data, descricao, valor, socio, categoria="Geral"):
-    """Adiciona uma nova despesa pessoal no Google Sheets."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            try:
-                ws = spreadsheet.worksheet("DespesasPessoais")
-            except:
-                ws = spreadsheet.add_worksheet(title="DespesasPessoais", rows=1000, cols=10)
-                ws.append_row(['data', 'descricao', 'valor', 'socio', 'categoria'])
-            
-            ws.append_row([
-                str(data),
-                descricao,
-                float(valor),
-                socio,
-                categoria
-            ], value_input_option='RAW')
-            return True
-    except Exception as e:
-        pass
-    return False
-
-
-def limpar_despesas_pessoais_socio(socio):
-    """Limpa todas as despesas pessoais de um socio."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("DespesasPessoais")
-            all_data = ws.get_all_values()
-            
-            if len(all_data) <= 1:
-                return True
-            
-            # Filtra mantendo apenas despesas de outros socios
-            header = all_data[0]
-            socio_idx = header.index('socio') if 'socio' in header else 3
-            
-            new_data = [header]
-            for row in all_data[1:]:
-                if len(row) > socio_idx and row[socio_idx] != socio:
-                    new_data.append(row)
-            
-            ws.clear()
-            for row in new_data:
-                ws.append_row(row)
-            
-            return True
-    except:
-        pass
-    return False
-
-
-def salvar_cookies(cookies_dict):
-    """Salva cookies em arquivo JSON local"""
-    COOKIES_FILE = 'cookies_saved.json'
-    with open(COOKIES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(cookies_dict, f, indent=2)
-
-
-def carregar_cookies_salvos():
-    """Carrega cookies salvos do arquivo"""
-    COOKIES_FILE = 'cookies_saved.json'
-    if os.path.exists(COOKIES_FILE):
-        try:
-            with open(COOKIES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return None
-    return None
-
-
-
-
-def parse_float_br(valor):
-    """
-    Converte valor numérico que pode estar em formato BR (vírgula decimal).
-    Trata tanto float direto quanto string formatada.
-    """
-    if isinstance(valor, (int, float)):
-        return float(valor)
-    if not valor or valor == '':
-        return 0.0
-    # Converte string - remove pontos de milhar e troca vírgula por ponto
-    s = str(valor).strip()
-    # Se tem vírgula e ponto, assume formato BR (1.234,56)
-    if ',' in s and '.' in s:
-        s = s.replace('.', '').replace(',', '.')
-    # Se só tem vírgula, assume decimal BR (123,45)
-    elif ',' in s:
-        s = s.replace(',', '.')
-    try:
-        return float(s)
-    except:
-        return 0.0
-
-
-def carregar_produtos():
-    """Carrega produtos do Google Sheets ou arquivo JSON local."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("Produtos")
-            # Usa get_all_values para ter controle total sobre parsing
-            all_values = ws.get_all_values()
-            if len(all_values) <= 1:  # Só header ou vazio
-                return []
-            
-            headers = all_values[0]
-            data = []
-            for row in all_values[1:]:
-                if len(row) >= len(headers):
-                    item = dict(zip(headers, row))
-                    # Converte tipos numéricos com suporte a formato BR
-                    item['id'] = int(item.get('id', 0) or 0)
-                    item['quantidade_gramas'] = parse_float_br(item.get('quantidade_gramas', 0))
-                    item['quantidade_inicial'] = parse_float_br(item.get('quantidade_inicial', 0))
-                    item['preco_compra_total'] = parse_float_br(item.get('preco_compra_total', 0))
-                    item['vendido_gramas'] = parse_float_br(item.get('vendido_gramas', 0))
-                    data.append(item)
-            return data
-    except:
-        pass
-    
-    # Fallback para arquivo local
-    if os.path.exists(PRODUTOS_FILE):
-        try:
-            with open(PRODUTOS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-
-def salvar_produtos(produtos):
-    """Salva produtos no Google Sheets ou arquivo JSON local."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("Produtos")
-            ws.clear()
-            # Header
-            ws.append_row(["id", "nome", "descricao", "quantidade_gramas", "quantidade_inicial", "preco_compra_total", "vendido_gramas", "data_cadastro"], value_input_option='RAW')
-            # Dados - usa RAW para preservar decimais corretamente
-            for p in produtos:
-                ws.append_row([
-                    p.get('id', 0),
-                    p.get('nome', ''),
-                    p.get('descricao', ''),
-                    float(p.get('quantidade_gramas', 0)),
-                    float(p.get('quantidade_inicial', 0)),
-                    float(p.get('preco_compra_total', 0)),
-                    float(p.get('vendido_gramas', 0)),
-                    p.get('data_cadastro', '')
-                ], value_input_option='RAW')
-            return
-    except:
-        pass
-    
-    # Fallback para arquivo local
-    with open(PRODUTOS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(produtos, f, indent=2, ensure_ascii=False)
-
-
-
-def carregar_vendas():
-    """Carrega vendas do Google Sheets ou arquivo JSON local."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("Vendas")
-            # Usa get_all_values para ter controle total sobre parsing
-            all_values = ws.get_all_values()
-            if len(all_values) <= 1:  # Só header ou vazio
-                return []
-            
-            headers = all_values[0]
-            data = []
-            for row in all_values[1:]:
-                if len(row) >= len(headers):
-                    item = dict(zip(headers, row))
-                    # Converte tipos numéricos com suporte a formato BR
-                    item['id'] = int(item.get('id', 0) or 0)
-                    item['produto_id'] = int(item.get('produto_id', 0) or 0)
-                    item['gramas'] = parse_float_br(item.get('gramas', 0))
-                    item['valor_venda'] = parse_float_br(item.get('valor_venda', 0))
-                    item['custo'] = parse_float_br(item.get('custo', 0))
-                    item['lucro'] = parse_float_br(item.get('lucro', 0))
-                    data.append(item)
-            return data
-    except:
-        pass
-    
-    # Fallback para arquivo local
-    if os.path.exists(VENDAS_FILE):
-        try:
-            with open(VENDAS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
-    return []
-
-
-def salvar_vendas(vendas):
-    """Salva vendas no Google Sheets ou arquivo JSON local."""
-    try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            ws = spreadsheet.worksheet("Vendas")
-            ws.clear()
-            # Header
-            ws.append_row(["id", "produto_id", "produto_nome", "cliente", "gramas", "valor_venda", "custo", "lucro", "data"], value_input_option='RAW')
-            # Dados - usa RAW para preservar decimais corretamente
-            for v in vendas:
-                ws.append_row([
-                    v.get('id', 0),
-                    v.get('produto_id', 0),
-                    v.get('produto_nome', ''),
-                    v.get('cliente', ''),
-                    float(v.get('gramas', 0)),
-                    float(v.get('valor_venda', 0)),
-                    float(v.get('custo', 0)),
-                    float(v.get('lucro', 0)),
-                    v.get('data', '')
-                ], value_input_option='RAW')
-            return
-    except:
-        pass
-    
-    # Fallback para arquivo local
-    with open(VENDAS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(vendas, f, indent=2, ensure_ascii=False)
-
-
-def adicionar_produto(nome, quantidade_gramas, preco_compra, descricao=""):
-    """Adiciona novo produto ao estoque"""
-    produtos = carregar_produtos()
-    novo_produto = {
-        'id': len(produtos) + 1 if produtos else 1,
-        'nome': nome,
-        'descricao': descricao,
-        'quantidade_gramas': quantidade_gramas,
-        'quantidade_inicial': quantidade_gramas,
-        'preco_compra_total': preco_compra,
-        'vendido_gramas': 0,
-        'data_cadastro': datetime.now().isoformat()
-    }
-    produtos.append(novo_produto)
-    salvar_produtos(produtos)
-    return novo_produto
-
-
-def registrar_venda(produto_id, gramas_vendidas, valor_venda, cliente=""):
-    """Registra uma venda parcial e atualiza estoque"""
-    produtos = carregar_produtos()
-    vendas = carregar_vendas()
-
-    # Encontra produto
-    produto = next((p for p in produtos if p['id'] == produto_id), None)
-    if not produto:
-        return False, "Produto não encontrado"
-
-    # Verifica estoque
-    if produto['quantidade_gramas'] < gramas_vendidas:
-        return False, f"Estoque insuficiente. Disponível: {produto['quantidade_gramas']}g"
-
-    # Calcula custo proporcional e lucro
-    custo_por_grama = produto['preco_compra_total'] / produto['quantidade_inicial']
-    custo_venda = custo_por_grama * gramas_vendidas
-    lucro = valor_venda - custo_venda
-
-    # Atualiza estoque
-    produto['quantidade_gramas'] -= gramas_vendidas
-    produto['vendido_gramas'] += gramas_vendidas
-
-    # Registra venda
-    nova_venda = {
-        'id': len(vendas) + 1 if vendas else 1,
-        'produto_id': produto_id,
-        'produto_nome': produto['nome'],
-        'cliente': cliente,
-        'gramas': gramas_vendidas,
-        'valor_venda': valor_venda,
-        'custo': custo_venda,
-        'lucro': lucro,
-        'data': datetime.now().isoformat()
-    }
-    vendas.append(nova_venda)
-
-    salvar_produtos(produtos)
-    salvar_vendas(vendas)
-
-    return True, "Venda registrada com sucesso!"
-
-
-def remover_produto(produto_id):
-    """Remove produto do estoque"""
-    produtos = carregar_produtos()
-    produtos = [p for p in produtos if p['id'] != produto_id]
-    salvar_produtos(produtos)
-    return True
-
-
 # ==================== INICIALIZACAO SESSION STATE ====================
+# Worker de sincronizacao do espelho local com o Sheets (uma vez por processo)
+if _sheets_configurado():
+    iniciar_sincronizador_sheets()
+
 if 'despesas_df' not in st.session_state:
     st.session_state.despesas_df = carregar_despesas()
 
@@ -1815,6 +395,10 @@ if 'debug_api_data' not in st.session_state:
 
 if 'sessoes_data' not in st.session_state:
     st.session_state.sessoes_data = None
+if 'df_transacoes' not in st.session_state:
+    st.session_state.df_transacoes = None
+if 'indice_revenue' not in st.session_state:
+    st.session_state.indice_revenue = None
 
 if 'transacoes_raw' not in st.session_state:
     st.session_state.transacoes_raw = None
@@ -1822,6 +406,20 @@ if 'transacoes_raw' not in st.session_state:
 if 'cookies_salvos' not in st.session_state:
     st.session_state.cookies_salvos = carregar_cookies_salvos()
 
+if 'revenue_snapshot_mtime' not in st.session_state:
+    st.session_state.revenue_snapshot_mtime = None
+if 'revenue_atualizado_em' not in st.session_state:
+    st.session_state.revenue_atualizado_em = None
+
+# Worker de sync da Revenue (uma vez por processo) - a interface so le o snapshot
+iniciar_agendador_revenue()
+
+# Snapshot compartilhado da Revenue: pinta a aba na hora, sem sincronizar.
+# Se o agendador (ou outra sessao) gravou um mais novo, troca.
+dados_snapshot, mtime_snapshot = carregar_snapshot_revenue()
+if dados_snapshot and mtime_snapshot != st.session_state.revenue_snapshot_mtime:
+    aplicar_dados_revenue(dados_snapshot, mtime_snapshot)
+
 # ==================== HEADER ====================
 st.markdown("""
 <div class="main-header">
@@ -1860,1368 +458,35 @@ st.sidebar.markdown("---")
 st.sidebar.markdown(f"**🪙 1 Token = R$ {0.05 * cotacao_dolar:.2f}**")
 st.sidebar.markdown(f"**🎯 Meta Diária = $100 USD**")
 
-# ==================== TABS ====================
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "🔴 REVENUE API",
-    "📦 INVENTORY (STOCK)",
-    "🏠 HOUSEHOLD EXPENSES",
-    "📊 EXECUTIVE DASHBOARD",
-    "👥 CONTAS PESSOAIS"
-])
-
-# ==================== TAB 1: REVENUE API ====================
-with tab1:
-    st.markdown("### 🔴 Revenue Revenue Tracking")
-    st.markdown("Rastreamento em tempo real via API escondida da plataforma")
-
-    col_sync, col_result = st.columns([1, 2])
-
-    with col_sync:
-        st.markdown("#### 🔄 Sincronizar Dados")
-
-        # Verifica se ja tem cookies salvos
-        if st.session_state.cookies_salvos:
-            st.success("✅ Cookies salvos encontrados")
-
-            col_btn1, col_btn2 = st.columns(2)
-
-            with col_btn1:
-                atualizar_cookies = st.checkbox("Atualizar cookies", value=False)
-
-            with col_btn2:
-                if st.button("🗑️ Limpar cookies", use_container_width=True):
-                    os.remove('cookies_saved.json')
-                    st.session_state.cookies_salvos = None
-                    st.rerun()
-        else:
-            atualizar_cookies = True
-            st.info("📁 Faça upload dos cookies pela primeira vez")
-
-        # Upload de cookies (só mostra se não tiver salvos ou se quiser atualizar)
-        uploaded_cookies = None
-        if atualizar_cookies:
-            uploaded_cookies = st.file_uploader(
-                "📁 Upload cookies.json",
-                type=['json'],
-                help="Arquivo JSON exportado da extensao de cookies"
-            )
-
-        # Periodo de historico
-        dias_historico = st.selectbox(
-            "📅 Período",
-            options=[7, 15, 30, 60, 90],
-            index=2,
-            format_func=lambda x: f"{x} dias",
-            help="Quantos dias de histórico buscar"
-        )
-
-        if st.button("🚀 SINCRONIZAR", type="primary", use_container_width=True):
-            # Decide de onde pegar os cookies
-            cookies_dict = None
-
-            if uploaded_cookies:
-                # Upload novo - processa e salva
-                try:
-                    cookies_raw = uploaded_cookies.read().decode('utf-8')
-                    cookies_list = json.loads(cookies_raw)
-
-                    # Converte lista de cookies para dict
-                    cookies_dict = {}
-                    for cookie in cookies_list:
-                        if isinstance(cookie, dict) and 'name' in cookie and 'value' in cookie:
-                            cookies_dict[cookie['name']] = cookie['value']
-
-                    if cookies_dict:
-                        # Salva os cookies novos
-                        salvar_cookies(cookies_dict)
-                        st.session_state.cookies_salvos = cookies_dict
-                except json.JSONDecodeError:
-                    st.error("JSON invalido! Verifique o arquivo.")
-                except Exception as e:
-                    st.error(f"Erro: {str(e)}")
-            elif st.session_state.cookies_salvos:
-                # Usa cookies salvos
-                cookies_dict = st.session_state.cookies_salvos
-            else:
-                st.error("Faca upload do arquivo cookies.json primeiro!")
-
-            if cookies_dict:
-                with st.spinner("Sincronizando dados..."):
-                    # 1. Busca dados basicos (tokens totais, user info)
-                    result = fetch_stipchat_stats_requests(None, all_cookies=cookies_dict)
-
-                    if result['success']:
-                        user_id = result['data']['initial']['client']['user']['id']
-
-                        # 2. Busca historico de transacoes
-                        with st.spinner(f"Carregando histórico de {dias_historico} dias..."):
-                            transacoes_result = fetch_transacoes_periodo(user_id, cookies_dict, dias=dias_historico)
-
-                        if transacoes_result['success']:
-                            # 3. Agrupa em sessoes
-                            sessoes = agrupar_por_sessoes(transacoes_result['transacoes'], gap_horas=1)
-
-                            # Guarda dados
-                            st.session_state.stipchat_data = result
-                            st.session_state.transacoes_raw = transacoes_result['transacoes']
-                            st.session_state.sessoes_data = sessoes
-
-                            st.success(f"✅ Sincronizado! {result['tokens']} tokens | {len(sessoes)} sessões")
-                            st.rerun()
-                        else:
-                            st.error(f"Erro ao buscar transações: {transacoes_result['error']}")
-                    else:
-                        st.error(f"Erro: {result['error']}")
-                        st.warning("Cookies expirados? Atualize fazendo novo upload.")
-
-    with col_result:
-        st.markdown("#### 📊 Analytics Dashboard")
-
-        if st.session_state.sessoes_data:
-            from datetime import datetime, timedelta, timezone
-            from collections import defaultdict
-            import pandas as pd
-
-            sessoes = st.session_state.sessoes_data
-            data = st.session_state.stipchat_data
-
-            tokens_total = data['tokens']
-            transacoes = st.session_state.transacoes_raw
-
-            # Calcula metricas avancadas
-            revenue_total = tokens_total * 0.05 * cotacao_dolar
-            total_transacoes = len(transacoes)
-            clientes_unicos = len(set(t['username'] for t in transacoes if t.get('username')))
-
-            # Horas totais trabalhadas
-            horas_totais = sum(calcular_duracao_sessao_inteligente(s) for s in sessoes) / 3600
-            taxa_hora_geral = revenue_total / horas_totais if horas_totais > 0 else 0
-
-            # Ticket medio
-            ticket_medio = tokens_total / total_transacoes if total_transacoes > 0 else 0
-
-            # KPIs Principais - Linha 1
-            col_k1, col_k2, col_k3, col_k4 = st.columns(4)
-
-            with col_k1:
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">💰 Revenue Total</p>
-                    <p class="kpi-value-green">R$ {revenue_total:,.2f}</p>
-                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{tokens_total:,} tokens</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col_k2:
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">📈 R$/Hora Média</p>
-                    <p class="kpi-value-blue">R$ {taxa_hora_geral:,.2f}/h</p>
-                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{horas_totais:.1f}h trabalhadas</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col_k3:
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">👥 Clientes Únicos</p>
-                    <p class="kpi-value-purple">{clientes_unicos:,}</p>
-                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{total_transacoes} transações</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col_k4:
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">🎯 Ticket Médio</p>
-                    <p class="kpi-value-gold">{ticket_medio:.1f} tokens</p>
-                    <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">R$ {ticket_medio * 0.05 * cotacao_dolar:.2f} média</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            st.markdown("---")
-
-            # META DIARIA - Barra de Progresso
-            st.markdown("#### 🎯 Meta Diaria: $100 USD")
-            
-            # Calcula quanto fez hoje
-            hoje_inicio = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            hoje_inicio_utc = hoje_inicio.astimezone(timezone.utc)
-            sessoes_hoje = [s for s in sessoes if s['fim'] >= hoje_inicio_utc]
-            tokens_hoje = sum(s['tokens_total'] for s in sessoes_hoje)
-            usd_hoje = tokens_hoje * 0.05
-            
-            # Progresso da meta
-            meta_usd = 100.0
-            progresso = min(usd_hoje / meta_usd, 1.0)  # Cap em 100%
-            progresso_pct = progresso * 100
-            
-            # Cor baseada no progresso
-            if progresso >= 1.0:
-                cor_barra = "#00ff88"
-                status_meta = "META BATIDA!"
-            elif progresso >= 0.75:
-                cor_barra = "#ffd700"
-                status_meta = "Quase la!"
-            elif progresso >= 0.5:
-                cor_barra = "#4da6ff"
-                status_meta = "Metade do caminho"
-            else:
-                cor_barra = "#ff4444"
-                status_meta = "Foco na live!"
-            
-            st.markdown(f"""
-            <div style="background: #1a1a1a; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-                <div style="display: flex; justify-content: space-between; margin-bottom: 10px;">
-                    <span style="color: #888;">Progresso Hoje</span>
-                    <span style="color: {cor_barra}; font-weight: bold;">${usd_hoje:.2f} / ${meta_usd:.0f} USD ({progresso_pct:.0f}%)</span>
-                </div>
-                <div style="background: #333; border-radius: 10px; height: 20px; overflow: hidden;">
-                    <div style="background: {cor_barra}; width: {progresso_pct}%; height: 100%; border-radius: 10px; transition: width 0.5s;"></div>
-                </div>
-                <p style="text-align: center; color: {cor_barra}; margin-top: 10px; font-weight: bold;">{status_meta}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-            st.markdown("---")
-
-            # CLIENTES VIP - Top 20 All-Time
-            st.markdown("#### 👑 Clientes VIP (Top 20 All-Time)")
-            st.caption("Maiores gastadores de todo o historico - de atencao especial a eles!")
-            
-            # Agrupa todos os gastos por cliente (all-time)
-            gastos_vip = defaultdict(lambda: {'tokens': 0, 'transacoes': 0, 'revenue': 0.0, 'ultima_data': None})
-            
-            for trans in transacoes:
-                username = trans.get('username', 'Anonimo')
-                tokens = trans.get('tokens', 0)
-                gastos_vip[username]['tokens'] += tokens
-                gastos_vip[username]['transacoes'] += 1
-                gastos_vip[username]['revenue'] += tokens * 0.05 * cotacao_dolar
-                # Guarda data mais recente
-                trans_date = trans.get('timestamp')
-                if trans_date:
-                    if gastos_vip[username]['ultima_data'] is None or trans_date > gastos_vip[username]['ultima_data']:
-                        gastos_vip[username]['ultima_data'] = trans_date
-            
-            # Top 20 VIP
-            top_vip = sorted(gastos_vip.items(), key=lambda x: x[1]['tokens'], reverse=True)[:20]
-            
-            if top_vip:
-                col_vip1, col_vip2 = st.columns(2)
-                
-                # Primeira metade (1-10)
-                with col_vip1:
-                    for i, (username, info) in enumerate(top_vip[:10]):
-                        medalha = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"#{i+1}"
-                        st.markdown(f"""
-                        <div style="background: #1a1a1a; border-radius: 8px; padding: 12px; margin: 4px 0; display: flex; justify-content: space-between; align-items: center;">
-                            <span style="color: #00ff88; font-weight: bold;">{medalha} {username[:18]}</span>
-                            <span style="color: #ffd700;">{info['tokens']:,} tk | R$ {info['revenue']:.0f}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-                
-                # Segunda metade (11-20)
-                with col_vip2:
-                    for i, (username, info) in enumerate(top_vip[10:20]):
-                        st.markdown(f"""
-                        <div style="background: #1a1a1a; border-radius: 8px; padding: 12px; margin: 4px 0; display: flex; justify-content: space-between; align-items: center;">
-                            <span style="color: #888;">#{i+11} {username[:18]}</span>
-                            <span style="color: #4da6ff;">{info['tokens']:,} tk | R$ {info['revenue']:.0f}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-            else:
-                st.info("Sincronize dados para ver clientes VIP")
-
-            st.markdown("---")
-
-            # Analytics Mensal
-            st.markdown("#### 📅 Performance Mensal")
-
-            from collections import defaultdict
-            import calendar as cal
-
-            faturamento_por_mes = defaultdict(lambda: {'tokens': 0, 'usd': 0.0, 'dias': set(), 'sessoes': 0})
-
-            for sessao in sessoes:
-                data_sessao = sessao['inicio'].astimezone().date()
-                mes_ano = data_sessao.strftime('%Y-%m')  # ex: 2025-12
-                tokens = sessao['tokens_total']
-                usd = tokens * 0.05
-
-                faturamento_por_mes[mes_ano]['tokens'] += tokens
-                faturamento_por_mes[mes_ano]['usd'] += usd
-                faturamento_por_mes[mes_ano]['dias'].add(data_sessao)
-                faturamento_por_mes[mes_ano]['sessoes'] += 1
-
-            # Ordena por mes (mais recente primeiro)
-            meses_ordenados = sorted(faturamento_por_mes.items(), key=lambda x: x[0], reverse=True)
-
-            if meses_ordenados:
-                col_m1, col_m2, col_m3, col_m4 = st.columns(4)
-
-                for idx, (mes_ano, info) in enumerate(meses_ordenados[:4]):  # Mostra últimos 4 meses
-                    ano, mes_num = mes_ano.split('-')
-                    nome_mes = cal.month_name[int(mes_num)]
-                    dias_trabalhados = len(info['dias'])
-                    meta_mes = dias_trabalhados * 100  # $100 por dia de live
-                    percentual_meta = (info['usd'] / meta_mes * 100) if meta_mes > 0 else 0
-                    cor_meta = "green" if percentual_meta >= 100 else "blue" if percentual_meta >= 75 else "red"
-
-                    col = [col_m1, col_m2, col_m3, col_m4][idx]
-                    with col:
-                        st.markdown(f"""
-                        <div class="kpi-card">
-                            <p class="kpi-title">💵 {nome_mes}/{ano}</p>
-                            <p class="kpi-value-{cor_meta}">${info['usd']:.2f} USD</p>
-                            <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">
-                                {dias_trabalhados} dias | {info['sessoes']} sessões<br>
-                                Meta: ${meta_mes:.0f} ({percentual_meta:.0f}%)
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
-
-            st.markdown("---")
-
-            # Seletor de Visualizacao
-            st.markdown("#### 🎯 Visualização")
-
-            col_filtro1, col_filtro2 = st.columns([2, 1])
-
-            with col_filtro1:
-                filtro = st.radio(
-                    "Modo:",
-                    options=["Ultima Live", "Hoje", "Ontem", "Ultimas 24h", "Ultima Semana", "Mes Atual", "Calendario", "Todas"],
-                    horizontal=True,
-                    index=0
-                )
-
-            with col_filtro2:
-                if filtro == "Calendario":
-                    data_selecionada = st.date_input(
-                        "Selecione o dia:",
-                        value=date.today(),
-                        max_value=date.today()
-                    )
-
-            # Aplica filtros
-            from datetime import datetime, timedelta, timezone
-            import calendar as cal
-
-            agora_utc = datetime.now(timezone.utc)
-            sessoes_filtradas = sessoes.copy()
-
-            if filtro == "Ultima Live":
-                # Mostra apenas a sessao mais recente
-                if sessoes:
-                    sessoes_filtradas = [sessoes[-1]]
-                else:
-                    sessoes_filtradas = []
-            elif filtro == "Hoje":
-                # Desde 00h de hoje (timezone local)
-                hoje_inicio = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                hoje_inicio_utc = hoje_inicio.astimezone(timezone.utc)
-                sessoes_filtradas = [s for s in sessoes if s['fim'] >= hoje_inicio_utc]
-            elif filtro == "Ontem":
-                # Dia anterior completo
-                ontem = datetime.now().date() - timedelta(days=1)
-                inicio_ontem = datetime.combine(ontem, datetime.min.time()).astimezone(timezone.utc)
-                fim_ontem = datetime.combine(ontem, datetime.max.time()).astimezone(timezone.utc)
-                sessoes_filtradas = [s for s in sessoes if inicio_ontem <= s['inicio'] <= fim_ontem]
-            elif filtro == "Ultimas 24h":
-                inicio_24h = agora_utc - timedelta(hours=24)
-                sessoes_filtradas = [s for s in sessoes if s['fim'] >= inicio_24h]
-            elif filtro == "Ultima Semana":
-                inicio_semana = agora_utc - timedelta(days=7)
-                sessoes_filtradas = [s for s in sessoes if s['fim'] >= inicio_semana]
-            elif filtro == "Mes Atual":
-                hoje = datetime.now().date()
-                inicio_mes = hoje.replace(day=1)
-                inicio_mes_dt = datetime.combine(inicio_mes, datetime.min.time()).astimezone(timezone.utc)
-                sessoes_filtradas = [s for s in sessoes if s['fim'] >= inicio_mes_dt]
-            elif filtro == "Calendario":
-                # Filtra pelo dia selecionado
-                inicio_dia = datetime.combine(data_selecionada, datetime.min.time()).astimezone(timezone.utc)
-                fim_dia = datetime.combine(data_selecionada, datetime.max.time()).astimezone(timezone.utc)
-                sessoes_filtradas = [s for s in sessoes if inicio_dia <= s['fim'] <= fim_dia]
-
-            # Filtra transacoes pelo mesmo periodo
-            transacoes_filtradas = []
-            for sessao in sessoes_filtradas:
-                transacoes_filtradas.extend(sessao['transacoes'])
-
-            # Top Clientes Analytics
-            st.markdown("---")
-
-            col_chart1, col_chart2 = st.columns(2)
-
-            with col_chart1:
-                st.markdown("#### 👑 Top 10 Clientes (Maiores Gastadores)")
-
-                # Agrupa por cliente
-                from collections import defaultdict
-                gastos_por_cliente = defaultdict(lambda: {'tokens': 0, 'transacoes': 0, 'revenue': 0.0})
-
-                for trans in transacoes_filtradas:
-                    username = trans.get('username', 'Anônimo')
-                    tokens = trans.get('tokens', 0)
-                    gastos_por_cliente[username]['tokens'] += tokens
-                    gastos_por_cliente[username]['transacoes'] += 1
-                    gastos_por_cliente[username]['revenue'] += tokens * 0.05 * cotacao_dolar
-
-                # Ordena por tokens (decrescente)
-                top_clientes = sorted(gastos_por_cliente.items(), key=lambda x: x[1]['tokens'], reverse=True)[:10]
-
-                if top_clientes:
-                    # Cria DataFrame
-                    top_df = pd.DataFrame([
-                        {
-                            'Cliente': username[:20] + '...' if len(username) > 20 else username,
-                            'Tokens': f"{info['tokens']:,}",
-                            'Tips': info['transacoes'],
-                            'Revenue': f"R$ {info['revenue']:.2f}",
-                            'Ticket': f"{info['tokens']/info['transacoes']:.1f}" if info['transacoes'] > 0 else '0'
-                        }
-                        for username, info in top_clientes
-                    ])
-
-                    st.dataframe(top_df, use_container_width=True, hide_index=True)
-
-                    # Total representado pelos top 10
-                    total_top10 = sum(info['tokens'] for _, info in top_clientes)
-                    percentual_top10 = (total_top10 / tokens_total * 100) if tokens_total > 0 else 0
-                    st.caption(f"Top 10 representa {percentual_top10:.1f}% do total ({total_top10:,} tokens)")
-                else:
-                    st.info("Nenhum cliente encontrado neste período")
-
-            with col_chart2:
-                st.markdown("#### 📊 Distribuição de Revenue")
-
-                if top_clientes:
-                    # Grafico de pizza
-                    labels = [username[:15] + '...' if len(username) > 15 else username for username, _ in top_clientes]
-                    values = [info['revenue'] for _, info in top_clientes]
-
-                    fig = go.Figure(data=[go.Pie(
-                        labels=labels,
-                        values=values,
-                        hole=0.4,
-                        marker=dict(colors=px.colors.sequential.Viridis),
-                        textinfo='label+percent',
-                        textposition='auto',
-                    )])
-
-                    fig.update_layout(
-                        showlegend=False,
-                        height=350,
-                        margin=dict(l=20, r=20, t=20, b=20),
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='#ffffff', size=10)
-                    )
-
-                    st.plotly_chart(fig, use_container_width=True)
-
-            # Graficos de Tendencia Temporal
-            st.markdown("---")
-            st.markdown("#### 📈 Análise Temporal")
-
-            col_time1, col_time2 = st.columns(2)
-
-            with col_time1:
-                # Grafico: Tokens por Dia
-                from collections import defaultdict
-                tokens_por_dia = defaultdict(int)
-
-                for sessao in sessoes_filtradas:
-                    data_local = sessao['inicio'].astimezone().date()
-                    tokens_por_dia[data_local] += sessao['tokens_total']
-
-                if tokens_por_dia:
-                    df_timeline = pd.DataFrame([
-                        {'Data': data, 'Tokens': tokens}
-                        for data, tokens in sorted(tokens_por_dia.items())
-                    ])
-
-                    fig_timeline = px.area(
-                        df_timeline,
-                        x='Data',
-                        y='Tokens',
-                        title='Tokens por Dia',
-                        color_discrete_sequence=['#00ff88']
-                    )
-
-                    fig_timeline.update_layout(
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(26,26,26,1)',
-                        font=dict(color='#ffffff'),
-                        height=300,
-                        margin=dict(l=40, r=20, t=40, b=40),
-                        xaxis=dict(gridcolor='#333333'),
-                        yaxis=dict(gridcolor='#333333')
-                    )
-
-                    st.plotly_chart(fig_timeline, use_container_width=True)
-
-            with col_time2:
-                # Grafico: R$/Hora por Sessão
-                if sessoes_filtradas:
-                    taxa_por_sessao = []
-                    for i, sessao in enumerate(sessoes_filtradas):
-                        horas = calcular_duracao_sessao_inteligente(sessao) / 3600
-                        revenue_sessao = sessao['tokens_total'] * 0.05 * cotacao_dolar
-                        taxa = revenue_sessao / horas if horas > 0 else 0
-                        taxa_por_sessao.append({
-                            'Sessão': f"S{i+1}",
-                            'R$/hora': taxa
-                        })
-
-                    df_taxa = pd.DataFrame(taxa_por_sessao)
-
-                    fig_taxa = px.bar(
-                        df_taxa,
-                        x='Sessão',
-                        y='R$/hora',
-                        title='Performance por Sessão (R$/hora)',
-                        color='R$/hora',
-                        color_continuous_scale='Viridis'
-                    )
-
-                    fig_taxa.update_layout(
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(26,26,26,1)',
-                        font=dict(color='#ffffff'),
-                        height=300,
-                        margin=dict(l=40, r=20, t=40, b=40),
-                        xaxis=dict(gridcolor='#333333'),
-                        yaxis=dict(gridcolor='#333333'),
-                        showlegend=False
-                    )
-
-                    st.plotly_chart(fig_taxa, use_container_width=True)
-
-            # Insights Automaticos
-            st.markdown("---")
-            st.markdown("#### 💡 Insights & Recomendações")
-
-            col_insight1, col_insight2, col_insight3, col_insight4 = st.columns(4)
-
-            with col_insight1:
-                # Melhor sessao
-                if sessoes_filtradas:
-                    melhor_sessao = max(sessoes_filtradas, key=lambda s: s['tokens_total'])
-                    melhor_revenue = melhor_sessao['tokens_total'] * 0.05 * cotacao_dolar
-                    melhor_data = melhor_sessao['inicio'].astimezone().strftime('%d/%m %H:%M')
-
-                    st.markdown(f"""
-                    <div class="kpi-card">
-                        <p class="kpi-title">🏆 Melhor Sessão</p>
-                        <p class="kpi-value-green">{melhor_sessao['tokens_total']:,} tokens</p>
-                        <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{melhor_data} | R$ {melhor_revenue:.2f}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            with col_insight2:
-                # Cliente mais generoso
-                if gastos_por_cliente:
-                    top1_cliente, top1_info = top_clientes[0]
-                    st.markdown(f"""
-                    <div class="kpi-card">
-                        <p class="kpi-title">👑 Top Cliente</p>
-                        <p class="kpi-value-purple">{top1_info['tokens']:,} tokens</p>
-                        <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">{top1_cliente[:20]}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            with col_insight3:
-                # Meta diaria $100 USD
-                if sessoes_filtradas:
-                    tokens_filtradas_total = sum(s['tokens_total'] for s in sessoes_filtradas)
-                    usd_total = tokens_filtradas_total * 0.05
-                    dias_unicos = len(set(s['inicio'].astimezone().date() for s in sessoes_filtradas))
-                    meta_total = dias_unicos * 100
-                    percentual_meta = (usd_total / meta_total * 100) if meta_total > 0 else 0
-                    cor_meta = "green" if percentual_meta >= 100 else "blue" if percentual_meta >= 75 else "red"
-
-                    st.markdown(f"""
-                    <div class="kpi-card">
-                        <p class="kpi-title">🎯 Meta $100/dia</p>
-                        <p class="kpi-value-{cor_meta}">{percentual_meta:.0f}%</p>
-                        <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">${usd_total:.2f} / ${meta_total:.0f}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            with col_insight4:
-                # Crescimento (compara ultima vs penultima sessao)
-                if len(sessoes_filtradas) >= 2:
-                    ultima = sessoes_filtradas[-1]['tokens_total']
-                    penultima = sessoes_filtradas[-2]['tokens_total']
-                    crescimento = ((ultima - penultima) / penultima * 100) if penultima > 0 else 0
-                    cor = "green" if crescimento >= 0 else "red"
-                    simbolo = "↑" if crescimento >= 0 else "↓"
-
-                    st.markdown(f"""
-                    <div class="kpi-card">
-                        <p class="kpi-title">📊 Tendência</p>
-                        <p class="kpi-value-{cor}">{simbolo} {abs(crescimento):.1f}%</p>
-                        <p style="font-size: 0.75rem; color: #666; margin-top: 8px;">última vs penúltima</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-            # Mostra sessoes filtradas
-            st.markdown("---")
-            st.markdown("#### 🎥 Detalhamento de Sessões")
-
-            if sessoes_filtradas:
-                tokens_filtradas = sum(s['tokens_total'] for s in sessoes_filtradas)
-                revenue_filtradas = tokens_filtradas * 0.05 * cotacao_dolar
-
-                st.markdown(f"**{len(sessoes_filtradas)} sessão(ões) | {tokens_filtradas:,} tokens | R$ {revenue_filtradas:,.2f}**")
-
-                st.markdown("---")
-
-                # Lista de sessoes
-                for i, sessao in enumerate(reversed(sessoes_filtradas)):
-                    # Converte para timezone local para exibicao
-                    inicio_local = sessao['inicio'].astimezone()
-                    fim_local = sessao['fim'].astimezone()
-
-                    duracao_real = calcular_duracao_sessao_inteligente(sessao)
-                    horas = duracao_real / 3600
-                    revenue = sessao['tokens_total'] * 0.05 * cotacao_dolar
-                    taxa_hora = revenue / horas if horas > 0 else 0
-
-                    data_str = inicio_local.strftime('%d/%m/%Y')
-                    hora_inicio = inicio_local.strftime('%H:%M')
-                    hora_fim = fim_local.strftime('%H:%M')
-
-                    with st.expander(f"🎥 Sessão {len(sessoes_filtradas)-i} - {data_str} ({hora_inicio}-{hora_fim})", expanded=(i==0)):
-                        col_s1, col_s2, col_s3 = st.columns(3)
-
-                        with col_s1:
-                            st.metric("🪙 Tokens", f"{sessao['tokens_total']:,}")
-                        with col_s2:
-                            st.metric("⏱️ Duração", f"{horas:.1f}h")
-                        with col_s3:
-                            st.metric("💰 Revenue", f"R$ {revenue:,.2f}")
-
-                        st.metric("📈 R$/hora", f"R$ {taxa_hora:,.2f}/h")
-                        st.caption(f"{len(sessao['transacoes'])} transações | {hora_inicio} - {hora_fim}")
-            else:
-                st.info(f"Nenhuma sessão encontrada para o filtro '{filtro}'")
-
-            # Breakdown Diário
-            st.markdown("---")
-            st.markdown("#### 📅 Breakdown Diário")
-
-            # Agrupa sessões por dia
-            from collections import defaultdict
-
-            breakdown_por_dia = defaultdict(lambda: {'tokens': 0, 'horas': 0.0, 'sessoes': 0, 'revenue': 0.0})
-
-            for sessao in sessoes_filtradas:
-                # Usa data de inicio da sessao (timezone local)
-                data_local = sessao['inicio'].astimezone().date()
-                duracao_horas = calcular_duracao_sessao_inteligente(sessao) / 3600
-                revenue = sessao['tokens_total'] * 0.05 * cotacao_dolar
-
-                breakdown_por_dia[data_local]['tokens'] += sessao['tokens_total']
-                breakdown_por_dia[data_local]['horas'] += duracao_horas
-                breakdown_por_dia[data_local]['sessoes'] += 1
-                breakdown_por_dia[data_local]['revenue'] += revenue
-
-            # Ordena por data (mais recente primeiro)
-            breakdown_ordenado = sorted(breakdown_por_dia.items(), key=lambda x: x[0], reverse=True)
-
-            if breakdown_ordenado:
-                # Cria DataFrame para exibicao
-                breakdown_df = pd.DataFrame([
-                    {
-                        'Data': data.strftime('%d/%m/%Y'),
-                        'Sessões': info['sessoes'],
-                        'Tokens': f"{info['tokens']:,}",
-                        'Horas': f"{info['horas']:.1f}h",
-                        'Revenue': f"R$ {info['revenue']:.2f}",
-                        'R$/hora': f"R$ {info['revenue']/info['horas']:.2f}/h" if info['horas'] > 0 else "R$ 0/h"
-                    }
-                    for data, info in breakdown_ordenado
-                ])
-
-                st.dataframe(breakdown_df, use_container_width=True, hide_index=True)
-
-                # Totais
-                total_dias = len(breakdown_ordenado)
-                total_tokens_breakdown = sum(info['tokens'] for _, info in breakdown_ordenado)
-                total_horas_breakdown = sum(info['horas'] for _, info in breakdown_ordenado)
-                total_revenue_breakdown = sum(info['revenue'] for _, info in breakdown_ordenado)
-                media_hora = total_revenue_breakdown / total_horas_breakdown if total_horas_breakdown > 0 else 0
-
-                col_t1, col_t2, col_t3, col_t4 = st.columns(4)
-                with col_t1:
-                    st.metric("📆 Total Dias", total_dias)
-                with col_t2:
-                    st.metric("🪙 Total Tokens", f"{total_tokens_breakdown:,}")
-                with col_t3:
-                    st.metric("⏱️ Total Horas", f"{total_horas_breakdown:.1f}h")
-                with col_t4:
-                    st.metric("💰 Média/hora", f"R$ {media_hora:.2f}/h")
-            else:
-                st.info("Nenhum dado disponível para breakdown diário")
-
-        else:
-            st.info("Sincronize com cookies para ver análise de sessões")
-
-# ==================== TAB 2: GESTAO DE PRODUTOS ====================
-with tab2:
-    st.markdown("### 📦 Gestão de Produtos & Estoque")
-    st.markdown("Controle completo de produtos, vendas e lucro")
-
-    # Carrega dados
-    produtos = carregar_produtos()
-    vendas = carregar_vendas()
-
-    # Layout em 3 colunas
-    col_add, col_sell, col_dashboard = st.columns([1, 1, 2])
-
-    # COLUNA 1: Adicionar Produto
-    with col_add:
-        st.markdown("#### ➕ Novo Produto")
-
-        with st.form("form_produto", clear_on_submit=True):
-            prod_nome = st.text_input("📝 Nome", placeholder="Ex: Creatina")
-            prod_desc = st.text_area("💬 Descrição", placeholder="Ex: Creatina monohidratada pura", height=80)
-            prod_gramas = st.text_input("⚖️ Quantidade (gramas)", placeholder="Ex: 200")
-            prod_preco_compra = st.text_input("💰 Preço Compra Total (R$)", placeholder="Ex: 150")
-
-            btn_add_prod = st.form_submit_button("✅ Adicionar Produto", use_container_width=True, type="primary")
-
-            if btn_add_prod and prod_nome:
-                try:
-                    gramas = float(prod_gramas.replace(',', '.')) if prod_gramas else 0
-                    preco = float(prod_preco_compra.replace(',', '.')) if prod_preco_compra else 0
-                    if gramas > 0:
-                        novo_prod = adicionar_produto(prod_nome, gramas, preco, prod_desc)
-                        st.success(f"✅ {novo_prod['nome']} adicionado com sucesso!")
-                        st.rerun()
-                    else:
-                        st.error("Informe a quantidade em gramas!")
-                except ValueError:
-                    st.error("Valores inválidos! Use apenas números.")
-
-    # COLUNA 2: Registrar Venda
-    with col_sell:
-        st.markdown("#### 💸 Registrar Venda")
-
-        if produtos:
-            with st.form("form_venda", clear_on_submit=True):
-                # Seletor de produto
-                produto_opcoes = {f"{p['nome']} ({p['quantidade_gramas']}g disponível)": p['id'] for p in produtos if p['quantidade_gramas'] > 0}
-
-                if produto_opcoes:
-                    produto_selecionado = st.selectbox("📦 Produto", list(produto_opcoes.keys()))
-                    produto_id = produto_opcoes[produto_selecionado]
-
-                    # Pega produto para mostrar info
-                    produto = next(p for p in produtos if p['id'] == produto_id)
-
-                    # Calcula custo por grama para referência
-                    custo_por_grama = produto['preco_compra_total'] / produto['quantidade_inicial'] if produto['quantidade_inicial'] > 0 else 0
-                    st.caption(f"💡 Custo por grama: R$ {custo_por_grama:.2f}/g")
-
-                    venda_cliente = st.text_input("👤 Nome do Cliente", placeholder="Ex: João Silva")
-                    venda_gramas_str = st.text_input("⚖️ Gramas Vendidas", placeholder="Ex: 10")
-                    preco_grama_venda_str = st.text_input("💵 Preço por Grama (R$)", placeholder="Ex: 25")
-
-                    # Parse inputs for preview
-                    try:
-                        venda_gramas = float(venda_gramas_str.replace(',', '.')) if venda_gramas_str else 0.0
-                        preco_grama_venda = float(preco_grama_venda_str.replace(',', '.')) if preco_grama_venda_str else 0.0
-                    except ValueError:
-                        venda_gramas = 0.0
-                        preco_grama_venda = 0.0
-                        st.warning("Valores de gramas ou preço inválidos para pré-visualização. Use apenas números.")
-
-                    # Calcula valor total automaticamente
-                    venda_valor = preco_grama_venda * venda_gramas
-
-                    # Preview do cálculo
-                    custo_estimado = custo_por_grama * venda_gramas
-                    lucro_estimado = venda_valor - custo_estimado
-                    cor_lucro = "green" if lucro_estimado >= 0 else "red"
-                    
-                    st.markdown(f"""
-                    **📊 Resumo da Venda:**
-                    - Valor Total: **R$ {venda_valor:.2f}** ({venda_gramas}g × R$ {preco_grama_venda:.2f})
-                    - Custo: R$ {custo_estimado:.2f}
-                    - Lucro: <span style='color: {cor_lucro}; font-weight: bold;'>R$ {lucro_estimado:.2f}</span>
-                    """, unsafe_allow_html=True)
-
-                    btn_vender = st.form_submit_button("✅ Confirmar Venda", use_container_width=True, type="primary")
-
-                    if btn_vender:
-                        if venda_gramas <= 0:
-                            st.error("Informe a quantidade em gramas!")
-                        elif preco_grama_venda <= 0:
-                            st.error("Informe o preço por grama!")
-                        elif venda_gramas > produto['quantidade_gramas']:
-                            st.error(f"Estoque insuficiente! Disponível: {produto['quantidade_gramas']}g")
-                        else:
-                            sucesso, msg = registrar_venda(produto_id, venda_gramas, venda_valor, venda_cliente)
-                            if sucesso:
-                                st.success(msg)
-                                st.rerun()
-                            else:
-                                st.error(msg)
-
-                else:
-                    st.warning("Nenhum produto com estoque disponível")
-        else:
-            st.info("Adicione produtos primeiro")
-
-    # COLUNA 3: Dashboard de Produtos
-    with col_dashboard:
-        st.markdown("#### 📊 Dashboard de Produtos")
-
-        if produtos:
-            # KPIs Gerais
-            investimento_total = sum(p['preco_compra_total'] for p in produtos)
-            valor_vendido = sum(v['valor_venda'] for v in vendas)
-            lucro_bruto = valor_vendido - sum(
-                (p['vendido_gramas'] / p['quantidade_inicial']) * p['preco_compra_total']
-                for p in produtos if p['quantidade_inicial'] > 0
-            )
-
-            col_k1, col_k2, col_k3 = st.columns(3)
-
-            with col_k1:
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">💰 Investido</p>
-                    <p class="kpi-value-blue">R$ {investimento_total:.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col_k2:
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">💵 Vendido</p>
-                    <p class="kpi-value-green">R$ {valor_vendido:.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with col_k3:
-                cor_lucro = "green" if lucro_bruto > 0 else "red"
-                st.markdown(f"""
-                <div class="kpi-card">
-                    <p class="kpi-title">📈 Lucro</p>
-                    <p class="kpi-value-{cor_lucro}">R$ {lucro_bruto:.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-
-            st.markdown("---")
-
-            # Tabela de Produtos
-            st.markdown("**📦 Estoque Atual**")
-
-            produtos_df = pd.DataFrame([
-                {
-                    'Produto': p['nome'],
-                    'Estoque': f"{p['quantidade_gramas']}g",
-                    'Vendido': f"{p['vendido_gramas']}g",
-                    '% Vendido': f"{(p['vendido_gramas']/p['quantidade_inicial']*100):.0f}%" if p['quantidade_inicial'] > 0 else "0%",
-                    'Custo/g': f"R$ {(p['preco_compra_total']/p['quantidade_inicial']):.2f}" if p['quantidade_inicial'] > 0 else "R$ 0.00",
-                    'ID': p['id']
-                }
-                for p in produtos
-            ])
-
-            st.dataframe(produtos_df.drop('ID', axis=1), use_container_width=True, hide_index=True)
-
-            # Botões de ação
-            col_del1, col_del2 = st.columns(2)
-
-            with col_del1:
-                produto_para_remover = st.selectbox("🗑️ Remover produto", [f"{p['nome']}" for p in produtos], key="del_prod")
-
-            with col_del2:
-                if st.button("🗑️ Confirmar Remoção", use_container_width=True):
-                    produto_id = next(p['id'] for p in produtos if p['nome'] == produto_para_remover)
-                    remover_produto(produto_id)
-                    st.success(f"{produto_para_remover} removido!")
-                    st.rerun()
-
-        else:
-            st.info("Nenhum produto cadastrado ainda")
-
-    # VENDAS: Histórico completo
-    st.markdown("---")
-    st.markdown("### 📊 Histórico de Vendas")
-
-    if vendas:
-        vendas_df = pd.DataFrame([
-            {
-                'Data': datetime.fromisoformat(v['data']).strftime('%d/%m/%Y %H:%M'),
-                'Cliente': v['cliente'] if v['cliente'] else '-',
-                'Produto': v['produto_nome'],
-                'Gramas': f"{v['gramas']}g",
-                'Valor': f"R$ {v['valor_venda']:.2f}",
-                'Custo': f"R$ {v['custo']:.2f}",
-                'Lucro': f"R$ {v['lucro']:.2f}"
-            }
-            for v in reversed(vendas)
-        ])
-
-        st.dataframe(vendas_df, use_container_width=True, hide_index=True)
-
-        # Resumo de lucro total
-        lucro_total = sum(v['lucro'] for v in vendas)
-        receita_total = sum(v['valor_venda'] for v in vendas)
-        custo_total = sum(v['custo'] for v in vendas)
-
-        col_l1, col_l2, col_l3 = st.columns(3)
-        with col_l1:
-            st.metric("💰 Receita Total", f"R$ {receita_total:.2f}")
-        with col_l2:
-            st.metric("💸 Custo Total", f"R$ {custo_total:.2f}")
-        with col_l3:
-            st.metric("📈 Lucro Líquido", f"R$ {lucro_total:.2f}")
-    else:
-        st.info("Nenhuma venda registrada ainda")
-
-# ==================== TAB 3: HOUSEHOLD EXPENSES ====================
-with tab3:
-    st.markdown("### 🏠 Household Expenses (Split 50/50)")
-
-    col_form, col_hist = st.columns([1, 1.5])
-
-    with col_form:
-        st.markdown("#### ➕ Adicionar Despesa")
-
-        with st.form("form_despesa", clear_on_submit=True):
-            desp_data = st.date_input("📅 Data", value=date.today())
-            desp_item = st.text_input("📝 Item/Descricao")
-            desp_valor = st.number_input("💰 Valor (R$)", min_value=0.0, max_value=100000.0, value=0.0, step=5.0)
-            desp_pagador = st.selectbox("👤 Pagador", options=["LO", "Companheira"])
-
-            btn_add = st.form_submit_button("✅ Adicionar Gasto", use_container_width=True, type="primary")
-
-            if btn_add and desp_valor > 0 and desp_item:
-                nova_despesa = pd.DataFrame([{
-                    'data': desp_data,
-                    'item': desp_item,
-                    'valor': round(desp_valor, 2),
-                    'pagador': desp_pagador
-                }])
-
-                st.session_state.despesas_df = pd.concat([st.session_state.despesas_df, nova_despesa], ignore_index=True)
-                salvar_despesas(st.session_state.despesas_df)
-                st.success(f"Gasto de R$ {desp_valor:.2f} adicionado!")
-                st.rerun()
-
-    with col_hist:
-        st.markdown("#### 📋 Historico de Despesas")
-
-        if len(st.session_state.despesas_df) > 0:
-            display_desp = st.session_state.despesas_df.copy()
-            display_desp = display_desp.sort_values('data', ascending=False)
-
-            st.dataframe(
-                display_desp,
-                use_container_width=True,
-                column_config={
-                    "data": st.column_config.DateColumn("📅 Data"),
-                    "item": st.column_config.TextColumn("📝 Item"),
-                    "valor": st.column_config.NumberColumn("💰 Valor", format="R$ %.2f"),
-                    "pagador": st.column_config.TextColumn("👤 Pagador")
-                },
-                hide_index=True
-            )
-
-            total_despesas = display_desp['valor'].sum()
-            st.markdown(f"**Total de Despesas: R$ {total_despesas:,.2f}**")
-
-            if st.button("🗑️ Limpar Historico", type="secondary"):
-                st.session_state.despesas_df = pd.DataFrame(columns=['data', 'item', 'valor', 'pagador'])
-                salvar_despesas(st.session_state.despesas_df)
-                st.rerun()
-        else:
-            st.info("Nenhuma despesa registrada")
-
-# ==================== TAB 4: EXECUTIVE DASHBOARD ====================
-with tab4:
-    st.markdown("### 📊 Executive Dashboard - Visao Consolidada")
-
-    # Calcular totais de cada fonte
-
-    # 1. Revenue Revenue
-    stipchat_revenue = 0
-    if st.session_state.stipchat_data:
-        tokens = st.session_state.stipchat_data['tokens']
-        stipchat_revenue = tokens * 0.05 * cotacao_dolar
-
-    # 2. Stock Profit (lucro das vendas do Google Sheets)
-    stock_profit = 0
-    vendas_dashboard = carregar_vendas()
-    if vendas_dashboard:
-        stock_profit = sum(v.get('lucro', 0) for v in vendas_dashboard)
-
-    # 3. Total Expenses
-    total_expenses = 0
-    if len(st.session_state.despesas_df) > 0:
-        total_expenses = st.session_state.despesas_df['valor'].sum()
-
-    # 4. Bot Telegram Revenue (from VendasBot worksheet)
-    bot_revenue = 0
+# Alteracoes locais ainda nao enviadas ao Google Sheets (so existe fila com o Sheets configurado)
+if _sheets_configurado():
     try:
-        spreadsheet = get_spreadsheet()
-        if spreadsheet:
-            try:
-                ws_bot = spreadsheet.worksheet("VendasBot")
-                all_bot_values = ws_bot.get_all_values()
-                if len(all_bot_values) > 1:
-                    headers = all_bot_values[0]
-                    valor_idx = headers.index("valor") if "valor" in headers else -1
-                    if valor_idx >= 0:
-                        for row in all_bot_values[1:]:
-                            if len(row) > valor_idx:
-                                try:
-                                    bot_revenue += float(str(row[valor_idx]).replace(',', '.'))
-                                except:
-                                    pass
-            except:
-                pass  # VendasBot sheet may not exist yet
-    except:
+        pendentes_sync = local_store.total_pendentes()
+        if pendentes_sync:
+            st.sidebar.caption(f"🔄 {pendentes_sync} alteração(ões) aguardando envio ao Google Sheets")
+    except Exception:
         pass
 
-    # GRAND TOTAL LOGIC
-    grand_total = stipchat_revenue + stock_profit + bot_revenue - total_expenses
-
-    # Display Grand Total
-    st.markdown("#### 💎 GRAND TOTAL (Lucro Global)")
-
-    if grand_total > 0:
-        st.markdown(f"""
-        <div class="success-box">
-            <p style="color: #888; margin: 0; font-size: 0.9rem; text-transform: uppercase;">LUCRO GLOBAL (POSITIVO)</p>
-            <p class="neon-green" style="margin: 10px 0;">R$ {grand_total:,.2f}</p>
-            <p style="color: #00ff88; font-size: 1rem; margin: 0;">O imperio esta crescendo!</p>
-        </div>
-        """, unsafe_allow_html=True)
-    elif grand_total < 0:
-        st.markdown(f"""
-        <div class="warning-box">
-            <p style="color: #888; margin: 0; font-size: 0.9rem; text-transform: uppercase;">PREJUIZO GLOBAL (NEGATIVO)</p>
-            <p class="neon-red" style="margin: 10px 0;">R$ {grand_total:,.2f}</p>
-            <p style="color: #ff4444; font-size: 1rem; margin: 0;">Atencao: gastos superaram receitas</p>
-        </div>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-        <div class="info-box">
-            <p style="color: #888; margin: 0; font-size: 0.9rem; text-transform: uppercase;">LUCRO GLOBAL (EQUILIBRIO)</p>
-            <p style="color: #fff; font-size: 2rem; font-weight: bold; margin: 10px 0;">R$ 0,00</p>
-            <p style="color: #888; font-size: 1rem; margin: 0;">Receitas e gastos empatados</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    st.markdown("---")
-
-    # Breakdown por fonte
-    st.markdown("#### 📊 Breakdown por Fonte")
-
-    col_b1, col_b2, col_b3, col_b4 = st.columns(4)
-
-    with col_b1:
-        st.markdown(f"""
-        <div class="kpi-card">
-            <p class="kpi-title">🔴 STRIPCHAT REVENUE</p>
-            <p class="kpi-value-green">R$ {stipchat_revenue:,.2f}</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col_b2:
-        st.markdown(f"""
-        <div class="kpi-card">
-            <p class="kpi-title">📦 STOCK PROFIT</p>
-            <p class="kpi-value-green">R$ {stock_profit:,.2f}</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col_b3:
-        st.markdown(f"""
-        <div class="kpi-card">
-            <p class="kpi-title">🤖 BOT TELEGRAM</p>
-            <p class="kpi-value-blue">R$ {bot_revenue:,.2f}</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col_b4:
-        st.markdown(f"""
-        <div class="kpi-card">
-            <p class="kpi-title">💸 TOTAL EXPENSES</p>
-            <p class="kpi-value-red">R$ {total_expenses:,.2f}</p>
-        </div>
-        """, unsafe_allow_html=True)
+# ==================== NAVEGACAO ====================
+# Seletor no lugar de st.tabs: st.tabs executa o corpo das cinco abas a cada
+# clique; aqui so a aba ativa carrega dados e monta graficos.
+ABAS = {
+    "🔴 REVENUE API": aba_revenue,
+    "📦 INVENTORY (STOCK)": aba_produtos,
+    "🏠 HOUSEHOLD EXPENSES": aba_despesas,
+    "📊 EXECUTIVE DASHBOARD": aba_dashboard,
+    "👥 CONTAS PESSOAIS": aba_contas_pessoais,
+}
+
+aba_ativa = st.radio(
+    "Navegação",
+    options=list(ABAS),
+    horizontal=True,
+    label_visibility="collapsed",
+    key="aba_ativa"
+)
 
-    st.markdown("---")
-
-    # Acerto de contas (Split 50/50)
-    st.markdown("#### 💸 Acerto de Contas (Split 50/50)")
-
-    if len(st.session_state.despesas_df) > 0:
-        total_lo = st.session_state.despesas_df[st.session_state.despesas_df['pagador'] == 'LO']['valor'].sum()
-        total_companheira = st.session_state.despesas_df[st.session_state.despesas_df['pagador'] == 'Companheira']['valor'].sum()
-        total_geral = total_lo + total_companheira
-
-        cada_um_deve = total_geral / 2
-
-        saldo_lo = total_lo - cada_um_deve
-        saldo_companheira = total_companheira - cada_um_deve
-
-        col_s1, col_s2, col_s3 = st.columns(3)
-
-        with col_s1:
-            st.markdown(f"""
-            <div class="kpi-card">
-                <p class="kpi-title">👩‍💼 LO Pagou</p>
-                <p class="kpi-value-gold">R$ {total_lo:,.2f}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col_s2:
-            st.markdown(f"""
-            <div class="kpi-card">
-                <p class="kpi-title">👩 Companheira Pagou</p>
-                <p class="kpi-value-gold">R$ {total_companheira:,.2f}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col_s3:
-            st.markdown(f"""
-            <div class="kpi-card">
-                <p class="kpi-title">📊 Total Geral</p>
-                <p style="color: #fff; font-size: 2rem; font-weight: bold;">R$ {total_geral:,.2f}</p>
-                <p style="color: #888; font-size: 0.9rem;">Cada um: R$ {cada_um_deve:,.2f}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        # Quem deve para quem
-        if abs(saldo_lo) > 0.01:
-            if saldo_lo > 0:
-                st.markdown(f"""
-                <div class="settlement-box">
-                    <p style="color: #ffd700; font-size: 0.9rem; margin: 0; text-transform: uppercase;">⚠️ ACERTO PENDENTE</p>
-                    <h2 style="color: #fff; margin: 15px 0; font-size: 1.3rem;">Companheira deve para LO</h2>
-                    <p class="neon-green" style="margin: 0;">R$ {abs(saldo_lo):,.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="settlement-box">
-                    <p style="color: #ffd700; font-size: 0.9rem; margin: 0; text-transform: uppercase;">⚠️ ACERTO PENDENTE</p>
-                    <h2 style="color: #fff; margin: 15px 0; font-size: 1.3rem;">LO deve para Companheira</h2>
-                    <p class="neon-green" style="margin: 0;">R$ {abs(saldo_lo):,.2f}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.markdown("""
-            <div class="success-box">
-                <h2 style="color: #00ff88; margin: 0; font-size: 1.4rem;">Tudo Acertado!</h2>
-                <p style="color: #888; margin: 10px 0 0 0;">As contas estao equilibradas</p>
-            </div>
-            """, unsafe_allow_html=True)
-    else:
-        st.info("Registre despesas para ver o acerto de contas")
-
-    st.markdown("---")
-
-    # Grafico de composicao de receita
-    st.markdown("#### 📊 Composicao da Receita")
-
-    if stipchat_revenue > 0 or stock_profit > 0:
-        receita_data = pd.DataFrame({
-            'Fonte': ['Revenue', 'Stock'],
-            'Valor': [stipchat_revenue, stock_profit]
-        })
-
-        fig = px.pie(
-            receita_data,
-            values='Valor',
-            names='Fonte',
-            color_discrete_sequence=['#00ff88', '#ffd700'],
-            hole=0.4
-        )
-
-        fig.update_layout(
-            template='plotly_dark',
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=20, r=20, t=40, b=20),
-            height=400
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Nenhuma receita registrada ainda")
-
-# ==================== TAB 5: CONTAS PESSOAIS ====================
-with tab5:
-    st.markdown("### 👥 Contas Pessoais dos Sócios")
-    st.markdown("Controle individual de despesas fixas - **não afeta o caixa da empresa**")
-    
-    # Calcula lucro para dividir 50/50
-    lucro_empresa = 0
-    if st.session_state.stipchat_data:
-        tokens = st.session_state.stipchat_data['tokens']
-        lucro_empresa += tokens * 0.05 * cotacao_dolar
-    
-    vendas_calculo = carregar_vendas()
-    if vendas_calculo:
-        lucro_empresa += sum(v.get('lucro', 0) for v in vendas_calculo)
-    
-    # Subtrai despesas da empresa
-    if len(st.session_state.despesas_df) > 0:
-        lucro_empresa -= st.session_state.despesas_df['valor'].sum()
-    
-    parte_cada = lucro_empresa / 2
-    
-    # Header com o lucro distribuido
-    st.markdown(f"""
-    <div style="background: linear-gradient(135deg, rgba(30,30,30,0.9), rgba(50,50,50,0.7)); 
-                border-radius: 15px; padding: 20px; margin-bottom: 20px; border: 1px solid #333;">
-        <h4 style="color: #ffd700; margin: 0 0 10px 0;">💰 Distribuição do Lucro (50/50)</h4>
-        <p style="color: #888; margin: 0;">Lucro Líquido da Empresa: <span style="color: #00ff88; font-weight: bold;">R$ {lucro_empresa:,.2f}</span></p>
-        <p style="color: #888; margin: 5px 0 0 0;">Cada sócio recebe: <span style="color: #00ff88; font-weight: bold;">R$ {parte_cada:,.2f}</span></p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Carrega despesas pessoais
-    despesas_pessoais_df = carregar_despesas_pessoais()
-    
-    # Separa por socio
-    despesas_lkz = despesas_pessoais_df[despesas_pessoais_df['socio'] == 'LKZ'] if len(despesas_pessoais_df) > 0 else pd.DataFrame()
-    despesas_nad = despesas_pessoais_df[despesas_pessoais_df['socio'] == 'NAD'] if len(despesas_pessoais_df) > 0 else pd.DataFrame()
-    
-    total_lkz = despesas_lkz['valor'].sum() if len(despesas_lkz) > 0 else 0
-    total_nad = despesas_nad['valor'].sum() if len(despesas_nad) > 0 else 0
-    
-    sobra_lkz = parte_cada - total_lkz
-    sobra_nad = parte_cada - total_nad
-    
-    # Duas colunas para cada socio
-    col_lkz, col_nad = st.columns(2)
-    
-    # ===== COLUNA LKZ =====
-    with col_lkz:
-        st.markdown("""
-        <div style="background: rgba(0,100,200,0.1); border-radius: 10px; padding: 15px; border: 1px solid rgba(0,100,200,0.3);">
-            <h4 style="color: #00aaff; margin: 0;">👤 LKZ</h4>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Resumo financeiro
-        st.markdown(f"""
-        <div style="margin: 15px 0;">
-            <p style="color: #888; margin: 5px 0;">Recebido: <span style="color: #00ff88;">R$ {parte_cada:,.2f}</span></p>
-            <p style="color: #888; margin: 5px 0;">Despesas: <span style="color: #ff4444;">R$ {total_lkz:,.2f}</span></p>
-            <p style="color: #fff; margin: 5px 0; font-weight: bold;">Sobra: <span style="color: {'#00ff88' if sobra_lkz >= 0 else '#ff4444'};">R$ {sobra_lkz:,.2f}</span></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Formulario para adicionar despesa
-        with st.expander("➕ Adicionar Despesa LKZ"):
-            with st.form("form_desp_lkz", clear_on_submit=True):
-                lkz_data = st.date_input("📅 Data", value=date.today(), key="lkz_data")
-                lkz_desc = st.text_input("📝 Descrição", key="lkz_desc")
-                lkz_valor = st.number_input("💰 Valor (R$)", min_value=0.0, step=10.0, key="lkz_valor")
-                lkz_cat = st.selectbox("📁 Categoria", ["Moradia", "Alimentação", "Transporte", "Lazer", "Saúde", "Outros"], key="lkz_cat")
-                
-                if st.form_submit_button("💾 Salvar", type="primary"):
-                    if lkz_desc and lkz_valor > 0:
-                        if salvar_despesa_pessoal(lkz_data, lkz_desc, lkz_valor, "LKZ", lkz_cat):
-                            st.success("Despesa salva!")
-                            st.rerun()
-                        else:
-                            st.error("Erro ao salvar")
-        
-        # Lista de despesas
-        if len(despesas_lkz) > 0:
-            st.markdown("**📋 Histórico:**")
-            display_lkz = despesas_lkz.sort_values('data', ascending=False) if 'data' in despesas_lkz.columns else despesas_lkz
-            st.dataframe(
-                display_lkz[['data', 'descricao', 'valor', 'categoria']],
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "data": st.column_config.DateColumn("📅"),
-                    "descricao": st.column_config.TextColumn("📝 Item"),
-                    "valor": st.column_config.NumberColumn("💰", format="R$ %.2f"),
-                    "categoria": st.column_config.TextColumn("📁")
-                }
-            )
-            
-            if st.button("🗑️ Limpar Todas (LKZ)", key="limpar_lkz"):
-                if limpar_despesas_pessoais_socio("LKZ"):
-                    st.success("Despesas de LKZ limpas!")
-                    st.rerun()
-        else:
-            st.info("Nenhuma despesa registrada")
-    
-    # ===== COLUNA NAD =====
-    with col_nad:
-        st.markdown("""
-        <div style="background: rgba(200,100,0,0.1); border-radius: 10px; padding: 15px; border: 1px solid rgba(200,100,0,0.3);">
-            <h4 style="color: #ffaa00; margin: 0;">👤 NAD</h4>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Resumo financeiro
-        st.markdown(f"""
-        <div style="margin: 15px 0;">
-            <p style="color: #888; margin: 5px 0;">Recebido: <span style="color: #00ff88;">R$ {parte_cada:,.2f}</span></p>
-            <p style="color: #888; margin: 5px 0;">Despesas: <span style="color: #ff4444;">R$ {total_nad:,.2f}</span></p>
-            <p style="color: #fff; margin: 5px 0; font-weight: bold;">Sobra: <span style="color: {'#00ff88' if sobra_nad >= 0 else '#ff4444'};">R$ {sobra_nad:,.2f}</span></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Formulario para adicionar despesa
-        with st.expander("➕ Adicionar Despesa NAD"):
-            with st.form("form_desp_nad", clear_on_submit=True):
-                nad_data = st.date_input("📅 Data", value=date.today(), key="nad_data")
-                nad_desc = st.text_input("📝 Descrição", key="nad_desc")
-                nad_valor = st.number_input("💰 Valor (R$)", min_value=0.0, step=10.0, key="nad_valor")
-                nad_cat = st.selectbox("📁 Categoria", ["Moradia", "Alimentação", "Transporte", "Lazer", "Saúde", "Outros"], key="nad_cat")
-                
-                if st.form_submit_button("💾 Salvar", type="primary"):
-                    if nad_desc and nad_valor > 0:
-                        if salvar_despesa_pessoal(nad_data, nad_desc, nad_valor, "NAD", nad_cat):
-                            st.success("Despesa salva!")
-                            st.rerun()
-                        else:
-                            st.error("Erro ao salvar")
-        
-        # Lista de despesas
-        if len(despesas_nad) > 0:
-            st.markdown("**📋 Histórico:**")
-            display_nad = despesas_nad.sort_values('data', ascending=False) if 'data' in despesas_nad.columns else despesas_nad
-            st.dataframe(
-                display_nad[['data', 'descricao', 'valor', 'categoria']],
-                use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "data": st.column_config.DateColumn("📅"),
-                    "descricao": st.column_config.TextColumn("📝 Item"),
-                    "valor": st.column_config.NumberColumn("💰", format="R$ %.2f"),
-                    "categoria": st.column_config.TextColumn("📁")
-                }
-            )
-            
-            if st.button("🗑️ Limpar Todas (NAD)", key="limpar_nad"):
-                if limpar_despesas_pessoais_socio("NAD"):
-                    st.success("Despesas de NAD limpas!")
-                    st.rerun()
-        else:
-            st.info("Nenhuma despesa registrada")
+ABAS[aba_ativa].render(cotacao_dolar)
 
 # ==================== FOOTER ====================
 st.markdown("---")
@@ -0,0 +1,473 @@
+"""
+Benchmark dos caminhos de dados do Empire Control.
+
+Roda carregar_produtos, salvar_vendas, registrar_venda, agrupar_por_sessoes,
+o indice/top clientes da Revenue e os totais do Executive Dashboard contra um Google Sheets falso em memoria
+(FakeWorksheet), com datasets sinteticos de 100, 10k e 100k linhas.
+Para cada cenario mostra tempo de parede, pico de memoria (tracemalloc) e
+quantas chamadas de API cada metodo do Worksheet recebeu (com a latencia
+medida por chamada), e sinaliza crescimento superlinear e explosao de
+chamadas de API antes de chegarem a quota de producao.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --tamanhos 100 10000 --latencia-ms 50 > bench_output.txt
+
+O espelho SQLite e os arquivos legados ficam num diretorio temporario: o
+benchmark nunca toca em empire_local.db nem na planilha real.
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import shutil
+import tempfile
+import argparse
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+import dados
+import local_store
+from revenue import agrupar_por_sessoes, processar_dados_revenue, clientes_periodo, top_clientes_k
+from abas.dashboard import calcular_totais
+
+TAMANHOS_PADRAO = (100, 10_000, 100_000)
+
+# Expoente de crescimento (tempo ~ n^k) a partir do qual o cenario e sinalizado
+LIMITE_SUPERLINEAR = 1.5
+
+
+# ============================================================================
+# GOOGLE SHEETS FALSO
+# ============================================================================
+
+class FakeWorksheet:
+    """
+    Stand-in em memoria do gspread.Worksheet, so com os metodos que o app usa.
+    Cada chamada e contada e cronometrada em `planilha.chamadas`; `latencia`
+    (segundos) simula o round-trip de rede de cada requisicao.
+    """
+
+    def __init__(self, planilha, title, valores=None, rows=1000):
+        self.planilha = planilha
+        self.title = title
+        self.valores = [list(linha) for linha in (valores or [])]
+        self.row_count = max(rows, len(self.valores))
+
+    def _chamada(self, metodo):
+        return self.planilha.registrar(self.title, metodo)
+
+    def get_all_values(self):
+        with self._chamada('get_all_values'):
+            return [[str(c) for c in linha] for linha in self.valores]
+
+    def col_values(self, coluna):
+        with self._chamada('col_values'):
+            return [str(linha[coluna - 1]) if len(linha) >= coluna else '' for linha in self.valores]
+
+    def append_row(self, linha, value_input_option='RAW'):
+        with self._chamada('append_row'):
+            self.valores.append(list(linha))
+            self.row_count = max(self.row_count, len(self.valores))
+
+    def append_rows(self, linhas, value_input_option='RAW'):
+        with self._chamada('append_rows'):
+            inicio = len(self.valores) + 1
+            self.valores.extend(list(linha) for linha in linhas)
+            self.row_count = max(self.row_count, len(self.valores))
+            # Mesmo formato da resposta da API (gspread devolve o JSON do append)
+            return {'updates': {'updatedRange': f"'{self.title}'!A{inicio}:Z{len(self.valores)}"}}
+
+    def add_rows(self, n):
+        with self._chamada('add_rows'):
+            self.row_count += n
+
+    def update(self, values=None, range_name=None, value_input_option='RAW'):
+        with self._chamada('update'):
+            # So o formato usado pelo app: A1:<col><n> a partir do topo
+            for i, linha in enumerate(values):
+                if i < len(self.valores):
+                    self.valores[i] = list(linha)
+                else:
+                    self.valores.append(list(linha))
+
+    def batch_clear(self, ranges):
+        with self._chamada('batch_clear'):
+            for rng in ranges:
+                inicio = int(''.join(c for c in rng.split(':')[0] if c.isdigit()))
+                del self.valores[inicio - 1:]
+
+    def batch_update(self, dados_ranges, value_input_option='RAW'):
+        with self._chamada('batch_update'):
+            for item in dados_ranges:
+                linha = int(''.join(c for c in item['range'].split(':')[0] if c.isdigit()))
+                while len(self.valores) < linha:
+                    self.valores.append([])
+                self.valores[linha - 1] = list(item['values'][0])
+
+
+class _Cronometro:
+    def __init__(self, planilha, chave):
+        self.planilha = planilha
+        self.chave = chave
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        if self.planilha.latencia:
+            time.sleep(self.planilha.latencia)
+        return self
+
+    def __exit__(self, *exc):
+        self.planilha.chamadas[self.chave].append(time.perf_counter() - self.inicio)
+        return False
+
+
+class FakeSpreadsheet:
+    """Planilha falsa: mapa titulo -> FakeWorksheet + registro das chamadas."""
+
+    def __init__(self, latencia=0.0):
+        self.latencia = latencia
+        self.abas = {}
+        self.chamadas = defaultdict(list)
+
+    def registrar(self, aba, metodo):
+        return _Cronometro(self, f"{aba}.{metodo}")
+
+    def criar_aba(self, titulo, valores):
+        self.abas[titulo] = FakeWorksheet(self, titulo, valores)
+        return self.abas[titulo]
+
+    def abrir(self, titulo):
+        if titulo not in self.abas:
+            colunas = dados.ABAS_PLANILHA.get(titulo, ([],))[0]
+            self.criar_aba(titulo, [list(colunas)] if colunas else [])
+        return self.abas[titulo]
+
+    def zerar_contadores(self):
+        self.chamadas = defaultdict(list)
+
+
+# ============================================================================
+# AMBIENTE ISOLADO
+# ============================================================================
+
+class Ambiente:
+    """
+    Aponta dados.py/local_store.py para a planilha falsa e para um diretorio
+    temporario (espelho SQLite e arquivos legados novos a cada cenario).
+    """
+
+    def __init__(self, latencia=0.0):
+        self.latencia = latencia
+        self.dir = tempfile.mkdtemp(prefix="empire_bench_")
+        self._originais = {
+            'get_worksheet': dados.get_worksheet,
+            'get_spreadsheet': dados.get_spreadsheet,
+            '_sheets_configurado': dados._sheets_configurado,
+            'PRODUTOS_FILE': dados.PRODUTOS_FILE,
+            'VENDAS_FILE': dados.VENDAS_FILE,
+            'DB_FILE': local_store.DB_FILE,
+        }
+        self.planilha = None
+        self._n = 0
+
+    def novo(self):
+        """Planilha vazia + espelho local vazio."""
+        self._n += 1
+        self.planilha = FakeSpreadsheet(self.latencia)
+
+        dados.get_worksheet = self.planilha.abrir
+        dados.get_spreadsheet = lambda: self.planilha
+        dados._sheets_configurado = lambda: True
+        dados.PRODUTOS_FILE = os.path.join(self.dir, f"produtos_{self._n}.json")
+        dados.VENDAS_FILE = os.path.join(self.dir, f"vendas_{self._n}.json")
+        dados._ler_valores_aba.clear()
+
+        local_store.DB_FILE = os.path.join(self.dir, f"empire_{self._n}.db")
+        local_store._inicializado = False
+        return self.planilha
+
+    def sincronizar(self):
+        """Um ciclo do worker de sync (so envio), como roda em producao."""
+        return local_store.sincronizar(self.planilha.abrir, puxar=False)
+
+    def restaurar(self):
+        dados.get_worksheet = self._originais['get_worksheet']
+        dados.get_spreadsheet = self._originais['get_spreadsheet']
+        dados._sheets_configurado = self._originais['_sheets_configurado']
+        dados.PRODUTOS_FILE = self._originais['PRODUTOS_FILE']
+        dados.VENDAS_FILE = self._originais['VENDAS_FILE']
+        local_store.DB_FILE = self._originais['DB_FILE']
+        local_store._inicializado = False
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+# ============================================================================
+# DATASETS SINTETICOS
+# ============================================================================
+
+def linhas_produtos(n, rng):
+    """Aba Produtos no formato de get_all_values (strings, decimal BR)."""
+    linhas = [list(dados.PRODUTOS_COLUNAS)]
+    for i in range(1, n + 1):
+        inicial = rng.randint(100, 1000)
+        vendido = rng.randint(0, inicial // 2)
+        linhas.append([
+            str(i), f"Produto {i}", "", f"{inicial - vendido},0", f"{inicial},0",
+            f"{rng.uniform(100, 5000):.2f}".replace('.', ','), f"{vendido},0",
+            datetime(2025, 1, 1).isoformat()
+        ])
+    return linhas
+
+
+def vendas_registros(n, rng):
+    """Lista de dicts de vendas (formato de carregar_vendas)."""
+    vendas = []
+    for i in range(1, n + 1):
+        valor = round(rng.uniform(20, 500), 2)
+        custo = round(valor * rng.uniform(0.3, 0.8), 2)
+        vendas.append({
+            'id': i, 'produto_id': rng.randint(1, 50), 'produto_nome': f"Produto {i % 50}",
+            'cliente': f"cliente{i % 300}", 'gramas': float(rng.randint(1, 50)),
+            'valor_venda': valor, 'custo': custo, 'lucro': round(valor - custo, 2),
+            'data': (datetime(2025, 1, 1) + timedelta(minutes=i)).isoformat()
+        })
+    return vendas
+
+
+def linhas_vendas(n, rng):
+    """Aba Vendas no formato de get_all_values."""
+    return [list(dados.VENDAS_COLUNAS)] + [
+        [str(c) for c in dados._linha_venda(v)] for v in vendas_registros(n, rng)
+    ]
+
+
+def linhas_vendas_bot(n, rng):
+    """Aba VendasBot no formato de get_all_values."""
+    return [list(dados.VENDAS_BOT_COLUNAS)] + [
+        [datetime(2025, 1, 1).isoformat(), str(rng.randint(1, 10**9)), "Pack",
+         f"{rng.uniform(10, 200):.2f}".replace('.', ','), str(i), "approved"]
+        for i in range(n)
+    ]
+
+
+def transacoes_sinteticas(n, rng):
+    """
+    Tips no formato de fetch_transacoes_periodo (itens de `transactions` da
+    Revenue API, username no nivel de cima), em ordem de data, com gaps que
+    abrem sessoes novas.
+    """
+    instante = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    transacoes = []
+    for i in range(n):
+        # ~2% das tips chegam depois de um intervalo maior que 1h (sessao nova)
+        gap = rng.uniform(2, 6) * 3600 if rng.random() < 0.02 else rng.expovariate(1 / 40)
+        instante += timedelta(seconds=gap)
+        transacoes.append({
+            'id': i,
+            'date': instante.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'tokens': rng.choice((1, 5, 10, 25, 50, 100)),
+            'username': f"fan{rng.randint(1, max(n // 20, 5))}",
+        })
+    return transacoes
+
+
+# ============================================================================
+# CENARIOS
+# ============================================================================
+# Cada cenario e (nome, preparar). preparar(ambiente, n, rng) monta o estado
+# inicial fora da medicao e devolve a funcao a ser medida.
+
+def _cenario_carregar_produtos_frio(amb, n, rng):
+    planilha = amb.novo()
+    planilha.criar_aba("Produtos", linhas_produtos(n, rng))
+    return dados.carregar_produtos
+
+
+def _cenario_carregar_produtos_quente(amb, n, rng):
+    planilha = amb.novo()
+    planilha.criar_aba("Produtos", linhas_produtos(n, rng))
+    dados.carregar_produtos()
+    return dados.carregar_produtos
+
+
+def _cenario_salvar_vendas(amb, n, rng):
+    planilha = amb.novo()
+    planilha.criar_aba("Vendas", [list(dados.VENDAS_COLUNAS)])
+    dados.ler_aba("Vendas")
+    vendas = vendas_registros(n, rng)
+
+    def executar():
+        dados.salvar_vendas(vendas)
+        amb.sincronizar()
+    return executar
+
+
+def _cenario_registrar_venda(amb, n, rng):
+    planilha = amb.novo()
+    planilha.criar_aba("Produtos", linhas_produtos(n, rng))
+    planilha.criar_aba("Vendas", linhas_vendas(n, rng))
+    dados.ler_aba("Produtos")
+    dados.ler_aba("Vendas")
+    produto_id = max(n // 2, 1)
+
+    def executar():
+        sucesso, msg = dados.registrar_venda(produto_id, 1.0, 50.0, "bench")
+        if not sucesso:
+            raise RuntimeError(msg)
+        amb.sincronizar()
+    return executar
+
+
+def _cenario_agrupar_por_sessoes(amb, n, rng):
+    transacoes = transacoes_sinteticas(n, rng)
+    return lambda: agrupar_por_sessoes(transacoes)
+
+
+def _cenario_revenue_top_clientes(amb, n, rng):
+    transacoes = transacoes_sinteticas(n, rng)
+
+    def executar():
+        dados_revenue = processar_dados_revenue({'tokens': n * 10}, transacoes, 30)
+        indice = dados_revenue['indice']
+        # Periodo parcial: passa pelos baldes por dia e por sessao, nao so pelo total
+        n_sessoes = len(dados_revenue['sessoes'])
+        top = top_clientes_k(clientes_periodo(indice, n_sessoes // 4, n_sessoes), 10)
+        if not top:
+            raise RuntimeError("Nenhum cliente no top-K")
+    return executar
+
+
+def _cenario_totais_dashboard(amb, n, rng):
+    planilha = amb.novo()
+    planilha.criar_aba("Vendas", linhas_vendas(n, rng))
+    planilha.criar_aba("VendasBot", linhas_vendas_bot(n, rng))
+    dados.ler_aba("Vendas")
+    dados.ler_aba("VendasBot")
+    despesas_df = pd.DataFrame({
+        'data': ['2025-01-01'] * n,
+        'item': [f"Item {i}" for i in range(n)],
+        'valor': [round(rng.uniform(5, 300), 2) for _ in range(n)],
+        'pagador': [rng.choice(("LKZ", "NAD")) for _ in range(n)],
+    })
+    stipchat_data = {'tokens': n * 10}
+    return lambda: calcular_totais(5.0, stipchat_data, despesas_df)
+
+
+CENARIOS = (
+    ("carregar_produtos (frio)", _cenario_carregar_produtos_frio),
+    ("carregar_produtos (quente)", _cenario_carregar_produtos_quente),
+    ("salvar_vendas + sync", _cenario_salvar_vendas),
+    ("registrar_venda + sync", _cenario_registrar_venda),
+    ("agrupar_por_sessoes", _cenario_agrupar_por_sessoes),
+    ("revenue: indice + top clientes", _cenario_revenue_top_clientes),
+    ("dashboard: calcular_totais", _cenario_totais_dashboard),
+)
+
+
+# ============================================================================
+# EXECUCAO E RELATORIO
+# ============================================================================
+
+def medir(amb, preparar, n, semente):
+    """
+    Roda o cenario duas vezes (estado novo em cada): uma para o tempo, outra
+    sob tracemalloc para o pico de memoria (tracemalloc distorce o tempo).
+    """
+    executar = preparar(amb, n, random.Random(semente))
+    if amb.planilha:
+        amb.planilha.zerar_contadores()
+    inicio = time.perf_counter()
+    executar()
+    tempo = time.perf_counter() - inicio
+    chamadas = dict(amb.planilha.chamadas) if amb.planilha else {}
+
+    executar = preparar(amb, n, random.Random(semente))
+    tracemalloc.start()
+    try:
+        executar()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'tempo': tempo, 'pico': pico, 'chamadas': chamadas}
+
+
+def _formatar_chamadas(chamadas):
+    if not chamadas:
+        return "-"
+    return ", ".join(
+        f"{metodo} x{len(duracoes)} ({sum(duracoes) / len(duracoes) * 1000:.1f} ms/chamada)"
+        for metodo, duracoes in sorted(chamadas.items())
+    )
+
+
+def _expoente(n1, t1, n2, t2):
+    """k em tempo ~ n^k entre dois tamanhos (None se o tempo e pequeno demais)."""
+    if t1 < 1e-4 or t2 <= 0:
+        return None
+    return math.log(t2 / t1) / math.log(n2 / n1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO),
+                        help="quantidade de linhas de cada dataset")
+    parser.add_argument('--latencia-ms', type=float, default=0.0,
+                        help="latencia simulada por chamada ao Sheets")
+    parser.add_argument('--cenario', action='append',
+                        help="rodar so os cenarios cujo nome contem este texto")
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    tamanhos = sorted(args.tamanhos)
+    cenarios = [
+        (nome, preparar) for nome, preparar in CENARIOS
+        if not args.cenario or any(filtro in nome for filtro in args.cenario)
+    ]
+
+    amb = Ambiente(latencia=args.latencia_ms / 1000)
+    alertas = []
+    try:
+        for nome, preparar in cenarios:
+            print(f"\n== {nome} ==")
+            print(f"{'linhas':>8} {'tempo (s)':>10} {'pico (MB)':>10}  chamadas de API")
+            anterior = None
+            for n in tamanhos:
+                r = medir(amb, preparar, n, args.semente)
+                total_chamadas = sum(len(d) for d in r['chamadas'].values())
+                print(f"{n:>8} {r['tempo']:>10.4f} {r['pico'] / 1024**2:>10.2f}  "
+                      f"{_formatar_chamadas(r['chamadas'])}")
+                sys.stdout.flush()
+
+                if anterior:
+                    n0, r0, total0 = anterior
+                    k = _expoente(n0, r0['tempo'], n, r['tempo'])
+                    if k is not None and k > LIMITE_SUPERLINEAR:
+                        alertas.append(f"{nome}: tempo cresce ~n^{k:.2f} entre {n0} e {n} linhas")
+                    if total_chamadas > max(total0, 1) * 2:
+                        alertas.append(
+                            f"{nome}: chamadas de API passaram de {total0} para "
+                            f"{total_chamadas} entre {n0} e {n} linhas"
+                        )
+                anterior = (n, r, total_chamadas)
+    finally:
+        amb.restaurar()
+
+    print()
+    if alertas:
+        print("ALERTAS:")
+        for alerta in alertas:
+            print(f"  - {alerta}")
+        return 1
+    print("Sem crescimento superlinear nem explosao de chamadas de API.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
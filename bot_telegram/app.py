@@ -6,28 +6,30 @@ Webhook handler para notificações de pagamento PIX com Fallback automático
 """
 
 import os
+import asyncio
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-import httpx
 from fastapi import FastAPI, Request, HTTPException, Header, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, String, Float, DateTime, Integer, Text
+from sqlalchemy import select
 
 # Importar gerenciador de pagamentos (multi-provider)
 from payment_manager import (
     criar_pagamento_com_fallback,
-    consultar_pagamento,
     processar_webhook,
     verificar_status_provedores,
     PaymentProvider
 )
-from pagbank_integration import processar_webhook_pagbank
+from http_client import get_http_client, fechar_http_client
+from telegram_client import iniciar_telegram_client, fechar_telegram_client, chamar_api
+from database import AsyncSessionLocal, PaymentRecord, criar_tabelas
+from job_queue import registrar_handler, enfileirar, iniciar_workers, parar_workers
+from idempotencia import chave_evento, chave_pagamento, reservar, limpar_antigas
+from status_cache import consultar_status
 
 # Configurar logging
 logging.basicConfig(
@@ -50,8 +52,6 @@ TELEGRAM_API_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
 # Mercado Pago Webhook Secret (opcional, para verificação extra)
 MP_WEBHOOK_SECRET = os.getenv("MP_WEBHOOK_SECRET", "")
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./pix_orchestrator.db")
-
 # Inicializar FastAPI
 app = FastAPI(
     title="PIX Orchestrator API - Multi-Provider",
@@ -59,32 +59,27 @@ app = FastAPI(
     version="4.0.0"
 )
 
-# SQLAlchemy Async Setup
-Base = declarative_base()
-engine = create_async_engine(DATABASE_URL, echo=False)
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-# Modelos de Banco de Dados
-class PaymentRecord(Base):
-    __tablename__ = "payments"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    payment_id = Column(String, unique=True, index=True)
-    client_id = Column(String, index=True)
-    valor = Column(Float)
-    status = Column(String)
-    qr_code_base64 = Column(Text, nullable=True)
-    pix_copy_paste = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
 # Criar tabelas
 @app.on_event("startup")
 async def startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await criar_tabelas()
     logger.info("Database tables created/verified")
 
+    # Clientes HTTP compartilhados: provedores e Telegram (pool + keep-alive)
+    get_http_client()
+    iniciar_telegram_client(TELEGRAM_API_URL)
+
+    # Workers da fila de jobs dos webhooks
+    await limpar_antigas()
+    await iniciar_workers()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await parar_workers()
+    await fechar_http_client()
+    await fechar_telegram_client()
+
 # Modelos Pydantic
 class ProcessarPixRequest(BaseModel):
     valor: float = Field(..., gt=0, description="Valor do pagamento em reais")
@@ -102,24 +97,19 @@ class ProcessarPixResponse(BaseModel):
 async def send_telegram_message(chat_id: str, message: str, parse_mode: str = "Markdown") -> bool:
     """
     Envia mensagem para o Telegram usando a API oficial (assíncrono)
+    Usa o cliente compartilhado (keep-alive, concorrência limitada, retry em 429)
     """
     try:
-        url = f"{TELEGRAM_API_URL}/sendMessage"
         payload = {
             "chat_id": chat_id,
             "text": message,
             "parse_mode": parse_mode
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, json=payload)
-            
-            if response.status_code == 200:
-                logger.info(f"Message sent successfully to Telegram user {chat_id}")
-                return True
-            else:
-                logger.error(f"Failed to send Telegram message: {response.status_code} - {response.text}")
-                return False
+        if await chamar_api("sendMessage", payload) is not None:
+            logger.info(f"Message sent successfully to Telegram user {chat_id}")
+            return True
+        return False
                 
     except Exception as e:
         logger.error(f"Error sending Telegram message: {e}")
@@ -162,6 +152,132 @@ _Pergunte sobre nossos planos!_"""
         logger.error(f"Error sending upsell message: {e}")
 
 
+# ============================================================================
+# PROCESSAMENTO DOS WEBHOOKS (WORKERS DA FILA)
+# ============================================================================
+
+def extrair_client_id(referencia: Optional[str]) -> Optional[str]:
+    """Extrai o client_id da referência externa (formato: bot_CLIENTID_TIMESTAMP)."""
+    if referencia and referencia.startswith("bot_"):
+        parts = referencia.split("_")
+        if len(parts) >= 2:
+            return parts[1]
+    return None
+
+
+async def marcar_pagamento_aprovado(payment_id: str) -> None:
+    """Atualiza o status do pagamento no banco de dados."""
+    async with AsyncSessionLocal() as session:
+        stmt = select(PaymentRecord).where(PaymentRecord.payment_id == payment_id)
+        result = await session.execute(stmt)
+        payment = result.scalar_one_or_none()
+        
+        if payment:
+            payment.status = 'approved'
+            payment.updated_at = datetime.utcnow()
+            await session.commit()
+            logger.info(f"Payment {payment_id} status updated to approved")
+
+
+async def enviar_confirmacao(client_id: str) -> None:
+    """Mensagem de pagamento confirmado (levanta exceção para o job tentar de novo)."""
+    message = "✅ *Pagamento confirmado!*\n\nSeu acesso foi liberado. Obrigado pela compra!"
+    if not await send_telegram_message(chat_id=client_id, message=message):
+        raise RuntimeError(f"Falha ao enviar confirmação para {client_id}")
+
+
+async def registrar_venda_sheets(client_id: str, conteudo: str, valor: float, payment_id: str) -> None:
+    """Registra a venda no Google Sheets (gspread é síncrono: roda numa thread)."""
+    from gsheets_integration import registrar_venda_bot
+    registrado = await asyncio.to_thread(
+        registrar_venda_bot,
+        client_id=client_id,
+        conteudo=conteudo,
+        valor=valor,
+        payment_id=payment_id
+    )
+    if not registrado:
+        raise RuntimeError("Falha ao registrar venda no Google Sheets")
+
+
+async def processar_pagamento_aprovado(provedor: str, payment_id: str, client_id: str,
+                                       valor: float, conteudo: str, etapa) -> None:
+    """
+    Efeitos de um pagamento aprovado, cada um como etapa do job (não repete no retry).
+    O Sheets vai por último para não atrasar as mensagens ao cliente.
+    Só o primeiro job de cada pagamento executa: outra notificação do mesmo
+    pagamento aprovado não reenvia mensagens nem duplica a venda no Sheets.
+    """
+    if not await reservar(chave_pagamento(provedor, payment_id), dono=etapa.dono):
+        logger.info(f"Payment {payment_id} already processed, skipping duplicate notification")
+        return
+    
+    await etapa("status_db", marcar_pagamento_aprovado, payment_id)
+    await etapa("confirmacao", enviar_confirmacao, client_id)
+    await etapa("upsell", send_upsell_message, client_id, valor)
+    await etapa("sheets", registrar_venda_sheets, client_id, conteudo, valor, payment_id)
+
+
+async def job_webhook_mercadopago(body: Dict[str, Any], etapa) -> None:
+    """
+    Job do webhook do Mercado Pago: consulta o status e processa se aprovado.
+    Sempre consulta o provedor (um "pending" em cache de um polling do
+    cliente esconderia a aprovação); só pagamento já final no banco não vai
+    ao provedor.
+    """
+    payment_id = (body.get("data") or {}).get("id")
+    if not payment_id:
+        logger.warning(f"Webhook MP without payment id: {body}")
+        return
+    
+    resultado = await consultar_status(str(payment_id), PaymentProvider.MERCADO_PAGO, forcar=True)
+    
+    if not resultado.get("success"):
+        raise RuntimeError(resultado.get("error", "Falha ao consultar pagamento"))
+    
+    if resultado.get("status") != "approved":
+        return
+    
+    payment_id = str(resultado.get("payment_id"))
+    external_ref = resultado.get("external_reference", "")
+    client_id = resultado.get("client_id") or extrair_client_id(external_ref)
+    
+    if not client_id:
+        logger.warning(f"Could not extract client_id from external_ref: {external_ref}")
+        return
+    
+    await processar_pagamento_aprovado(
+        "mercadopago", payment_id, client_id, resultado.get("amount", 0), "Pagamento PIX MP", etapa
+    )
+
+
+async def job_webhook_pagbank(body: Dict[str, Any], etapa) -> None:
+    """Job do webhook do PagBank: processa o pedido se estiver pago."""
+    resultado = await processar_webhook(body, PaymentProvider.PAGBANK)
+    
+    if not resultado.get("success"):
+        raise RuntimeError(resultado.get("error", "Webhook PagBank inválido"))
+    
+    if not resultado.get("is_approved"):
+        return
+    
+    order_id = str(resultado.get("order_id"))
+    reference_id = resultado.get("reference_id", "")
+    client_id = extrair_client_id(reference_id)
+    
+    if not client_id:
+        logger.warning(f"Could not extract client_id from reference_id: {reference_id}")
+        return
+    
+    await processar_pagamento_aprovado(
+        "pagbank", order_id, client_id, resultado.get("amount", 0), "Pagamento PIX PagBank", etapa
+    )
+
+
+registrar_handler("mercadopago", job_webhook_mercadopago)
+registrar_handler("pagbank", job_webhook_pagbank)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -177,7 +293,7 @@ async def processar_pix(request: ProcessarPixRequest):
         external_ref = f"bot_{request.id_cliente}_{int(datetime.utcnow().timestamp())}"
         
         # Criar pagamento com fallback automático
-        resultado = criar_pagamento_com_fallback(
+        resultado = await criar_pagamento_com_fallback(
             valor=request.valor,
             descricao=request.descricao or "Pagamento via Bot",
             external_reference=external_ref,
@@ -235,7 +351,8 @@ async def webhook_mercadopago(request: Request):
     """
     Webhook para receber notificações de pagamento do Mercado Pago
     
-    O Mercado Pago envia notificações quando o status do pagamento muda
+    O Mercado Pago envia notificações quando o status do pagamento muda.
+    Só grava o evento na fila e responde 200; o processamento roda nos workers.
     """
     try:
         # Ler body do request
@@ -247,66 +364,10 @@ async def webhook_mercadopago(request: Request):
         topic = body.get("type") or body.get("topic")
         
         if topic == "payment":
-            # Processar webhook
-            resultado = processar_webhook_mercadopago(body)
-            
-            if resultado.get("success") and resultado.get("is_approved"):
-                payment_id = str(resultado.get("payment_id"))
-                external_ref = resultado.get("external_reference", "")
-                valor = resultado.get("amount", 0)
-                
-                # Extrair client_id da external_reference (formato: bot_CLIENTID_TIMESTAMP)
-                client_id = None
-                if external_ref and external_ref.startswith("bot_"):
-                    parts = external_ref.split("_")
-                    if len(parts) >= 2:
-                        client_id = parts[1]
-                
-                if client_id:
-                    # Atualizar status no banco de dados
-                    async with AsyncSessionLocal() as session:
-                        from sqlalchemy import select
-                        stmt = select(PaymentRecord).where(PaymentRecord.payment_id == payment_id)
-                        result = await session.execute(stmt)
-                        payment = result.scalar_one_or_none()
-                        
-                        if payment:
-                            payment.status = 'approved'
-                            payment.updated_at = datetime.utcnow()
-                            await session.commit()
-                            logger.info(f"Payment {payment_id} status updated to approved")
-                    
-                    # Enviar mensagem de confirmação
-                    message = "✅ *Pagamento confirmado!*\n\nSeu acesso foi liberado. Obrigado pela compra!"
-                    await send_telegram_message(chat_id=client_id, message=message)
-                    
-                    # Registrar venda no Google Sheets
-                    try:
-                        from gsheets_integration import registrar_venda_bot
-                        registrar_venda_bot(
-                            client_id=client_id,
-                            conteudo="Pagamento PIX MP",
-                            valor=valor,
-                            payment_id=payment_id
-                        )
-                        logger.info(f"Sale registered in Google Sheets")
-                    except Exception as gsheets_error:
-                        logger.warning(f"Failed to register sale in GSheets: {gsheets_error}")
-                    
-                    # Upsell
-                    await send_upsell_message(client_id, valor)
-                    
-                    return JSONResponse(
-                        status_code=200,
-                        content={"status": "success", "message": "Payment processed"}
-                    )
-                else:
-                    logger.warning(f"Could not extract client_id from external_ref: {external_ref}")
-            
-            return JSONResponse(
-                status_code=200,
-                content={"status": "received"}
-            )
+            job_id = await enfileirar("mercadopago", body, chave=chave_evento("mercadopago", body))
+            if job_id is None:
+                return JSONResponse(status_code=200, content={"status": "duplicate"})
+            return JSONResponse(status_code=200, content={"status": "queued", "job_id": job_id})
         
         # Outros tipos de notificação
         return JSONResponse(status_code=200, content={"status": "ignored"})
@@ -321,8 +382,9 @@ async def webhook_mercadopago(request: Request):
 async def get_payment_status(payment_id: str):
     """
     Consulta status de um pagamento
+    Status final sai do banco local; pendente é revalidado no provedor com TTL curto
     """
-    resultado = consultar_pagamento(payment_id)
+    resultado = await consultar_status(payment_id)
     
     if resultado.get("success"):
         return resultado
@@ -337,67 +399,17 @@ async def get_payment_status(payment_id: str):
 async def webhook_pagbank(request: Request):
     """
     Webhook para receber notificações de pagamento do PagBank (PagSeguro)
+    Só grava o evento na fila e responde 200; o processamento roda nos workers.
     """
     try:
         body = await request.json()
         
         logger.info(f"Webhook PagBank received: {body}")
         
-        # Processar webhook
-        resultado = processar_webhook_pagbank(body)
-        
-        if resultado.get("success") and resultado.get("is_approved"):
-            order_id = str(resultado.get("order_id"))
-            reference_id = resultado.get("reference_id", "")
-            valor = resultado.get("amount", 0)
-            
-            # Extrair client_id da reference_id (formato: bot_CLIENTID_TIMESTAMP)
-            client_id = None
-            if reference_id and reference_id.startswith("bot_"):
-                parts = reference_id.split("_")
-                if len(parts) >= 2:
-                    client_id = parts[1]
-            
-            if client_id:
-                # Atualizar status no banco de dados
-                async with AsyncSessionLocal() as session:
-                    from sqlalchemy import select
-                    stmt = select(PaymentRecord).where(PaymentRecord.payment_id == order_id)
-                    result = await session.execute(stmt)
-                    payment = result.scalar_one_or_none()
-                    
-                    if payment:
-                        payment.status = 'approved'
-                        payment.updated_at = datetime.utcnow()
-                        await session.commit()
-                        logger.info(f"Payment {order_id} status updated to approved (PagBank)")
-                
-                # Enviar mensagem de confirmação
-                message = "✅ *Pagamento confirmado!*\n\nSeu acesso foi liberado. Obrigado pela compra!"
-                await send_telegram_message(chat_id=client_id, message=message)
-                
-                # Registrar venda no Google Sheets
-                try:
-                    from gsheets_integration import registrar_venda_bot
-                    registrar_venda_bot(
-                        client_id=client_id,
-                        conteudo="Pagamento PIX PagBank",
-                        valor=valor,
-                        payment_id=order_id
-                    )
-                    logger.info(f"Sale registered in Google Sheets (PagBank)")
-                except Exception as gsheets_error:
-                    logger.warning(f"Failed to register sale in GSheets: {gsheets_error}")
-                
-                # Upsell
-                await send_upsell_message(client_id, valor)
-                
-                return JSONResponse(
-                    status_code=200,
-                    content={"status": "success", "message": "Payment processed"}
-                )
-        
-        return JSONResponse(status_code=200, content={"status": "received"})
+        job_id = await enfileirar("pagbank", body, chave=chave_evento("pagbank", body))
+        if job_id is None:
+            return JSONResponse(status_code=200, content={"status": "duplicate"})
+        return JSONResponse(status_code=200, content={"status": "queued", "job_id": job_id})
         
     except Exception as e:
         logger.error(f"Error processing PagBank webhook: {e}")
@@ -0,0 +1,68 @@
+"""
+Banco de dados do orquestrador PIX (SQLAlchemy async).
+Engine, sessões e modelos compartilhados pelo app e pela fila de jobs.
+"""
+
+import os
+from datetime import datetime
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, String, Float, DateTime, Integer, Text
+
+# Load .env at module import time
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./pix_orchestrator.db")
+
+# SQLAlchemy Async Setup
+Base = declarative_base()
+engine = create_async_engine(DATABASE_URL, echo=False)
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+# Modelos de Banco de Dados
+class PaymentRecord(Base):
+    __tablename__ = "payments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    payment_id = Column(String, unique=True, index=True)
+    client_id = Column(String, index=True)
+    valor = Column(Float)
+    status = Column(String)
+    qr_code_base64 = Column(Text, nullable=True)
+    pix_copy_paste = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class WebhookJob(Base):
+    """Evento de webhook recebido e ainda não (ou já) processado pela fila."""
+    __tablename__ = "webhook_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String, index=True)  # handler: mercadopago, pagbank
+    payload = Column(Text)  # JSON do webhook
+    status = Column(String, index=True, default="pendente")  # pendente, executando, concluido, falhou
+    tentativas = Column(Integer, default=0)
+    etapas_concluidas = Column(Text, default="[]")  # JSON: etapas que não devem repetir no retry
+    proxima_execucao = Column(DateTime, default=datetime.utcnow, index=True)
+    ultimo_erro = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ChaveProcessada(Base):
+    """Chave de idempotência (evento de webhook ou pagamento aprovado) já processada."""
+    __tablename__ = "processed_keys"
+
+    chave = Column(String, primary_key=True)
+    dono = Column(String, nullable=True)  # quem reservou (ex: job:42), pode repetir
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+async def criar_tabelas() -> None:
+    """Cria/verifica as tabelas (chamar no startup)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
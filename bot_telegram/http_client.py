@@ -0,0 +1,60 @@
+"""
+Cliente HTTP assíncrono compartilhado para as APIs dos provedores de pagamento.
+Um único httpx.AsyncClient (pool de conexões + keep-alive, HTTP/2 quando o
+pacote h2 está instalado) vive durante toda a aplicação.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 precisa do extra httpx[http2] (pacote h2)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+# Timeout padrão (cada chamada pode passar o seu)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Pool compartilhado por todas as requisições concorrentes
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente compartilhado, criando na primeira chamada.
+    No FastAPI é criado no startup e fechado no shutdown; scripts avulsos
+    (ex: testes locais dos módulos) também podem usar direto.
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=HTTP_TIMEOUT,
+            limits=HTTP_LIMITS
+        )
+        logger.info(f"HTTP client created (http2={HTTP2_AVAILABLE})")
+
+    return _http_client
+
+
+async def fechar_http_client() -> None:
+    """Fecha o cliente compartilhado (conexões abertas do pool)."""
+    global _http_client
+
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.info("HTTP client closed")
+    _http_client = None
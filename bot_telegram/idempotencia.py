@@ -0,0 +1,136 @@
+"""
+De-duplicação idempotente dos webhooks.
+
+Cada evento recebido (e cada pagamento aprovado) tem uma chave gravada na
+tabela processed_keys. Um LRU em memória na frente da tabela responde às
+reentregas repetidas em O(1), sem ir ao banco nem fazer I/O externo
+(consulta ao provedor, Telegram, Google Sheets).
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+
+from database import AsyncSessionLocal, ChaveProcessada
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+IDEMPOTENCIA_LRU_TAMANHO = int(os.getenv("IDEMPOTENCIA_LRU_TAMANHO", "10000"))
+
+# Provedores reentregam por alguns dias; chaves mais velhas que isso são apagadas
+IDEMPOTENCIA_RETENCAO_DIAS = 30
+
+# chave -> dono (ordem = uso mais recente por último)
+_lru: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+
+def lembrar(chave: str, dono: Optional[str] = None) -> None:
+    """Guarda a chave no LRU (descarta a menos usada quando passa do tamanho)."""
+    _lru[chave] = dono
+    _lru.move_to_end(chave)
+    if len(_lru) > IDEMPOTENCIA_LRU_TAMANHO:
+        _lru.popitem(last=False)
+
+
+def conhecida(chave: str) -> bool:
+    """True se a chave já está no LRU (já processada), sem acessar o banco."""
+    if chave in _lru:
+        _lru.move_to_end(chave)
+        return True
+    return False
+
+
+# ============================================================================
+# CHAVES
+# ============================================================================
+
+def chave_evento(provedor: str, body: Dict[str, Any]) -> str:
+    """
+    Chave de um evento de webhook.
+    Mercado Pago manda um id por notificação; sem id (PagBank), usa o hash
+    do payload - reentregas chegam com o corpo idêntico.
+    """
+    if provedor == "mercadopago" and body.get("id") is not None:
+        return f"evento:mercadopago:{body['id']}"
+    conteudo = json.dumps(body, sort_keys=True, ensure_ascii=False, default=str)
+    return f"evento:{provedor}:{hashlib.sha1(conteudo.encode('utf-8')).hexdigest()}"
+
+
+def chave_pagamento(provedor: str, payment_id: str) -> str:
+    """Chave dos efeitos de um pagamento aprovado (confirmação, upsell, venda)."""
+    return f"aprovado:{provedor}:{payment_id}"
+
+
+# ============================================================================
+# RESERVA
+# ============================================================================
+
+async def reservar(chave: str, dono: Optional[str] = None) -> bool:
+    """
+    Reserva a chave. Retorna True se ela é nova - ou se já pertence a este
+    mesmo `dono` (ex: retry do mesmo job) - e False se outro já processou.
+    A chave vale enquanto o dono não desiste (ver liberar_dono).
+    """
+    if conhecida(chave):
+        return dono is not None and _lru[chave] == dono
+
+    async with AsyncSessionLocal() as session:
+        session.add(ChaveProcessada(chave=chave, dono=dono))
+        try:
+            await session.commit()
+            lembrar(chave, dono)
+            return True
+        except IntegrityError:
+            await session.rollback()
+
+        existente = (await session.execute(
+            select(ChaveProcessada.dono).where(ChaveProcessada.chave == chave)
+        )).scalar_one_or_none()
+
+    lembrar(chave, existente)
+    return dono is not None and existente == dono
+
+
+async def liberar_dono(dono: str) -> None:
+    """
+    Apaga as chaves reservadas por `dono` (ex: job que desistiu). A próxima
+    reentrega do evento volta a ser enfileirada e o pagamento pode ser
+    processado por outro job.
+    """
+    async with AsyncSessionLocal() as session:
+        chaves = (await session.execute(
+            select(ChaveProcessada.chave).where(ChaveProcessada.dono == dono)
+        )).scalars().all()
+        await session.execute(delete(ChaveProcessada).where(ChaveProcessada.dono == dono))
+        await session.commit()
+
+    for chave in chaves:
+        _lru.pop(chave, None)
+
+    if chaves:
+        logger.info(f"{len(chaves)} idempotency keys of {dono} released")
+
+
+async def limpar_antigas() -> None:
+    """Apaga chaves mais velhas que a retenção (chamar no startup)."""
+    async with AsyncSessionLocal() as session:
+        resultado = await session.execute(
+            delete(ChaveProcessada).where(
+                ChaveProcessada.created_at < datetime.utcnow() - timedelta(days=IDEMPOTENCIA_RETENCAO_DIAS)
+            )
+        )
+        await session.commit()
+
+    if resultado.rowcount:
+        logger.info(f"{resultado.rowcount} old idempotency keys removed")
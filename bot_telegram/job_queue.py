@@ -0,0 +1,243 @@
+"""
+Fila de jobs durável para os efeitos colaterais dos webhooks.
+
+O webhook só grava o evento na tabela webhook_jobs e responde 200 na hora.
+Workers asyncio no mesmo processo pegam os jobs pendentes e rodam o handler
+do tipo (consulta ao provedor, banco, Telegram, Google Sheets) com retry e
+backoff exponencial. Cada etapa concluída fica registrada no job, então um
+retry não repete o que já deu certo (ex: não reenvia a confirmação).
+Jobs interrompidos (restart no meio da execução) voltam para a fila no startup.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
+
+from database import AsyncSessionLocal, WebhookJob, ChaveProcessada
+import idempotencia
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_TENTATIVAS = int(os.getenv("JOB_MAX_TENTATIVAS", "5"))
+
+# Backoff entre tentativas: 5s, 10s, 20s, ... até 10 min
+JOB_BACKOFF_BASE = 5
+JOB_BACKOFF_MAX = 600
+
+# Intervalo de varredura (jobs com retry agendado para depois)
+JOB_POLL_INTERVALO = 5
+
+# Jobs concluídos ficam no banco por alguns dias (auditoria) e depois são apagados
+JOB_RETENCAO_DIAS = 7
+
+# handler(payload, etapa) -> None; levanta exceção para tentar de novo
+Etapa = Callable[..., Awaitable[None]]
+Handler = Callable[[Dict[str, Any], Etapa], Awaitable[None]]
+
+_handlers: Dict[str, Handler] = {}
+_workers: List[asyncio.Task] = []
+_acordar: Optional[asyncio.Event] = None
+
+
+def dono_job(job_id: int) -> str:
+    """Dono das chaves de idempotência reservadas por um job."""
+    return f"job:{job_id}"
+
+
+def registrar_handler(tipo: str, handler: Handler) -> None:
+    """Associa um tipo de job (ex: 'mercadopago') à coroutine que o processa."""
+    _handlers[tipo] = handler
+
+
+# ============================================================================
+# ENFILEIRAR
+# ============================================================================
+
+async def enfileirar(tipo: str, payload: Dict[str, Any], chave: Optional[str] = None) -> Optional[int]:
+    """
+    Grava o job (um INSERT local) e acorda os workers. Retorna o id do job.
+    Com `chave` de idempotência, o job e a chave (dono = job) são gravados
+    na mesma transação; se a chave já existe (reentrega), nada é enfileirado
+    e retorna None. Se o job acabar como "falhou", a chave é liberada.
+    """
+    if chave and idempotencia.conhecida(chave):
+        return None
+
+    async with AsyncSessionLocal() as session:
+        job = WebhookJob(
+            tipo=tipo,
+            payload=json.dumps(payload, ensure_ascii=False, default=str),
+            status="pendente",
+            proxima_execucao=datetime.utcnow()
+        )
+        session.add(job)
+        try:
+            if chave:
+                await session.flush()  # id do job, dono da chave
+                session.add(ChaveProcessada(chave=chave, dono=dono_job(job.id)))
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            idempotencia.lembrar(chave)
+            return None
+        job_id = job.id
+
+    if chave:
+        idempotencia.lembrar(chave, dono_job(job_id))
+
+    if _acordar is not None:
+        _acordar.set()
+    return job_id
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+async def _atualizar_job(job_id: int, **valores) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(WebhookJob)
+            .where(WebhookJob.id == job_id)
+            .values(updated_at=datetime.utcnow(), **valores)
+        )
+        await session.commit()
+
+
+async def _pegar_proximo() -> Optional[WebhookJob]:
+    """Reserva o próximo job pendente (UPDATE condicional: só um worker ganha)."""
+    async with AsyncSessionLocal() as session:
+        agora = datetime.utcnow()
+        job_id = (await session.execute(
+            select(WebhookJob.id)
+            .where(WebhookJob.status == "pendente", WebhookJob.proxima_execucao <= agora)
+            .order_by(WebhookJob.id)
+            .limit(1)
+        )).scalar_one_or_none()
+
+        if job_id is None:
+            return None
+
+        reservado = await session.execute(
+            update(WebhookJob)
+            .where(WebhookJob.id == job_id, WebhookJob.status == "pendente")
+            .values(status="executando", tentativas=WebhookJob.tentativas + 1, updated_at=agora)
+        )
+        await session.commit()
+
+        if reservado.rowcount != 1:
+            return None
+        return await session.get(WebhookJob, job_id)
+
+
+async def _executar(job: WebhookJob) -> None:
+    """Roda o handler do job e grava o resultado (concluido, retry ou falhou)."""
+    concluidas = json.loads(job.etapas_concluidas or "[]")
+
+    async def etapa(nome: str, funcao: Callable[..., Awaitable[Any]], *args, **kwargs) -> None:
+        """Executa a etapa uma única vez por job, mesmo entre retries."""
+        if nome in concluidas:
+            return
+        await funcao(*args, **kwargs)
+        concluidas.append(nome)
+        await _atualizar_job(job.id, etapas_concluidas=json.dumps(concluidas))
+
+    # Identifica o job para reservas idempotentes feitas pelo handler
+    etapa.job_id = job.id
+    etapa.dono = dono_job(job.id)
+
+    try:
+        handler = _handlers.get(job.tipo)
+        if handler is None:
+            raise LookupError(f"Nenhum handler registrado para '{job.tipo}'")
+        await handler(json.loads(job.payload), etapa)
+
+    except Exception as e:
+        if job.tentativas >= JOB_MAX_TENTATIVAS:
+            logger.error(f"Job {job.id} ({job.tipo}) failed after {job.tentativas} attempts: {e}")
+            await _atualizar_job(job.id, status="falhou", ultimo_erro=str(e))
+            # Sem isso a reentrega seria descartada como duplicada e o pagamento nunca processado
+            await idempotencia.liberar_dono(dono_job(job.id))
+        else:
+            espera = min(JOB_BACKOFF_BASE * 2 ** (job.tentativas - 1), JOB_BACKOFF_MAX)
+            logger.warning(f"Job {job.id} ({job.tipo}) attempt {job.tentativas} failed, retrying in {espera}s: {e}")
+            await _atualizar_job(
+                job.id,
+                status="pendente",
+                ultimo_erro=str(e),
+                proxima_execucao=datetime.utcnow() + timedelta(seconds=espera)
+            )
+    else:
+        await _atualizar_job(job.id, status="concluido", ultimo_erro=None)
+        logger.info(f"Job {job.id} ({job.tipo}) done")
+
+
+async def _worker(numero: int) -> None:
+    while True:
+        # Limpa antes de buscar: um enfileirar() durante a busca mantém o evento setado
+        _acordar.clear()
+        try:
+            job = await _pegar_proximo()
+        except Exception as e:
+            logger.error(f"Job worker {numero} could not read the queue: {e}")
+            job = None
+
+        if job is None:
+            try:
+                await asyncio.wait_for(_acordar.wait(), timeout=JOB_POLL_INTERVALO)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        try:
+            await _executar(job)
+        except Exception as e:
+            # Falha ao gravar o resultado: o job fica "executando" e volta no próximo startup
+            logger.error(f"Job worker {numero} error on job {job.id}: {e}")
+
+
+async def iniciar_workers() -> None:
+    """Recupera jobs interrompidos e inicia os workers (chamar no startup)."""
+    global _acordar
+
+    async with AsyncSessionLocal() as session:
+        recuperados = await session.execute(
+            update(WebhookJob)
+            .where(WebhookJob.status == "executando")
+            .values(status="pendente", proxima_execucao=datetime.utcnow())
+        )
+        await session.execute(
+            delete(WebhookJob).where(
+                WebhookJob.status == "concluido",
+                WebhookJob.updated_at < datetime.utcnow() - timedelta(days=JOB_RETENCAO_DIAS)
+            )
+        )
+        await session.commit()
+
+    if recuperados.rowcount:
+        logger.info(f"{recuperados.rowcount} interrupted jobs back in the queue")
+
+    _acordar = asyncio.Event()
+    _acordar.set()
+    for numero in range(JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker(numero), name=f"job-worker-{numero}"))
+    logger.info(f"{JOB_WORKERS} job workers started")
+
+
+async def parar_workers() -> None:
+    """Cancela os workers (chamar no shutdown). Jobs em execução voltam no próximo startup."""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
@@ -4,11 +4,14 @@ Gera QR Code PIX e recebe notificações via webhook.
 """
 
 import os
-import requests
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 
+import httpx
+
+from http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -34,7 +37,7 @@ def get_headers():
 # CRIAR PAGAMENTO PIX
 # ============================================================================
 
-def criar_pagamento_pix(
+async def criar_pagamento_pix(
     valor: float,
     descricao: str,
     email_pagador: str = "cliente@email.com",
@@ -83,7 +86,7 @@ def criar_pagamento_pix(
         if external_reference:
             payload["external_reference"] = external_reference
         
-        response = requests.post(url, json=payload, headers=get_headers(), timeout=30)
+        response = await get_http_client().post(url, json=payload, headers=get_headers(), timeout=30)
         
         if response.status_code in [200, 201]:
             data = response.json()
@@ -108,7 +111,7 @@ def criar_pagamento_pix(
                 "details": error_data
             }
             
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return {"success": False, "error": "Timeout na conexão com Mercado Pago"}
     except Exception as e:
         logger.error(f"Erro ao criar pagamento PIX: {e}")
@@ -119,7 +122,7 @@ def criar_pagamento_pix(
 # CONSULTAR STATUS DO PAGAMENTO
 # ============================================================================
 
-def consultar_pagamento(payment_id: str) -> Dict[str, Any]:
+async def consultar_pagamento(payment_id: str) -> Dict[str, Any]:
     """
     Consulta o status de um pagamento.
     
@@ -135,7 +138,7 @@ def consultar_pagamento(payment_id: str) -> Dict[str, Any]:
     
     try:
         url = f"{MP_API_BASE}/v1/payments/{payment_id}"
-        response = requests.get(url, headers=get_headers(), timeout=15)
+        response = await get_http_client().get(url, headers=get_headers(), timeout=15)
         
         if response.status_code == 200:
             data = response.json()
@@ -159,7 +162,7 @@ def consultar_pagamento(payment_id: str) -> Dict[str, Any]:
 # PROCESSAR WEBHOOK
 # ============================================================================
 
-def processar_webhook_mercadopago(data: Dict[str, Any]) -> Dict[str, Any]:
+async def processar_webhook_mercadopago(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Processa notificação de webhook do Mercado Pago.
     
@@ -183,7 +186,7 @@ def processar_webhook_mercadopago(data: Dict[str, Any]) -> Dict[str, Any]:
             return {"success": False, "error": "payment_id não encontrado no webhook"}
         
         # Consulta detalhes completos do pagamento
-        payment_details = consultar_pagamento(str(payment_id))
+        payment_details = await consultar_pagamento(str(payment_id))
         
         if payment_details.get("success"):
             status = payment_details.get("status")
@@ -211,6 +214,7 @@ def processar_webhook_mercadopago(data: Dict[str, Any]) -> Dict[str, Any]:
 
 if __name__ == "__main__":
     # Teste básico
+    import asyncio
     from dotenv import load_dotenv
     load_dotenv()
     
@@ -222,11 +226,11 @@ if __name__ == "__main__":
         print("✅ Token configurado")
         
         # Teste de criação de pagamento
-        resultado = criar_pagamento_pix(
+        resultado = asyncio.run(criar_pagamento_pix(
             valor=1.00,
             descricao="Teste de integração",
             external_reference="teste_123"
-        )
+        ))
         
         if resultado["success"]:
             print(f"✅ Pagamento criado: {resultado['payment_id']}")
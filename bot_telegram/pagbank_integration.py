@@ -4,12 +4,15 @@ Gera QR Code PIX e recebe notificações via webhook.
 """
 
 import os
-import requests
 import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import base64
 
+import httpx
+
+from http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -36,7 +39,7 @@ def get_headers():
 # CRIAR PAGAMENTO PIX
 # ============================================================================
 
-def criar_pagamento_pix_pagbank(
+async def criar_pagamento_pix_pagbank(
     valor: float,
     descricao: str,
     external_reference: Optional[str] = None,
@@ -100,7 +103,7 @@ def criar_pagamento_pix_pagbank(
             ]
         }
         
-        response = requests.post(url, json=payload, headers=get_headers(), timeout=30)
+        response = await get_http_client().post(url, json=payload, headers=get_headers(), timeout=30)
         
         if response.status_code in [200, 201]:
             data = response.json()
@@ -123,7 +126,7 @@ def criar_pagamento_pix_pagbank(
                 qr_code_base64 = None
                 if qr_image_url:
                     try:
-                        img_response = requests.get(qr_image_url, timeout=10)
+                        img_response = await get_http_client().get(qr_image_url, timeout=10)
                         if img_response.status_code == 200:
                             qr_code_base64 = base64.b64encode(img_response.content).decode('utf-8')
                     except:
@@ -150,7 +153,7 @@ def criar_pagamento_pix_pagbank(
                 "details": error_data
             }
             
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return {"success": False, "error": "Timeout na conexão com PagBank"}
     except Exception as e:
         logger.error(f"Erro ao criar pagamento PIX PagBank: {e}")
@@ -161,7 +164,7 @@ def criar_pagamento_pix_pagbank(
 # CONSULTAR STATUS DO PEDIDO
 # ============================================================================
 
-def consultar_pedido_pagbank(order_id: str) -> Dict[str, Any]:
+async def consultar_pedido_pagbank(order_id: str) -> Dict[str, Any]:
     """
     Consulta o status de um pedido/pagamento.
     
@@ -177,7 +180,7 @@ def consultar_pedido_pagbank(order_id: str) -> Dict[str, Any]:
     
     try:
         url = f"{PAGBANK_API_BASE}/orders/{order_id}"
-        response = requests.get(url, headers=get_headers(), timeout=15)
+        response = await get_http_client().get(url, headers=get_headers(), timeout=15)
         
         if response.status_code == 200:
             data = response.json()
@@ -266,6 +269,7 @@ def processar_webhook_pagbank(data: Dict[str, Any]) -> Dict[str, Any]:
 # ============================================================================
 
 if __name__ == "__main__":
+    import asyncio
     from dotenv import load_dotenv
     load_dotenv()
     
@@ -277,11 +281,11 @@ if __name__ == "__main__":
         print("✅ Token configurado")
         
         # Teste de criação de pagamento
-        resultado = criar_pagamento_pix_pagbank(
+        resultado = asyncio.run(criar_pagamento_pix_pagbank(
             valor=1.00,
             descricao="Teste de integração",
             external_reference="teste_123"
-        )
+        ))
         
         if resultado["success"]:
             print(f"✅ Pagamento criado: {resultado['payment_id']}")
@@ -1,6 +1,8 @@
 """
 Gerenciador de Pagamentos PIX - Multi-Provider
 Permite trocar entre Mercado Pago e PagBank facilmente.
+Todas as chamadas aos provedores são assíncronas e usam o cliente HTTP
+compartilhado (http_client), sem bloquear o event loop do FastAPI.
 """
 
 import os
@@ -28,7 +30,18 @@ def get_active_provider() -> PaymentProvider:
     return PaymentProvider.MERCADO_PAGO
 
 
-def criar_pagamento_pix(
+def provedor_do_pagamento(payment_id: str) -> PaymentProvider:
+    """
+    Descobre o provedor pelo formato do ID (o fallback pode ter criado o
+    pagamento no provedor secundário): pedidos PagBank começam com ORDE_,
+    pagamentos do Mercado Pago são numéricos.
+    """
+    if str(payment_id).upper().startswith("ORDE_"):
+        return PaymentProvider.PAGBANK
+    return PaymentProvider.MERCADO_PAGO
+
+
+async def criar_pagamento_pix(
     valor: float,
     descricao: str,
     external_reference: Optional[str] = None,
@@ -55,7 +68,7 @@ def criar_pagamento_pix(
     
     if active == PaymentProvider.MERCADO_PAGO:
         from mercadopago_integration import criar_pagamento_pix as mp_criar
-        resultado = mp_criar(
+        resultado = await mp_criar(
             valor=valor,
             descricao=descricao,
             external_reference=external_reference,
@@ -63,7 +76,7 @@ def criar_pagamento_pix(
         )
     elif active == PaymentProvider.PAGBANK:
         from pagbank_integration import criar_pagamento_pix_pagbank as pg_criar
-        resultado = pg_criar(
+        resultado = await pg_criar(
             valor=valor,
             descricao=descricao,
             external_reference=external_reference,
@@ -78,7 +91,7 @@ def criar_pagamento_pix(
     return resultado
 
 
-def criar_pagamento_com_fallback(
+async def criar_pagamento_com_fallback(
     valor: float,
     descricao: str,
     external_reference: Optional[str] = None,
@@ -100,7 +113,7 @@ def criar_pagamento_com_fallback(
     
     # Tenta provedor principal
     primary = get_active_provider()
-    resultado = criar_pagamento_pix(
+    resultado = await criar_pagamento_pix(
         valor=valor,
         descricao=descricao,
         external_reference=external_reference,
@@ -119,7 +132,7 @@ def criar_pagamento_com_fallback(
     
     logger.info(f"Attempting fallback to {secondary.value}")
     
-    resultado_fallback = criar_pagamento_pix(
+    resultado_fallback = await criar_pagamento_pix(
         valor=valor,
         descricao=descricao,
         external_reference=external_reference,
@@ -136,7 +149,7 @@ def criar_pagamento_com_fallback(
     return resultado_fallback
 
 
-def consultar_pagamento(payment_id: str, provider: Optional[PaymentProvider] = None) -> Dict[str, Any]:
+async def consultar_pagamento(payment_id: str, provider: Optional[PaymentProvider] = None) -> Dict[str, Any]:
     """
     Consulta status de um pagamento.
     
@@ -152,15 +165,15 @@ def consultar_pagamento(payment_id: str, provider: Optional[PaymentProvider] = N
     
     if active == PaymentProvider.MERCADO_PAGO:
         from mercadopago_integration import consultar_pagamento as mp_consultar
-        return mp_consultar(payment_id)
+        return await mp_consultar(payment_id)
     elif active == PaymentProvider.PAGBANK:
         from pagbank_integration import consultar_pedido_pagbank as pg_consultar
-        return pg_consultar(payment_id)
+        return await pg_consultar(payment_id)
     else:
         return {"success": False, "error": f"Provedor desconhecido: {active}"}
 
 
-def processar_webhook(data: Dict[str, Any], provider: PaymentProvider) -> Dict[str, Any]:
+async def processar_webhook(data: Dict[str, Any], provider: PaymentProvider) -> Dict[str, Any]:
     """
     Processa webhook de um provedor específico.
     
@@ -174,7 +187,7 @@ def processar_webhook(data: Dict[str, Any], provider: PaymentProvider) -> Dict[s
     
     if provider == PaymentProvider.MERCADO_PAGO:
         from mercadopago_integration import processar_webhook_mercadopago as mp_webhook
-        return mp_webhook(data)
+        return await mp_webhook(data)
     elif provider == PaymentProvider.PAGBANK:
         from pagbank_integration import processar_webhook_pagbank as pg_webhook
         return pg_webhook(data)
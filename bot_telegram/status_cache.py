@@ -0,0 +1,165 @@
+"""
+Cache de status dos pagamentos, em cima da tabela payments.
+
+- Status final (aprovado, cancelado, expirado...) é servido localmente
+  (memória ou banco), sem chamada ao provedor.
+- Status ainda aberto (pendente) é consultado no provedor no máximo uma vez
+  a cada STATUS_CACHE_TTL segundos por pagamento.
+- Consultas simultâneas do mesmo pagamento compartilham uma única chamada
+  ao provedor (coalescing).
+- O webhook força a consulta ao provedor (`forcar=True`): o cache em memória
+  de um polling não pode esconder a aprovação que o webhook está avisando.
+O status novo vindo do provedor é gravado no PaymentRecord.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal, PaymentRecord
+from payment_manager import consultar_pagamento, provedor_do_pagamento, PaymentProvider
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+# Quanto tempo um status ainda aberto vale antes de consultar o provedor de novo
+STATUS_CACHE_TTL = float(os.getenv("STATUS_CACHE_TTL", "10"))
+
+# Pagamentos mantidos em memória
+STATUS_CACHE_TAMANHO = 10000
+
+# Status que não mudam mais (Mercado Pago em minúsculas; PagBank normalizado)
+STATUS_TERMINAIS = {
+    "approved", "rejected", "cancelled", "refunded", "charged_back", "expired",
+    "canceled", "declined",
+}
+
+# payment_id -> (resultado, expira_em); expira_em None = status final
+_cache: "OrderedDict[str, Tuple[Dict[str, Any], Optional[float]]]" = OrderedDict()
+
+# payment_id -> consulta ao provedor em andamento
+_em_voo: Dict[str, asyncio.Task] = {}
+
+
+def normalizar_status(status: Optional[str]) -> str:
+    """Status no formato da tabela payments (PagBank PAID -> approved)."""
+    status = (status or "").lower()
+    return "approved" if status == "paid" else status
+
+
+def status_terminal(status: Optional[str]) -> bool:
+    return normalizar_status(status) in STATUS_TERMINAIS
+
+
+def _guardar(payment_id: str, resultado: Dict[str, Any]) -> None:
+    terminal = status_terminal(resultado.get("status"))
+    _cache[payment_id] = (resultado, None if terminal else time.monotonic() + STATUS_CACHE_TTL)
+    _cache.move_to_end(payment_id)
+    if len(_cache) > STATUS_CACHE_TAMANHO:
+        _cache.popitem(last=False)
+
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+async def _status_local(payment_id: str) -> Optional[Dict[str, Any]]:
+    """Pagamento da tabela payments, se o status gravado já é final."""
+    async with AsyncSessionLocal() as session:
+        payment = (await session.execute(
+            select(PaymentRecord).where(PaymentRecord.payment_id == payment_id)
+        )).scalar_one_or_none()
+
+    if payment is None or not status_terminal(payment.status):
+        return None
+
+    return {
+        "success": True,
+        "payment_id": payment.payment_id,
+        "status": normalizar_status(payment.status),
+        "amount": payment.valor,
+        "client_id": payment.client_id,
+        "source": "local",
+    }
+
+
+async def _gravar_status(payment_id: str, status: str) -> None:
+    """Atualiza o status no PaymentRecord (se o pagamento é nosso e mudou)."""
+    async with AsyncSessionLocal() as session:
+        payment = (await session.execute(
+            select(PaymentRecord).where(PaymentRecord.payment_id == payment_id)
+        )).scalar_one_or_none()
+
+        if payment and payment.status != status:
+            payment.status = status
+            payment.updated_at = datetime.utcnow()
+            await session.commit()
+            logger.info(f"Payment {payment_id} status updated to {status}")
+
+
+async def _consultar_provedor(payment_id: str, provider: PaymentProvider) -> Dict[str, Any]:
+    """Uma chamada ao provedor; guarda no cache e no banco se deu certo."""
+    resultado = await consultar_pagamento(payment_id, provider)
+
+    if resultado.get("success"):
+        resultado = {**resultado, "source": "provider"}
+        _guardar(payment_id, resultado)
+        status = normalizar_status(resultado.get("status"))
+        if status:
+            try:
+                await _gravar_status(payment_id, status)
+            except Exception as e:
+                logger.warning(f"Could not save status of payment {payment_id}: {e}")
+
+    return resultado
+
+
+async def consultar_status(payment_id: str, provider: Optional[PaymentProvider] = None,
+                           forcar: bool = False) -> Dict[str, Any]:
+    """
+    Status do pagamento: memória -> tabela payments (status final) -> provedor.
+    Mesmo formato de payment_manager.consultar_pagamento, mais `source`
+    (cache, local ou provider) e `client_id` quando vem do banco.
+    Com `forcar` (webhook: o status acabou de mudar no provedor) o cache em
+    memória é ignorado; só um status final gravado no banco evita a consulta.
+    """
+    payment_id = str(payment_id)
+
+    if forcar:
+        _cache.pop(payment_id, None)
+
+    em_cache = _cache.get(payment_id)
+    if em_cache:
+        resultado, expira_em = em_cache
+        if expira_em is None or time.monotonic() < expira_em:
+            _cache.move_to_end(payment_id)
+            return {**resultado, "source": "cache"}
+
+    local = await _status_local(payment_id)
+    if local:
+        _guardar(payment_id, local)
+        return local
+
+    # Coalescing: quem chegar durante a consulta espera a mesma chamada.
+    # Consulta forçada não reaproveita uma chamada que começou antes dela.
+    tarefa = _em_voo.get(payment_id)
+    if tarefa is None or forcar:
+        tarefa = asyncio.create_task(
+            _consultar_provedor(payment_id, provider or provedor_do_pagamento(payment_id))
+        )
+        _em_voo[payment_id] = tarefa
+        tarefa.add_done_callback(
+            lambda t: _em_voo.pop(payment_id, None) if _em_voo.get(payment_id) is t else None
+        )
+
+    # shield: cancelar quem espera não cancela a consulta dos outros
+    return await asyncio.shield(tarefa)
@@ -0,0 +1,109 @@
+"""
+Cliente da Bot API do Telegram com o mesmo ciclo de vida da aplicação.
+Um httpx.AsyncClient com keep-alive para api.telegram.org (sem handshake
+TLS por mensagem), concorrência limitada por semáforo e retry respeitando
+o `retry_after` das respostas 429.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Optional, Dict, Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+# Mensagens em voo ao mesmo tempo (rajada de pagamentos aprovados)
+TELEGRAM_MAX_CONCORRENCIA = int(os.getenv("TELEGRAM_MAX_CONCORRENCIA", "20"))
+
+# Tentativas por mensagem (429 e falhas de rede)
+TELEGRAM_MAX_TENTATIVAS = 3
+
+# Espera máxima aceita de um retry_after (segundos)
+TELEGRAM_RETRY_AFTER_MAX = 30.0
+
+_telegram_client: Optional[httpx.AsyncClient] = None
+_semaforo: Optional[asyncio.Semaphore] = None
+
+
+def iniciar_telegram_client(api_url: str) -> httpx.AsyncClient:
+    """Cria o cliente (chamar no startup). `api_url` = https://api.telegram.org/bot<TOKEN>."""
+    global _telegram_client, _semaforo
+
+    if _telegram_client is None or _telegram_client.is_closed:
+        _telegram_client = httpx.AsyncClient(
+            base_url=api_url,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(
+                max_connections=TELEGRAM_MAX_CONCORRENCIA,
+                max_keepalive_connections=TELEGRAM_MAX_CONCORRENCIA,
+                keepalive_expiry=60.0
+            )
+        )
+        _semaforo = asyncio.Semaphore(TELEGRAM_MAX_CONCORRENCIA)
+        logger.info("Telegram client created")
+
+    return _telegram_client
+
+
+async def fechar_telegram_client() -> None:
+    """Fecha o cliente (chamar no shutdown)."""
+    global _telegram_client, _semaforo
+
+    if _telegram_client is not None and not _telegram_client.is_closed:
+        await _telegram_client.aclose()
+        logger.info("Telegram client closed")
+    _telegram_client = None
+    _semaforo = None
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Segundos pedidos pelo Telegram num 429 (parameters.retry_after)."""
+    try:
+        segundos = response.json().get("parameters", {}).get("retry_after", 1)
+    except ValueError:
+        segundos = response.headers.get("Retry-After", 1)
+    try:
+        return min(float(segundos), TELEGRAM_RETRY_AFTER_MAX)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+async def chamar_api(metodo: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Chama um método da Bot API (ex: sendMessage).
+    Retorna o JSON da resposta em caso de sucesso, None se falhou depois das tentativas.
+    """
+    if _telegram_client is None or _semaforo is None:
+        raise RuntimeError("Telegram client não iniciado (iniciar_telegram_client no startup)")
+
+    for tentativa in range(1, TELEGRAM_MAX_TENTATIVAS + 1):
+        espera = None
+
+        async with _semaforo:
+            try:
+                response = await _telegram_client.post(f"/{metodo}", json=payload)
+            except httpx.TransportError as e:
+                logger.warning(f"Telegram {metodo} network error (attempt {tentativa}): {e}")
+                espera = float(tentativa)
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code == 429:
+                    espera = _retry_after(response)
+                    logger.warning(f"Telegram rate limit on {metodo}, retrying in {espera:.0f}s")
+                else:
+                    logger.error(f"Telegram {metodo} failed: {response.status_code} - {response.text}")
+                    return None
+
+        # Espera fora do semáforo: as outras mensagens continuam saindo
+        if tentativa < TELEGRAM_MAX_TENTATIVAS:
+            await asyncio.sleep(espera)
+
+    logger.error(f"Telegram {metodo} gave up after {TELEGRAM_MAX_TENTATIVAS} attempts")
+    return None
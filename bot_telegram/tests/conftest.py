@@ -0,0 +1,17 @@
+"""
+Configuração dos testes do orquestrador PIX.
+Os módulos do bot são importados pelo nome (como no deploy), e o banco é um
+SQLite temporário por sessão de testes.
+"""
+
+import os
+import sys
+import tempfile
+
+_BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BOT_DIR not in sys.path:
+    sys.path.insert(0, _BOT_DIR)
+
+# Antes de importar database: o engine é criado no import
+_DB_DIR = tempfile.mkdtemp(prefix="pix_tests_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'test.db')}"
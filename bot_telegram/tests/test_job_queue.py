@@ -0,0 +1,68 @@
+"""Testes da fila de jobs dos webhooks (job_queue + idempotencia)."""
+
+import asyncio
+
+import pytest
+
+import idempotencia
+import job_queue
+from database import AsyncSessionLocal, WebhookJob, criar_tabelas
+
+
+@pytest.fixture
+def fila(monkeypatch):
+    """Uma tentativa por job, sem workers rodando (os jobs são executados no teste)."""
+    monkeypatch.setattr(job_queue, "JOB_MAX_TENTATIVAS", 1)
+    idempotencia._lru.clear()
+    asyncio.run(criar_tabelas())
+
+
+async def _executar_proximo():
+    job = await job_queue._pegar_proximo()
+    await job_queue._executar(job)
+    async with AsyncSessionLocal() as session:
+        return await session.get(WebhookJob, job.id)
+
+
+def test_reentrega_de_evento_processado_nao_enfileira(fila):
+    async def handler(payload, etapa):
+        await idempotencia.reservar("aprovado:teste:ok", dono=etapa.dono)
+
+    job_queue.registrar_handler("teste_ok", handler)
+
+    async def cenario():
+        primeiro = await job_queue.enfileirar("teste_ok", {"id": 1}, chave="evento:teste:ok")
+        job = await _executar_proximo()
+        idempotencia._lru.clear()  # força a checagem no banco
+        reentrega = await job_queue.enfileirar("teste_ok", {"id": 1}, chave="evento:teste:ok")
+        outro_job = await idempotencia.reservar("aprovado:teste:ok", dono="job:outro")
+        return primeiro, job, reentrega, outro_job
+
+    primeiro, job, reentrega, outro_job = asyncio.run(cenario())
+
+    assert primeiro is not None
+    assert job.status == "concluido"
+    assert reentrega is None
+    assert outro_job is False
+
+
+def test_job_que_falhou_libera_as_chaves(fila):
+    async def handler(payload, etapa):
+        await idempotencia.reservar("aprovado:teste:falha", dono=etapa.dono)
+        raise RuntimeError("Google Sheets fora do ar")
+
+    job_queue.registrar_handler("teste_falha", handler)
+
+    async def cenario():
+        await job_queue.enfileirar("teste_falha", {"id": 2}, chave="evento:teste:falha")
+        job = await _executar_proximo()
+        reentrega = await job_queue.enfileirar("teste_falha", {"id": 2}, chave="evento:teste:falha")
+        outro_job = await idempotencia.reservar("aprovado:teste:falha", dono="job:outro")
+        return job, reentrega, outro_job
+
+    job, reentrega, outro_job = asyncio.run(cenario())
+
+    assert job.status == "falhou"
+    # A reentrega do provedor volta para a fila e o pagamento pode ser processado de novo
+    assert reentrega is not None
+    assert outro_job is True
@@ -0,0 +1,88 @@
+"""Testes do cache de status dos pagamentos (status_cache)."""
+
+import asyncio
+
+import pytest
+
+import status_cache
+from database import AsyncSessionLocal, PaymentRecord, criar_tabelas
+from payment_manager import PaymentProvider
+
+
+@pytest.fixture
+def provedor(monkeypatch):
+    """Provedor falso: devolve os status da lista em ordem e conta as chamadas."""
+    chamadas = []
+    status = []
+
+    async def consultar_pagamento(payment_id, provider):
+        chamadas.append(payment_id)
+        return {"success": True, "payment_id": payment_id, "status": status.pop(0), "amount": 10.0}
+
+    monkeypatch.setattr(status_cache, "consultar_pagamento", consultar_pagamento)
+    status_cache._cache.clear()
+    status_cache._em_voo.clear()
+    return chamadas, status
+
+
+async def _criar_pagamento(payment_id: str, status: str) -> None:
+    await criar_tabelas()
+    async with AsyncSessionLocal() as session:
+        session.add(PaymentRecord(payment_id=payment_id, client_id="123", valor=10.0, status=status))
+        await session.commit()
+
+
+def test_polling_usa_cache_dentro_do_ttl(provedor):
+    chamadas, status = provedor
+    status.extend(["pending"])
+
+    async def cenario():
+        await _criar_pagamento("pay-poll", "pending")
+        primeiro = await status_cache.consultar_status("pay-poll", PaymentProvider.MERCADO_PAGO)
+        segundo = await status_cache.consultar_status("pay-poll", PaymentProvider.MERCADO_PAGO)
+        return primeiro, segundo
+
+    primeiro, segundo = asyncio.run(cenario())
+
+    assert primeiro["status"] == "pending"
+    assert segundo["source"] == "cache"
+    assert chamadas == ["pay-poll"]
+
+
+def test_webhook_depois_do_polling_consulta_o_provedor(provedor):
+    chamadas, status = provedor
+    status.extend(["pending", "approved"])
+
+    async def cenario():
+        await _criar_pagamento("pay-webhook", "pending")
+        polling = await status_cache.consultar_status("pay-webhook", PaymentProvider.MERCADO_PAGO)
+        webhook = await status_cache.consultar_status(
+            "pay-webhook", PaymentProvider.MERCADO_PAGO, forcar=True
+        )
+        depois = await status_cache.consultar_status("pay-webhook", PaymentProvider.MERCADO_PAGO)
+        return polling, webhook, depois
+
+    polling, webhook, depois = asyncio.run(cenario())
+
+    assert polling["status"] == "pending"
+    assert webhook["status"] == "approved"
+    assert webhook["source"] == "provider"
+    # O polling seguinte já vê a aprovação, sem nova chamada ao provedor
+    assert depois["status"] == "approved"
+    assert chamadas == ["pay-webhook", "pay-webhook"]
+
+
+def test_webhook_com_status_final_no_banco_nao_vai_ao_provedor(provedor):
+    chamadas, _ = provedor
+
+    async def cenario():
+        await _criar_pagamento("pay-final", "approved")
+        return await status_cache.consultar_status(
+            "pay-final", PaymentProvider.MERCADO_PAGO, forcar=True
+        )
+
+    resultado = asyncio.run(cenario())
+
+    assert resultado["status"] == "approved"
+    assert resultado["source"] == "local"
+    assert chamadas == []
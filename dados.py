@@ -0,0 +1,774 @@
+"""
+Camada de dados do Empire Control.
+
+Google Sheets (conexao compartilhada, cache de leitura, espelho SQLite
+local) e os loaders/savers de produtos, vendas e despesas usados pelas abas.
+"""
+
+import os
+import json
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+# Espelho local (SQLite) das abas + sincronizacao com o Sheets
+import local_store
+
+# Google Sheets Integration
+try:
+    import gspread
+    from google.oauth2.service_account import Credentials
+    GSPREAD_AVAILABLE = True
+except ImportError:
+    GSPREAD_AVAILABLE = False
+
+# ==================== GOOGLE SHEETS CONFIG ====================
+# Cabecalhos de cada aba (ordem das colunas na planilha)
+PRODUTOS_COLUNAS = ["id", "nome", "descricao", "quantidade_gramas", "quantidade_inicial", "preco_compra_total", "vendido_gramas", "data_cadastro"]
+VENDAS_COLUNAS = ["id", "produto_id", "produto_nome", "cliente", "gramas", "valor_venda", "custo", "lucro", "data"]
+DESPESAS_COLUNAS = ["data", "item", "valor", "pagador"]
+DESPESAS_PESSOAIS_COLUNAS = ["data", "descricao", "valor", "socio", "categoria"]
+VENDAS_BOT_COLUNAS = ["data", "client_id", "conteudo", "valor", "payment_id", "status"]
+
+# Registro de abas: titulo -> (cabecalho, colunas do grid). Todas sao
+# resolvidas/criadas uma unica vez quando a conexao e aberta.
+ABAS_PLANILHA = {
+    "Produtos": (PRODUTOS_COLUNAS, 10),
+    "Vendas": (VENDAS_COLUNAS, 10),
+    "Despesas": (DESPESAS_COLUNAS, 5),
+    "DespesasPessoais": (DESPESAS_PESSOAIS_COLUNAS, 10),
+    "VendasBot": (VENDAS_BOT_COLUNAS, 10),
+}
+
+
+def get_google_sheets_client():
+    """
+    Conecta ao Google Sheets usando credenciais do Streamlit Secrets.
+    Retorna None se não estiver configurado.
+    """
+    try:
+        if not GSPREAD_AVAILABLE:
+            return None
+        
+        if "gcp_service_account" not in st.secrets:
+            return None
+        
+        scopes = [
+            "https://www.googleapis.com/auth/spreadsheets",
+            "https://www.googleapis.com/auth/drive"
+        ]
+        
+        credentials = Credentials.from_service_account_info(
+            st.secrets["gcp_service_account"],
+            scopes=scopes
+        )
+        
+        client = gspread.authorize(credentials)
+        return client
+    except Exception as e:
+        st.warning(f"Google Sheets não configurado: {e}")
+        return None
+
+
+def ler_segredo(nome, padrao=None):
+    """
+    Valor de st.secrets com padrao. Sem .streamlit/secrets.toml o st.secrets
+    levanta excecao em qualquer acesso; aqui isso vira o padrao.
+    """
+    try:
+        return st.secrets.get(nome, padrao)
+    except Exception:
+        return padrao
+
+
+def _sheets_configurado():
+    """Verifica (sem rede) se ha credenciais e URL da planilha nos secrets."""
+    return (
+        GSPREAD_AVAILABLE
+        and bool(ler_segredo("gcp_service_account"))
+        and bool(ler_segredo("spreadsheet_url"))
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _conexao_sheets():
+    """
+    Conexao com o Google Sheets compartilhada por todas as sessoes do processo.
+    Guarda o client autorizado, a planilha e o mapa titulo -> Worksheet.
+    Cria as abas necessarias se nao existirem.
+    Levanta excecao em caso de falha para que o erro nao fique em cache.
+    """
+    client = get_google_sheets_client()
+    if not client:
+        raise RuntimeError("Nao foi possivel autorizar a conta de servico")
+
+    spreadsheet = client.open_by_url(st.secrets["spreadsheet_url"])
+
+    # Lista as abas uma unica vez e guarda os handles
+    abas = {ws.title: ws for ws in spreadsheet.worksheets()}
+
+    # Garante que as abas existem
+    for titulo, (colunas, n_cols) in ABAS_PLANILHA.items():
+        if titulo not in abas:
+            ws = spreadsheet.add_worksheet(title=titulo, rows=1000, cols=n_cols)
+            ws.append_row(colunas)
+            abas[titulo] = ws
+
+    return {'client': client, 'spreadsheet': spreadsheet, 'abas': abas}
+
+
+def get_worksheet(nome_aba):
+    """
+    Retorna o Worksheet em cache para a aba (sem chamada de metadata).
+    Abas fora do registro sao criadas na primeira vez e passam a ficar em cache.
+    """
+    conexao = _conexao_sheets()
+    abas = conexao['abas']
+    if nome_aba not in abas:
+        colunas, n_cols = ABAS_PLANILHA.get(nome_aba, (None, 10))
+        ws = conexao['spreadsheet'].add_worksheet(title=nome_aba, rows=1000, cols=n_cols)
+        if colunas:
+            ws.append_row(colunas)
+        abas[nome_aba] = ws
+    return abas[nome_aba]
+
+
+def resetar_conexao_sheets():
+    """Descarta a conexao compartilhada (ex: token revogado) - a proxima chamada reconecta."""
+    _conexao_sheets.clear()
+
+
+def _erro_de_autenticacao(erro):
+    """True se a excecao do gspread indica credencial expirada/invalida."""
+    status_code = getattr(getattr(erro, 'response', None), 'status_code', None)
+    return status_code in (401, 403)
+
+
+def get_spreadsheet():
+    """
+    Abre a planilha configurada nos secrets.
+    Usa a conexao em cache do processo (st.cache_resource), entao novas sessoes
+    nao reautorizam nem reabrem a planilha.
+    """
+    try:
+        if not _sheets_configurado():
+            if GSPREAD_AVAILABLE and "gcp_service_account" in st.secrets:
+                st.warning("spreadsheet_url não encontrada nos secrets")
+            return None
+
+        return _conexao_sheets()['spreadsheet']
+    except Exception as e:
+        st.error(f"Erro ao conectar Google Sheets: {e}")
+        return None
+
+
+# ==================== CACHE DE LEITURA DO SHEETS ====================
+# TTL (segundos) do cache de leitura das abas - configuravel via secrets
+SHEETS_CACHE_TTL = int(ler_segredo("sheets_cache_ttl", 60))
+
+
+@st.cache_resource
+def _versoes_abas():
+    """
+    Versao de cada aba, compartilhada pelo processo inteiro.
+    Incrementar a versao de uma aba invalida so o cache dela.
+    """
+    return {}
+
+
+@st.cache_data(ttl=SHEETS_CACHE_TTL, show_spinner=False)
+def _ler_valores_aba(nome_aba, versao):
+    """Busca get_all_values() de uma aba (cacheado por aba + versao)."""
+    for tentativa in range(2):
+        spreadsheet = get_spreadsheet()
+        if not spreadsheet:
+            raise RuntimeError("Google Sheets indisponivel")
+        try:
+            return get_worksheet(nome_aba).get_all_values()
+        except Exception as e:
+            # Credencial expirada: descarta a conexao compartilhada e tenta de novo
+            if tentativa == 0 and _erro_de_autenticacao(e):
+                resetar_conexao_sheets()
+                continue
+            raise
+
+
+def ler_aba_cache(nome_aba):
+    """
+    Leitura read-through de uma aba: cada aba vai ao Sheets no maximo
+    uma vez por TTL, independente de quantas vezes a pagina pede.
+    """
+    return _ler_valores_aba(nome_aba, _versoes_abas().get(nome_aba, 0))
+
+
+def invalidar_cache_aba(*nomes_abas):
+    """Invalida o cache das abas informadas (chamar depois de toda escrita)."""
+    versoes = _versoes_abas()
+    for nome in nomes_abas:
+        versoes[nome] = versoes.get(nome, 0) + 1
+
+
+# ==================== ESPELHO LOCAL (SQLITE) ====================
+# Intervalos (segundos) do worker de sincronizacao - configuraveis via secrets
+SHEETS_PUSH_INTERVALO = int(ler_segredo("sheets_push_intervalo", 5))
+SHEETS_PULL_INTERVALO = int(ler_segredo("sheets_pull_intervalo", 120))
+
+
+def ler_aba(nome_aba):
+    """
+    Leitura primaria das abas: espelho SQLite local (sem rede).
+    Se a aba ainda nao existe localmente, semeia uma vez a partir do Sheets.
+    Retorna None quando nao ha copia local nem Google Sheets configurado.
+    """
+    valores = local_store.ler_aba(nome_aba)
+    if valores is not None:
+        return valores
+
+    if not _sheets_configurado():
+        return None
+
+    valores = ler_aba_cache(nome_aba)
+    local_store.aplicar_remoto(nome_aba, valores)
+    return valores
+
+
+def _garantir_aba_local(nome_aba):
+    """
+    Garante que a aba existe no espelho local antes de uma escrita.
+    Sem Google Sheets, cria a aba local so com o cabecalho.
+    """
+    valores = ler_aba(nome_aba)
+    if valores is None:
+        valores = [list(ABAS_PLANILHA[nome_aba][0])]
+        local_store.aplicar_remoto(nome_aba, valores)
+    return valores
+
+
+def _tratar_erro_sync(erro):
+    """Credencial expirada no worker: descarta a conexao para reconectar no proximo ciclo."""
+    if _erro_de_autenticacao(erro):
+        resetar_conexao_sheets()
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar_sincronizador_sheets():
+    """Inicia (uma vez por processo) o worker que envia/puxa as abas do Sheets."""
+    return local_store.iniciar_sincronizador(
+        abrir_aba=get_worksheet,
+        abas_pull=list(ABAS_PLANILHA),
+        intervalo_envio=SHEETS_PUSH_INTERVALO,
+        intervalo_pull=SHEETS_PULL_INTERVALO,
+        ao_erro=_tratar_erro_sync
+    )
+
+
+# Flag para usar Google Sheets ou arquivos locais
+USE_GOOGLE_SHEETS = False
+
+def init_google_sheets():
+    """Inicializa conexão com Google Sheets se disponível."""
+    global USE_GOOGLE_SHEETS
+    spreadsheet = get_spreadsheet()
+    if spreadsheet:
+        USE_GOOGLE_SHEETS = True
+        return True
+    return False
+
+
+# ==================== PATHS ====================
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DESPESAS_FILE = os.path.join(DATA_DIR, "despesas.csv")
+PRODUTOS_FILE = os.path.join(DATA_DIR, "produtos.json")
+VENDAS_FILE = os.path.join(DATA_DIR, "vendas.json")
+
+# ==================== UTILITY FUNCTIONS ====================
+
+def limpar_currency_br(valor_str):
+    """
+    Limpa valores monetarios brasileiros e converte para float.
+    Exemplo: "R$ 1.234,56" -> 1234.56
+    """
+    try:
+        if pd.isna(valor_str) or valor_str == '':
+            return 0.0
+
+        # Remove "R$" e espacos
+        limpo = str(valor_str).replace('R$', '').strip()
+        # Remove pontos (separador de milhar)
+        limpo = limpo.replace('.', '')
+        # Substitui virgula por ponto (separador decimal)
+        limpo = limpo.replace(',', '.')
+
+        return float(limpo)
+    except:
+        return 0.0
+
+
+def processar_csv_estoque(uploaded_file):
+    """
+    Processa CSV de estoque com regras especificas:
+    - skiprows=3 (3 linhas de metadata)
+    - Limpa colunas de currency brasileira
+    """
+    try:
+        # Le CSV pulando 3 primeiras linhas de metadata
+        df = pd.read_csv(uploaded_file, skiprows=3)
+
+        # Identifica colunas de moeda para limpar
+        colunas_moeda = []
+        for col in df.columns:
+            if df[col].dtype == 'object':
+                # Verifica se contem "R$" em alguma celula
+                amostra = df[col].astype(str).head(5)
+                if any('R$' in str(val) for val in amostra):
+                    colunas_moeda.append(col)
+
+        # Limpa colunas de moeda
+        for col in colunas_moeda:
+            df[f'{col}_limpo'] = df[col].apply(limpar_currency_br)
+
+        return {
+            'success': True,
+            'df': df,
+            'colunas_moeda': colunas_moeda
+        }
+
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f'Erro ao processar CSV: {str(e)}'
+        }
+
+
+def carregar_despesas():
+    """Carrega dados de despesas do espelho local/Google Sheets ou CSV legado."""
+    try:
+        all_values = ler_aba("Despesas")
+        if all_values is not None:
+            if len(all_values) > 1:
+                df = tabela_para_df(all_values, ('valor',))
+                if 'data' in df.columns:
+                    df['data'] = pd.to_datetime(df['data']).dt.date
+                return df
+            return pd.DataFrame(columns=['data', 'item', 'valor', 'pagador'])
+    except:
+        pass
+    
+    # Fallback para arquivo local
+    if os.path.exists(DESPESAS_FILE):
+        df = pd.read_csv(DESPESAS_FILE)
+        df['data'] = pd.to_datetime(df['data']).dt.date
+        return df
+    return pd.DataFrame(columns=['data', 'item', 'valor', 'pagador'])
+
+
+def salvar_despesas(df):
+    """Salva despesas no espelho local (o worker envia ao Google Sheets) ou CSV local."""
+    try:
+        linhas = [
+            [str(row['data']) if row['data'] else '', row['item'], float(row['valor']), row['pagador']]
+            for _, row in df.iterrows()
+        ]
+        local_store.substituir_aba("Despesas", [DESPESAS_COLUNAS] + linhas, enviar=_sheets_configurado())
+        invalidar_cache_aba("Despesas")
+        return
+    except:
+        pass
+    
+    # Fallback para arquivo local
+    df.to_csv(DESPESAS_FILE, index=False)
+
+
+# ============ DESPESAS PESSOAIS DOS SOCIOS ============
+
+def carregar_despesas_pessoais():
+    """Carrega despesas pessoais do espelho local/Google Sheets (aba DespesasPessoais)."""
+    try:
+        all_values = ler_aba("DespesasPessoais")
+        if all_values is not None:
+            if len(all_values) > 1:
+                df = tabela_para_df(all_values, ('valor',))
+                if 'data' in df.columns:
+                    df['data'] = pd.to_datetime(df['data']).dt.date
+                return df
+            return pd.DataFrame(columns=DESPESAS_PESSOAIS_COLUNAS)
+    except Exception as e:
+        pass
+    
+    return pd.DataFrame(columns=DESPESAS_PESSOAIS_COLUNAS)
+
+
+def salvar_despesa_pessoal(data, descricao, valor, socio, categoria="Geral"):
+    """Adiciona uma nova despesa pessoal (espelho local -> Google Sheets)."""
+    try:
+        _garantir_aba_local("DespesasPessoais")
+        local_store.anexar_linha("DespesasPessoais", [
+            str(data),
+            descricao,
+            float(valor),
+            socio,
+            categoria
+        ], enviar=_sheets_configurado())
+        invalidar_cache_aba("DespesasPessoais")
+        return True
+    except Exception as e:
+        pass
+    return False
+
+
+def limpar_despesas_pessoais_socio(socio):
+    """Limpa todas as despesas pessoais de um socio."""
+    try:
+        all_data = _garantir_aba_local("DespesasPessoais")
+        
+        if len(all_data) <= 1:
+            return True
+        
+        # Filtra mantendo apenas despesas de outros socios
+        header = all_data[0]
+        socio_idx = header.index('socio') if 'socio' in header else 3
+        
+        new_data = [header]
+        for row in all_data[1:]:
+            if len(row) > socio_idx and row[socio_idx] != socio:
+                new_data.append(row)
+        
+        local_store.substituir_aba("DespesasPessoais", new_data, enviar=_sheets_configurado())
+        invalidar_cache_aba("DespesasPessoais")
+        
+        return True
+    except:
+        pass
+    return False
+
+
+def parse_float_br(valor):
+    """
+    Converte valor numérico que pode estar em formato BR (vírgula decimal).
+    Trata tanto float direto quanto string formatada.
+    """
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if not valor or valor == '':
+        return 0.0
+    # Converte string - remove pontos de milhar e troca vírgula por ponto
+    s = str(valor).strip()
+    # Se tem vírgula e ponto, assume formato BR (1.234,56)
+    if ',' in s and '.' in s:
+        s = s.replace('.', '').replace(',', '.')
+    # Se só tem vírgula, assume decimal BR (123,45)
+    elif ',' in s:
+        s = s.replace(',', '.')
+    try:
+        return float(s)
+    except:
+        return 0.0
+
+
+def parse_float_br_series(serie):
+    """
+    Versao vetorizada de parse_float_br para uma coluna inteira.
+    Fast path: valores que ja sao numericos (ou string com ponto decimal)
+    saem direto do pd.to_numeric; so as strings em formato BR passam pelas
+    operacoes de string (tira pontos de milhar, troca virgula por ponto).
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float).fillna(0.0)
+
+    numeros = pd.to_numeric(serie, errors='coerce')
+    pendentes = numeros.isna() & serie.notna()
+    if pendentes.any():
+        s = serie[pendentes].astype(str).str.strip()
+        tem_virgula = s.str.contains(',', regex=False)
+        # Se tem virgula e ponto, assume formato BR (1.234,56)
+        formato_br = tem_virgula & s.str.contains('.', regex=False)
+        s = s.where(~formato_br, s.str.replace('.', '', regex=False))
+        s = s.str.replace(',', '.', regex=False)
+        numeros[pendentes] = pd.to_numeric(s, errors='coerce')
+    return numeros.astype(float).fillna(0.0)
+
+
+def tabela_para_df(all_values, colunas_float=()):
+    """
+    Monta um DataFrame direto das linhas de get_all_values() (linha 1 = cabecalho)
+    e converte as colunas float de forma vetorizada (usado pelas despesas, que
+    ja trabalham em DataFrame).
+    Linhas mais curtas que o cabecalho sao descartadas.
+    """
+    if not all_values:
+        return pd.DataFrame()
+    headers = all_values[0]
+    n = len(headers)
+    linhas = [r if len(r) == n else r[:n] for r in all_values[1:] if len(r) >= n]
+    df = pd.DataFrame(linhas, columns=headers)
+    for col in colunas_float:
+        if col in df.columns:
+            df[col] = parse_float_br_series(df[col])
+    return df
+
+
+def _converter_produto(item):
+    """Converte tipos numéricos de uma linha de produto com suporte a formato BR."""
+    item['id'] = int(item.get('id', 0) or 0)
+    item['quantidade_gramas'] = parse_float_br(item.get('quantidade_gramas', 0))
+    item['quantidade_inicial'] = parse_float_br(item.get('quantidade_inicial', 0))
+    item['preco_compra_total'] = parse_float_br(item.get('preco_compra_total', 0))
+    item['vendido_gramas'] = parse_float_br(item.get('vendido_gramas', 0))
+    return item
+
+
+def _converter_venda(item):
+    """Converte tipos numéricos de uma linha de venda com suporte a formato BR."""
+    item['id'] = int(item.get('id', 0) or 0)
+    item['produto_id'] = int(item.get('produto_id', 0) or 0)
+    item['gramas'] = parse_float_br(item.get('gramas', 0))
+    item['valor_venda'] = parse_float_br(item.get('valor_venda', 0))
+    item['custo'] = parse_float_br(item.get('custo', 0))
+    item['lucro'] = parse_float_br(item.get('lucro', 0))
+    return item
+
+
+def _linha_produto(p):
+    """Serializa um produto na ordem de PRODUTOS_COLUNAS."""
+    return [
+        p.get('id', 0),
+        p.get('nome', ''),
+        p.get('descricao', ''),
+        float(p.get('quantidade_gramas', 0)),
+        float(p.get('quantidade_inicial', 0)),
+        float(p.get('preco_compra_total', 0)),
+        float(p.get('vendido_gramas', 0)),
+        p.get('data_cadastro', '')
+    ]
+
+
+def _linha_venda(v):
+    """Serializa uma venda na ordem de VENDAS_COLUNAS."""
+    return [
+        v.get('id', 0),
+        v.get('produto_id', 0),
+        v.get('produto_nome', ''),
+        v.get('cliente', ''),
+        float(v.get('gramas', 0)),
+        float(v.get('valor_venda', 0)),
+        float(v.get('custo', 0)),
+        float(v.get('lucro', 0)),
+        v.get('data', '')
+    ]
+
+
+def carregar_produtos():
+    """Carrega produtos do espelho local/Google Sheets ou arquivo JSON legado."""
+    try:
+        # Linhas no formato get_all_values para ter controle total sobre parsing
+        all_values = ler_aba("Produtos")
+        if all_values is not None:
+            if len(all_values) <= 1:  # Só header ou vazio
+                return []
+            
+            headers = all_values[0]
+            return [
+                _converter_produto(dict(zip(headers, row)))
+                for row in all_values[1:] if len(row) >= len(headers)
+            ]
+    except:
+        pass
+    
+    # Fallback para arquivo local
+    if os.path.exists(PRODUTOS_FILE):
+        try:
+            with open(PRODUTOS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            return []
+    return []
+
+
+def salvar_produtos(produtos):
+    """Salva produtos no espelho local (o worker envia ao Google Sheets) ou JSON local."""
+    try:
+        local_store.substituir_aba(
+            "Produtos", [PRODUTOS_COLUNAS] + [_linha_produto(p) for p in produtos],
+            enviar=_sheets_configurado()
+        )
+        invalidar_cache_aba("Produtos")
+        return
+    except:
+        pass
+    
+    # Fallback para arquivo local
+    with open(PRODUTOS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(produtos, f, indent=2, ensure_ascii=False)
+
+
+
+def carregar_vendas():
+    """Carrega vendas do espelho local/Google Sheets ou arquivo JSON legado."""
+    try:
+        # Linhas no formato get_all_values para ter controle total sobre parsing
+        all_values = ler_aba("Vendas")
+        if all_values is not None:
+            if len(all_values) <= 1:  # Só header ou vazio
+                return []
+            
+            headers = all_values[0]
+            return [
+                _converter_venda(dict(zip(headers, row)))
+                for row in all_values[1:] if len(row) >= len(headers)
+            ]
+    except:
+        pass
+    
+    # Fallback para arquivo local
+    if os.path.exists(VENDAS_FILE):
+        try:
+            with open(VENDAS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            return []
+    return []
+
+
+def salvar_vendas(vendas):
+    """Salva vendas no espelho local (o worker envia ao Google Sheets) ou JSON local."""
+    try:
+        local_store.substituir_aba(
+            "Vendas", [VENDAS_COLUNAS] + [_linha_venda(v) for v in vendas],
+            enviar=_sheets_configurado()
+        )
+        invalidar_cache_aba("Vendas")
+        return
+    except:
+        pass
+    
+    # Fallback para arquivo local
+    with open(VENDAS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(vendas, f, indent=2, ensure_ascii=False)
+
+
+def adicionar_produto(nome, quantidade_gramas, preco_compra, descricao=""):
+    """Adiciona novo produto ao estoque"""
+    produtos = carregar_produtos()
+    novo_produto = {
+        'id': len(produtos) + 1 if produtos else 1,
+        'nome': nome,
+        'descricao': descricao,
+        'quantidade_gramas': quantidade_gramas,
+        'quantidade_inicial': quantidade_gramas,
+        'preco_compra_total': preco_compra,
+        'vendido_gramas': 0,
+        'data_cadastro': datetime.now().isoformat()
+    }
+    produtos.append(novo_produto)
+    salvar_produtos(produtos)
+    return novo_produto
+
+
+def _aplicar_venda(produto, gramas_vendidas, valor_venda, cliente, venda_id):
+    """
+    Valida estoque, atualiza o produto em memoria e monta o registro da venda.
+    Retorna (sucesso, mensagem, nova_venda).
+    """
+    # Verifica estoque
+    if produto['quantidade_gramas'] < gramas_vendidas:
+        return False, f"Estoque insuficiente. Disponível: {produto['quantidade_gramas']}g", None
+
+    # Calcula custo proporcional e lucro
+    custo_por_grama = produto['preco_compra_total'] / produto['quantidade_inicial']
+    custo_venda = custo_por_grama * gramas_vendidas
+    lucro = valor_venda - custo_venda
+
+    # Atualiza estoque
+    produto['quantidade_gramas'] -= gramas_vendidas
+    produto['vendido_gramas'] += gramas_vendidas
+
+    nova_venda = {
+        'id': venda_id,
+        'produto_id': produto['id'],
+        'produto_nome': produto['nome'],
+        'cliente': cliente,
+        'gramas': gramas_vendidas,
+        'valor_venda': valor_venda,
+        'custo': custo_venda,
+        'lucro': lucro,
+        'data': datetime.now().isoformat()
+    }
+    return True, "Venda registrada com sucesso!", nova_venda
+
+
+def _registrar_venda_delta(produto_id, gramas_vendidas, valor_venda, cliente):
+    """
+    Persistencia delta: busca o produto pelo id, atualiza so a linha dele e
+    anexa so a venda nova no espelho local (sem ler as abas inteiras). O
+    worker envia isso ao Sheets como 1 update por range + 1 append,
+    independente do tamanho do historico.
+    """
+    encontrado = local_store.buscar_linha("Produtos", produto_id)
+    if encontrado is None:
+        return False, "Produto não encontrado"
+
+    linha, valores = encontrado
+    produto = _converter_produto(dict(zip(local_store.cabecalho("Produtos"), valores)))
+
+    venda_id = (local_store.maior_chave("Vendas") or 0) + 1
+
+    sucesso, msg, nova_venda = _aplicar_venda(produto, gramas_vendidas, valor_venda, cliente, venda_id)
+    if not sucesso:
+        return False, msg
+
+    enviar = _sheets_configurado()
+    local_store.atualizar_linha("Produtos", linha, _linha_produto(produto), enviar=enviar)
+    local_store.anexar_linha("Vendas", _linha_venda(nova_venda), enviar=enviar)
+    invalidar_cache_aba("Produtos", "Vendas")
+
+    return True, msg
+
+
+def registrar_venda(produto_id, gramas_vendidas, valor_venda, cliente=""):
+    """
+    Registra uma venda parcial e atualiza estoque.
+    Usa escrita delta no espelho local; sem copia local (dados so nos arquivos
+    legados) faz o caminho completo, que migra as abas para o espelho.
+    Erro no caminho delta nao cai no completo: parte da venda pode ja ter
+    sido gravada, e refazer tudo baixaria o estoque duas vezes.
+    """
+    try:
+        # Semeia do Sheets as abas que ainda nao existem localmente
+        no_espelho = all(
+            local_store.cabecalho(nome_aba) is not None or ler_aba(nome_aba) is not None
+            for nome_aba in ("Produtos", "Vendas")
+        )
+        if no_espelho:
+            return _registrar_venda_delta(produto_id, gramas_vendidas, valor_venda, cliente)
+    except Exception as e:
+        return False, f"Erro ao registrar venda: {e}"
+
+    # Fallback para arquivos locais
+    produtos = carregar_produtos()
+    vendas = carregar_vendas()
+
+    # Encontra produto
+    produto = next((p for p in produtos if p['id'] == produto_id), None)
+    if not produto:
+        return False, "Produto não encontrado"
+
+    venda_id = len(vendas) + 1 if vendas else 1
+    sucesso, msg, nova_venda = _aplicar_venda(produto, gramas_vendidas, valor_venda, cliente, venda_id)
+    if not sucesso:
+        return False, msg
+
+    vendas.append(nova_venda)
+
+    salvar_produtos(produtos)
+    salvar_vendas(vendas)
+
+    return True, msg
+
+
+def remover_produto(produto_id):
+    """Remove produto do estoque"""
+    produtos = carregar_produtos()
+    produtos = [p for p in produtos if p['id'] != produto_id]
+    salvar_produtos(produtos)
+    return True
@@ -0,0 +1,133 @@
+"""
+Graficos (Plotly) das abas, com cache.
+
+Cada builder recebe so os dados ja agregados (tuplas, hashaveis) e devolve
+a go.Figure pronta via st.cache_resource: a chave do cache e o hash desses
+agregados, que ja refletem o filtro selecionado. Um rerun causado por outro
+widget (mesmos agregados) recebe o mesmo objeto, sem montar a figura com
+px/go nem validar de novo (st.cache_data devolveria uma copia, e refazer a
+figura a partir do JSON roda a validacao inteira do Plotly). As figuras
+sao compartilhadas: quem desenha nao deve altera-las.
+
+O Plotly so e importado dentro das funcoes: o app sobe (e as abas sem
+grafico rodam) sem carregar o plotly.
+"""
+
+import streamlit as st
+import pandas as pd
+
+# Quantas variacoes (filtros/periodos) guardar por grafico
+FIGURAS_MAX_ENTRADAS = 32
+
+LAYOUT_TEMPORAL = dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(26,26,26,1)',
+    font=dict(color='#ffffff'),
+    height=300,
+    margin=dict(l=40, r=20, t=40, b=40),
+    xaxis=dict(gridcolor='#333333'),
+    yaxis=dict(gridcolor='#333333')
+)
+
+
+def mostrar_figura(figura):
+    """Desenha uma figura vinda do cache (go.Figure ja validada)."""
+    st.plotly_chart(figura, use_container_width=True)
+
+
+# ==================== REVENUE ====================
+
+@st.cache_resource(max_entries=FIGURAS_MAX_ENTRADAS, show_spinner=False)
+def figura_distribuicao_clientes(labels, values):
+    """Pizza (donut) da revenue dos top clientes."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Pie(
+        labels=list(labels),
+        values=list(values),
+        hole=0.4,
+        marker=dict(colors=px.colors.sequential.Viridis),
+        textinfo='label+percent',
+        textposition='auto',
+    )])
+
+    fig.update_layout(
+        showlegend=False,
+        height=350,
+        margin=dict(l=20, r=20, t=20, b=20),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#ffffff', size=10)
+    )
+    return fig
+
+
+@st.cache_resource(max_entries=FIGURAS_MAX_ENTRADAS, show_spinner=False)
+def figura_tokens_por_dia(datas, tokens):
+    """Area de tokens por dia do periodo."""
+    import plotly.express as px
+
+    df_timeline = pd.DataFrame({'Data': list(datas), 'Tokens': list(tokens)})
+
+    fig = px.area(
+        df_timeline,
+        x='Data',
+        y='Tokens',
+        title='Tokens por Dia',
+        color_discrete_sequence=['#00ff88']
+    )
+    fig.update_layout(**LAYOUT_TEMPORAL)
+    return fig
+
+
+@st.cache_resource(max_entries=FIGURAS_MAX_ENTRADAS, show_spinner=False)
+def figura_taxa_por_sessao(taxas):
+    """Barras de R$/hora por sessao (S1, S2, ...)."""
+    import plotly.express as px
+
+    df_taxa = pd.DataFrame({
+        'Sessão': [f"S{i+1}" for i in range(len(taxas))],
+        'R$/hora': list(taxas)
+    })
+
+    fig = px.bar(
+        df_taxa,
+        x='Sessão',
+        y='R$/hora',
+        title='Performance por Sessão (R$/hora)',
+        color='R$/hora',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(**LAYOUT_TEMPORAL, showlegend=False)
+    return fig
+
+
+# ==================== DASHBOARD ====================
+
+@st.cache_resource(max_entries=FIGURAS_MAX_ENTRADAS, show_spinner=False)
+def figura_composicao_receita(revenue, stock):
+    """Pizza (donut) Revenue x Stock."""
+    import plotly.express as px
+
+    receita_data = pd.DataFrame({
+        'Fonte': ['Revenue', 'Stock'],
+        'Valor': [revenue, stock]
+    })
+
+    fig = px.pie(
+        receita_data,
+        values='Valor',
+        names='Fonte',
+        color_discrete_sequence=['#00ff88', '#ffd700'],
+        hole=0.4
+    )
+
+    fig.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=20, r=20, t=40, b=20),
+        height=400
+    )
+    return fig
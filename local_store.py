@@ -0,0 +1,600 @@
+"""
+Espelho local (SQLite) das abas do Google Sheets.
+
+O SQLite e o caminho primario de leitura/escrita do dashboard:
+- leituras vem do arquivo local (sem rede);
+- escritas gravam no arquivo local e enfileiram uma operacao pendente;
+- um worker em background envia as pendencias ao Sheets em lote e,
+  periodicamente, puxa as abas sem pendencias para trazer edicoes remotas.
+
+Cada aba e guardada linha a linha (cabecalho em `abas`, dados em `linhas`,
+numeradas como na planilha), entao um append ou update grava so a linha
+afetada. A leitura devolve a lista de linhas de get_all_values()
+(linha 1 = cabecalho), entao o parsing dos loaders continua o mesmo.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "empire_local.db")
+
+# Coluna usada como chave das linhas (busca por id sem ler a aba inteira)
+COLUNA_CHAVE = "id"
+
+_lock = threading.RLock()
+_inicializado = False
+
+# aba -> linhas (cabecalho + dados) ja lidas do banco; atualizado junto com cada escrita
+_memoria: Dict[str, List[List[Any]]] = {}
+
+# aba -> {chave: numero da linha na planilha}, do ultimo pull/envio (evita ler a coluna id a cada envio)
+_linhas_remotas: Dict[str, Dict[int, int]] = {}
+
+
+def _conectar() -> sqlite3.Connection:
+    """Abre conexao com o banco local (cria as tabelas na primeira vez)."""
+    global _inicializado
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    if not _inicializado:
+        with _lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS abas (
+                    aba TEXT PRIMARY KEY,
+                    cabecalho TEXT NOT NULL,
+                    sincronizado_em REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS linhas (
+                    aba TEXT NOT NULL,
+                    numero INTEGER NOT NULL,
+                    chave INTEGER,
+                    valores TEXT NOT NULL,
+                    PRIMARY KEY (aba, numero)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_linhas_chave ON linhas (aba, chave)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pendentes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    aba TEXT NOT NULL,
+                    tipo TEXT NOT NULL,
+                    linha INTEGER,
+                    valores TEXT
+                )
+            """)
+            _migrar_tabelas_antigas(conn)
+            conn.commit()
+            _memoria.clear()
+            _linhas_remotas.clear()
+            _inicializado = True
+    return conn
+
+
+def _migrar_tabelas_antigas(conn: sqlite3.Connection) -> None:
+    """Converte o formato antigo (uma aba = um JSON em `tabelas`) para linhas."""
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tabelas'"
+    ).fetchone()
+    if not existe:
+        return
+    for aba, valores, sincronizado_em in conn.execute(
+        "SELECT aba, valores, sincronizado_em FROM tabelas"
+    ).fetchall():
+        _gravar_tabela(conn, aba, json.loads(valores), sincronizado_em)
+    conn.execute("DROP TABLE tabelas")
+    logger.info("Espelho local migrado para uma linha por registro")
+
+
+# ============================================================================
+# HELPERS DE ESCRITA NO GOOGLE SHEETS
+# ============================================================================
+
+def coluna_letra(n: int) -> str:
+    """Converte indice de coluna (1-based) para letra A1 (1 -> A, 27 -> AA)."""
+    letras = ""
+    while n > 0:
+        n, resto = divmod(n - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def escrever_tabela_sheets(ws, cabecalho: List[Any], linhas: Iterable[List[Any]]) -> None:
+    """
+    Reescreve a aba inteira (cabecalho + linhas) em uma unica chamada de range.
+    Substitui o padrao clear() + append_row() por linha, que fazia N requisicoes.
+    Usa RAW para preservar decimais corretamente.
+    """
+    valores = [list(cabecalho)] + [list(linha) for linha in linhas]
+    ultima_coluna = coluna_letra(len(cabecalho))
+
+    # Aba criada com 1000 linhas - expande o grid antes de escrever se precisar
+    if len(valores) > ws.row_count:
+        ws.add_rows(len(valores) - ws.row_count)
+
+    ws.update(
+        values=valores,
+        range_name=f"A1:{ultima_coluna}{len(valores)}",
+        value_input_option='RAW'
+    )
+
+    # Limpa linhas antigas que sobraram abaixo da tabela nova (escreve antes de limpar,
+    # assim uma falha no meio nunca deixa a aba vazia). O row_count do handle em
+    # cache pode estar defasado (append_row expande o grid sem avisar o handle),
+    # entao sempre tenta limpar.
+    try:
+        ws.batch_clear([f"A{len(valores) + 1}:{ultima_coluna}"])
+    except Exception:
+        # Range comeca depois do fim do grid: nao ha linhas antigas para limpar
+        if len(valores) < ws.row_count:
+            raise
+
+
+# ============================================================================
+# LEITURA / ESCRITA LOCAL
+# ============================================================================
+
+def _json(valores: Any) -> str:
+    return json.dumps(valores, ensure_ascii=False, default=str)
+
+
+def _chave(cabecalho: List[Any], linha: List[Any]) -> Optional[int]:
+    """Valor inteiro da coluna COLUNA_CHAVE na linha (None se nao tem)."""
+    if COLUNA_CHAVE not in cabecalho:
+        return None
+    idx = cabecalho.index(COLUNA_CHAVE)
+    try:
+        return int(linha[idx])
+    except (IndexError, TypeError, ValueError):
+        return None
+
+
+def _cabecalho(conn: sqlite3.Connection, aba: str) -> List[Any]:
+    row = conn.execute("SELECT cabecalho FROM abas WHERE aba = ?", (aba,)).fetchone()
+    if row is None:
+        raise KeyError(f"Aba '{aba}' nao existe no espelho local")
+    return json.loads(row[0])
+
+
+def ler_aba(aba: str) -> Optional[List[List[Any]]]:
+    """
+    Retorna as linhas da aba (cabecalho + dados) do espelho local.
+    Retorna None se a aba nunca foi sincronizada/criada localmente.
+    """
+    with _lock:
+        if not _inicializado:
+            _conectar().close()  # banco novo (DB_FILE trocado): zera a memoria
+        if aba not in _memoria:
+            conn = _conectar()
+            try:
+                row = conn.execute("SELECT cabecalho FROM abas WHERE aba = ?", (aba,)).fetchone()
+                if row is None:
+                    return None
+                _memoria[aba] = [json.loads(row[0])] + [
+                    json.loads(v) for (v,) in conn.execute(
+                        "SELECT valores FROM linhas WHERE aba = ? ORDER BY numero", (aba,)
+                    )
+                ]
+            finally:
+                conn.close()
+        # Copia: quem le pode alterar as linhas sem mexer no espelho
+        return [list(linha) for linha in _memoria[aba]]
+
+
+def cabecalho(aba: str) -> Optional[List[Any]]:
+    """Cabecalho da aba no espelho local (None se a aba nao existe)."""
+    conn = _conectar()
+    try:
+        return _cabecalho(conn, aba)
+    except KeyError:
+        return None
+    finally:
+        conn.close()
+
+
+def buscar_linha(aba: str, chave: int) -> Optional[Tuple[int, List[Any]]]:
+    """
+    Linha cuja coluna COLUNA_CHAVE vale `chave`: (numero da linha, valores).
+    Com ids repetidos vale a ultima linha, como em indice_linhas_por_id.
+    """
+    conn = _conectar()
+    try:
+        row = conn.execute(
+            "SELECT numero, valores FROM linhas WHERE aba = ? AND chave = ? ORDER BY numero DESC LIMIT 1",
+            (aba, int(chave))
+        ).fetchone()
+    finally:
+        conn.close()
+    return (row[0], json.loads(row[1])) if row else None
+
+
+def maior_chave(aba: str) -> Optional[int]:
+    """Maior valor da coluna COLUNA_CHAVE na aba (None se nao ha nenhum)."""
+    conn = _conectar()
+    try:
+        return conn.execute("SELECT MAX(chave) FROM linhas WHERE aba = ?", (aba,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _gravar_tabela(conn: sqlite3.Connection, aba: str, valores: List[List[Any]],
+                   sincronizado_em: Optional[float] = None) -> None:
+    cabecalho = list(valores[0]) if valores else []
+    conn.execute(
+        """
+        INSERT INTO abas (aba, cabecalho, sincronizado_em) VALUES (?, ?, ?)
+        ON CONFLICT(aba) DO UPDATE SET
+            cabecalho = excluded.cabecalho,
+            sincronizado_em = COALESCE(excluded.sincronizado_em, abas.sincronizado_em)
+        """,
+        (aba, _json(cabecalho), sincronizado_em)
+    )
+    conn.execute("DELETE FROM linhas WHERE aba = ?", (aba,))
+    conn.executemany(
+        "INSERT INTO linhas (aba, numero, chave, valores) VALUES (?, ?, ?, ?)",
+        (
+            (aba, numero, _chave(cabecalho, linha), _json(list(linha)))
+            for numero, linha in enumerate(valores[1:], start=2)
+        )
+    )
+    _memoria[aba] = [list(linha) for linha in valores] if valores else [[]]
+
+
+def _enfileirar(conn: sqlite3.Connection, aba: str, tipo: str,
+                linha: Optional[int] = None, valores: Any = None) -> None:
+    conn.execute(
+        "INSERT INTO pendentes (aba, tipo, linha, valores) VALUES (?, ?, ?, ?)",
+        (aba, tipo, linha, _json(valores))
+    )
+
+
+def substituir_aba(aba: str, valores: List[List[Any]], enviar: bool = True) -> None:
+    """
+    Substitui a aba inteira localmente e agenda reescrita completa no Sheets.
+    Com enviar=False (sem Google Sheets configurado) so grava localmente.
+    """
+    with _lock:
+        conn = _conectar()
+        try:
+            _gravar_tabela(conn, aba, valores)
+            # Reescrita completa engloba qualquer pendencia anterior da aba
+            conn.execute("DELETE FROM pendentes WHERE aba = ?", (aba,))
+            if enviar:
+                _enfileirar(conn, aba, "substituir")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def anexar_linha(aba: str, linha: List[Any], enviar: bool = True) -> int:
+    """
+    Adiciona uma linha no fim da aba local e agenda append (se `enviar`).
+    Retorna o numero da linha.
+    """
+    linha = list(linha)
+    with _lock:
+        conn = _conectar()
+        try:
+            cabecalho = _cabecalho(conn, aba)
+            numero = conn.execute(
+                "SELECT COALESCE(MAX(numero), 1) + 1 FROM linhas WHERE aba = ?", (aba,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO linhas (aba, numero, chave, valores) VALUES (?, ?, ?, ?)",
+                (aba, numero, _chave(cabecalho, linha), _json(linha))
+            )
+            if enviar:
+                _enfileirar(conn, aba, "anexar", numero, linha)
+            conn.commit()
+        finally:
+            conn.close()
+        if aba in _memoria:
+            _memoria[aba].append(linha)
+        return numero
+
+
+def atualizar_linha(aba: str, numero_linha: int, linha: List[Any], enviar: bool = True) -> None:
+    """
+    Substitui uma linha de dados (1-based, como na planilha) e agenda update
+    por range (se `enviar`).
+    """
+    linha = list(linha)
+    with _lock:
+        conn = _conectar()
+        try:
+            cabecalho = _cabecalho(conn, aba)
+            atualizadas = conn.execute(
+                "UPDATE linhas SET chave = ?, valores = ? WHERE aba = ? AND numero = ?",
+                (_chave(cabecalho, linha), _json(linha), aba, numero_linha)
+            ).rowcount
+            if not atualizadas:
+                raise IndexError(f"Linha {numero_linha} fora da aba '{aba}'")
+            if enviar:
+                _enfileirar(conn, aba, "atualizar", numero_linha, linha)
+            conn.commit()
+        finally:
+            conn.close()
+        if aba in _memoria:
+            _memoria[aba][numero_linha - 1] = linha
+
+
+def aplicar_remoto(aba: str, valores: List[List[Any]]) -> bool:
+    """
+    Grava no espelho a copia vinda do Sheets.
+    Ignora (retorna False) se a aba tem alteracoes locais ainda nao enviadas,
+    para nunca sobrescrever uma escrita local com dado antigo.
+    A posicao das linhas na planilha e guardada mesmo assim (usada no envio).
+    """
+    with _lock:
+        _lembrar_linhas_remotas(aba, valores)
+        conn = _conectar()
+        try:
+            pendente = conn.execute(
+                "SELECT 1 FROM pendentes WHERE aba = ? LIMIT 1", (aba,)
+            ).fetchone()
+            if pendente:
+                return False
+            _gravar_tabela(conn, aba, valores, sincronizado_em=time.time())
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+
+
+def total_pendentes() -> int:
+    """Quantidade de operacoes locais ainda nao enviadas ao Sheets."""
+    conn = _conectar()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM pendentes").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# SINCRONIZAÇÃO COM O GOOGLE SHEETS
+# ============================================================================
+
+def _abas_com_pendencias() -> List[str]:
+    conn = _conectar()
+    try:
+        return [r[0] for r in conn.execute("SELECT DISTINCT aba FROM pendentes")]
+    finally:
+        conn.close()
+
+
+def _remover_pendentes(ids: List[int]) -> None:
+    if not ids:
+        return
+    with _lock:
+        conn = _conectar()
+        try:
+            conn.executemany("DELETE FROM pendentes WHERE id = ?", [(i,) for i in ids])
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def _reescrever_aba(aba: str, ws) -> int:
+    """Manda o snapshot local inteiro (1 range) e remove as pendencias que ele cobre."""
+    # Snapshot e id maximo lidos juntos: o que entrar depois fica para o proximo ciclo
+    with _lock:
+        conn = _conectar()
+        try:
+            valores = ler_aba(aba)
+            max_id = conn.execute(
+                "SELECT MAX(id) FROM pendentes WHERE aba = ?", (aba,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    escrever_tabela_sheets(ws, valores[0], valores[1:])
+
+    with _lock:
+        _lembrar_linhas_remotas(aba, valores)
+        conn = _conectar()
+        try:
+            enviados = conn.execute(
+                "DELETE FROM pendentes WHERE aba = ? AND id <= ?", (aba, max_id)
+            ).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+    return enviados
+
+
+def _lembrar_linhas_remotas(aba: str, valores: List[List[Any]]) -> None:
+    """Guarda chave -> numero da linha a partir de uma copia inteira da aba na planilha."""
+    if not valores or COLUNA_CHAVE not in valores[0]:
+        _linhas_remotas.pop(aba, None)
+        return
+    cabecalho = valores[0]
+    linhas = {}
+    for numero, linha in enumerate(valores[1:], start=2):
+        chave = _chave(cabecalho, linha)
+        if chave is not None:
+            linhas[chave] = numero
+    _linhas_remotas[aba] = linhas
+
+
+def _linhas_remotas_por_chave(aba: str, ws, cabecalho: List[Any]) -> Dict[int, int]:
+    """
+    Mapa chave -> numero da linha na planilha. Vem do ultimo pull/envio; so
+    le a coluna id do Sheets (1 chamada) quando ainda nao ha mapa da aba.
+    """
+    with _lock:
+        if aba in _linhas_remotas:
+            return _linhas_remotas[aba]
+
+    coluna = cabecalho.index(COLUNA_CHAVE) + 1
+    linhas = {}
+    for numero, valor in enumerate(ws.col_values(coluna)[1:], start=2):
+        try:
+            linhas[int(valor)] = numero
+        except (TypeError, ValueError):
+            continue
+    with _lock:
+        _linhas_remotas[aba] = linhas
+    return linhas
+
+
+def _registrar_anexos_remotos(aba: str, resposta: Any, linhas: List[List[Any]]) -> None:
+    """
+    Atualiza o mapa com as linhas anexadas, pelo range que o Sheets devolve
+    no append (updates.updatedRange, ex: 'Vendas'!A102:I103). Sem range
+    legivel, esquece o mapa da aba (o proximo envio le a coluna id).
+    """
+    with _lock:
+        mapa = _linhas_remotas.get(aba)
+        if mapa is None:
+            return
+        try:
+            intervalo = resposta['updates']['updatedRange'].rsplit('!', 1)[-1]
+            primeira = int(''.join(c for c in intervalo.split(':')[0] if c.isdigit()))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            _linhas_remotas.pop(aba, None)
+            return
+        colunas = cabecalho(aba) or []
+        for numero, linha in enumerate(linhas, start=primeira):
+            chave = _chave(colunas, linha)
+            if chave is not None:
+                mapa[chave] = numero
+
+
+def enviar_pendentes(aba: str, ws) -> int:
+    """
+    Envia as pendencias de uma aba ao Sheets em lote:
+    - se houver reescrita completa, manda o snapshot local inteiro (1 range);
+    - senao, todos os appends num unico append_rows e todos os updates
+      num unico batch_update.
+    A linha de cada update e localizada pelo id na planilha, pelo mapa
+    id -> linha do ultimo pull/envio (alguem pode ter ordenado ou apagado
+    linhas na planilha); sem coluna id, ou com um id fora do mapa, a aba e
+    reescrita inteira. Caso comum: 1 append_rows + 1 batch_update.
+    Retorna quantas operacoes foram enviadas.
+    """
+    conn = _conectar()
+    try:
+        ops = conn.execute(
+            "SELECT id, tipo, linha, valores FROM pendentes WHERE aba = ? ORDER BY id", (aba,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    if not ops:
+        return 0
+
+    if any(tipo == "substituir" for _, tipo, _, _ in ops):
+        return _reescrever_aba(aba, ws)
+
+    # Appends primeiro: updates podem apontar para linhas recem-anexadas
+    anexos = [(op_id, json.loads(v)) for op_id, tipo, _, v in ops if tipo == "anexar"]
+    if anexos:
+        linhas_anexadas = [linha for _, linha in anexos]
+        resposta = ws.append_rows(linhas_anexadas, value_input_option='RAW')
+        _registrar_anexos_remotos(aba, resposta, linhas_anexadas)
+        _remover_pendentes([op_id for op_id, _ in anexos])
+
+    # Varios updates da mesma linha viram um so (vale o ultimo)
+    updates: Dict[int, List[Any]] = {}
+    ids_updates = []
+    for op_id, tipo, linha, v in ops:
+        if tipo == "atualizar":
+            updates[linha] = json.loads(v)
+            ids_updates.append(op_id)
+    if not updates:
+        return len(anexos)
+
+    cabecalho = ler_aba(aba)[0]
+    if COLUNA_CHAVE not in cabecalho:
+        return len(anexos) + _reescrever_aba(aba, ws)
+
+    remotas = _linhas_remotas_por_chave(aba, ws, cabecalho)
+    destinos = {}
+    for valores in updates.values():
+        numero = remotas.get(_chave(cabecalho, valores))
+        if numero is None:
+            return len(anexos) + _reescrever_aba(aba, ws)
+        destinos[numero] = valores
+
+    ws.batch_update(
+        [
+            {
+                'range': f"A{numero}:{coluna_letra(len(valores))}{numero}",
+                'values': [valores]
+            }
+            for numero, valores in sorted(destinos.items())
+        ],
+        value_input_option='RAW'
+    )
+    _remover_pendentes(ids_updates)
+
+    return len(anexos) + len(ids_updates)
+
+
+def sincronizar(abrir_aba: Callable[[str], Any], abas_pull: Iterable[str] = (),
+                puxar: bool = True) -> Dict[str, int]:
+    """
+    Um ciclo de sincronizacao: envia as pendencias e (opcionalmente) puxa
+    do Sheets as abas sem pendencias. Retorna contadores do ciclo.
+    """
+    resultado = {'enviadas': 0, 'puxadas': 0}
+
+    for aba in _abas_com_pendencias():
+        resultado['enviadas'] += enviar_pendentes(aba, abrir_aba(aba))
+
+    if puxar:
+        for aba in abas_pull:
+            valores = abrir_aba(aba).get_all_values()
+            if aplicar_remoto(aba, valores):
+                resultado['puxadas'] += 1
+
+    return resultado
+
+
+def iniciar_sincronizador(
+    abrir_aba: Callable[[str], Any],
+    abas_pull: Iterable[str],
+    intervalo_envio: float = 5,
+    intervalo_pull: float = 120,
+    ao_erro: Optional[Callable[[Exception], None]] = None
+) -> threading.Thread:
+    """
+    Inicia a thread (daemon) que envia pendencias a cada `intervalo_envio`
+    segundos e puxa as abas remotas a cada `intervalo_pull` segundos.
+    Falhas ficam no log e a pendencia e reenviada no proximo ciclo.
+    """
+    abas_pull = list(abas_pull)
+    parar = threading.Event()
+
+    def _loop():
+        ultimo_pull = 0.0
+        while not parar.is_set():
+            try:
+                puxar = time.time() - ultimo_pull >= intervalo_pull
+                resultado = sincronizar(abrir_aba, abas_pull, puxar=puxar)
+                if puxar:
+                    ultimo_pull = time.time()
+                if resultado['enviadas']:
+                    logger.info(f"Sheets sync: {resultado['enviadas']} operacoes enviadas")
+            except Exception as e:
+                logger.warning(f"Falha na sincronizacao com o Sheets: {e}")
+                if ao_erro:
+                    ao_erro(e)
+            parar.wait(intervalo_envio)
+
+    thread = threading.Thread(target=_loop, name="sheets-sync", daemon=True)
+    thread.parar = parar
+    thread.start()
+    return thread
@@ -0,0 +1,755 @@
+"""
+Revenue API do Empire Control.
+
+Chamadas HTTP da conta, sync incremental das transacoes, sessoes,
+analises (frame tipado + indice de agregados), snapshot compartilhado em
+disco e o agendador que sincroniza em segundo plano.
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+import requests
+
+# Historico de transacoes da Revenue API (SQLite, sync incremental)
+import revenue_store
+from dados import ler_segredo
+
+logger = logging.getLogger(__name__)
+
+# ==================== LOGIN VIA NAVEGADOR (LAZY) ====================
+# Selenium/Playwright ficam em browser_login.py e so sao importados quando
+# um desses fluxos e usado - nao pesam no start do app.
+
+def _browser_login():
+    """Importa o modulo de automacao de navegador sob demanda."""
+    import browser_login
+    return browser_login
+
+
+def fazer_login_playwright_stealth():
+    """Login manual no Playwright (stealth) e salva os cookies."""
+    try:
+        return _browser_login().fazer_login_playwright_stealth()
+    except ImportError as e:
+        return {'success': False, 'error': f'Playwright/Selenium nao instalado: {e}'}
+
+
+def fazer_login_interativo():
+    """Login manual no Chrome (Selenium) e salva os cookies."""
+    try:
+        return _browser_login().fazer_login_interativo()
+    except ImportError as e:
+        return {'success': False, 'error': f'Selenium nao instalado: {e}'}
+
+
+def fetch_stipchat_stats_com_cookies_salvos():
+    """Busca stats no navegador usando os cookies salvos."""
+    try:
+        return _browser_login().fetch_stipchat_stats_com_cookies_salvos()
+    except ImportError as e:
+        return {'success': False, 'error': f'Selenium nao instalado: {e}'}
+
+
+def fetch_stipchat_stats_selenium(username, password):
+    """Busca stats fazendo login automatico via Selenium."""
+    try:
+        return _browser_login().fetch_stipchat_stats_selenium(username, password)
+    except ImportError as e:
+        return {'success': False, 'error': f'Selenium nao instalado: {e}'}
+
+
+# ==================== HTTP DA REVENUE API ====================
+# Headers fixos de todas as chamadas a API (montados uma vez, na sessao HTTP)
+REVENUE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Referer': 'https://br.stripchat.com/earnings/tokens-history',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin'
+}
+
+
+# Espera maxima aceita de um Retry-After (segundos)
+REVENUE_RETRY_AFTER_MAX = 30
+
+
+@st.cache_resource
+def get_revenue_http():
+    """
+    Sessao HTTP compartilhada (keep-alive + pool de conexoes) para a Revenue API.
+    Repete automaticamente 429/5xx e falhas de conexao com backoff exponencial,
+    respeitando o Retry-After ate REVENUE_RETRY_AFTER_MAX segundos.
+    Uma sync de 50 paginas reusa a mesma conexao.
+    """
+    from http.cookiejar import DefaultCookiePolicy
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class RetryLimitado(Retry):
+        """Retry-After limitado a REVENUE_RETRY_AFTER_MAX (nao trava o script/scheduler)."""
+        def get_retry_after(self, response):
+            espera = super().get_retry_after(response)
+            return None if espera is None else min(espera, REVENUE_RETRY_AFTER_MAX)
+
+    retry = RetryLimitado(
+        total=4,
+        backoff_factor=0.5,  # 0.5s, 1s, 2s, 4s
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False  # Esgotou as tentativas: devolve a ultima resposta
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=10)
+
+    sessao = requests.Session()
+    sessao.mount('https://', adapter)
+    sessao.headers.update(REVENUE_HEADERS)
+    # Cookies vem sempre da chamada; a sessao nao guarda Set-Cookie entre usos
+    sessao.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return sessao
+
+
+def fetch_stipchat_stats_requests(session_key, all_cookies=None):
+    """
+    Usa requests com TODOS os cookies do browser.
+    """
+    try:
+        url = "https://br.stripchat.com/api/front/v3/config/initial"
+
+        params = {'requestPath': '/earnings/tokens-history'}
+
+        # Usa todos os cookies se fornecidos
+        if all_cookies:
+            cookies = all_cookies
+        else:
+            cookies = {
+                'platform_com_sessionId': session_key,
+                'localeDomain': 'br'
+            }
+
+        response = get_revenue_http().get(url, cookies=cookies, params=params, timeout=10)
+
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                user_data = data.get('initial', {}).get('client', {}).get('user', {})
+
+                if not user_data:
+                    return {'success': False, 'error': 'Usuario nao encontrado. Cookie invalido.'}
+
+                return {
+                    'success': True,
+                    'tokens': user_data.get('tokens', 0),
+                    'secondsOnline': 0,
+                    'username': user_data.get('username', ''),
+                    'data': data
+                }
+            except:
+                return {'success': False, 'error': 'Erro ao processar JSON'}
+        else:
+            return {'success': False, 'error': f'Status {response.status_code}'}
+
+    except Exception as e:
+        return {'success': False, 'error': f'Erro: {str(e)}'}
+
+
+def _buscar_janela_transacoes(url, cookies, inicio, fim, limit=200, max_paginas=50):
+    """
+    Pagina uma janela [inicio, fim] do endpoint de transacoes.
+    Retorna dict com transacoes, paginas, 'cheia' (bateu max_paginas e ainda
+    havia mais) e 'response' quando a API respondeu com erro (ja depois das
+    retentativas da sessao HTTP).
+    """
+    http = get_revenue_http()
+    transacoes_janela = []
+    offset = 0
+    pagina = 0
+
+    for pagina in range(max_paginas):
+        params = {
+            'from': inicio.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'until': fim.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'offset': offset,
+            'limit': limit
+        }
+
+        try:
+            response = http.get(url, cookies=cookies, params=params, timeout=15)
+        except requests.RequestException as e:
+            # Falha de rede mesmo apos as retentativas: devolve o que ja veio
+            return {'transacoes': transacoes_janela, 'paginas': pagina, 'cheia': False, 'response': None, 'erro': str(e)}
+
+        if response.status_code != 200:
+            return {'transacoes': transacoes_janela, 'paginas': pagina + 1, 'cheia': False, 'response': response}
+
+        transacoes = response.json().get('transactions', [])
+        transacoes_janela.extend(transacoes)
+
+        # Se retornou menos que o limit, nao ha mais paginas
+        if len(transacoes) < limit:
+            return {'transacoes': transacoes_janela, 'paginas': pagina + 1, 'cheia': False, 'response': None}
+
+        offset += limit  # Proxima pagina
+
+    return {'transacoes': transacoes_janela, 'paginas': pagina + 1, 'cheia': True, 'response': None}
+
+
+def fetch_transacoes_periodo(user_id, all_cookies, dias=30, desde=None, ate=None):
+    """
+    Busca transacoes detalhadas dos ultimos N dias (ou de [desde, ate], em UTC).
+    Endpoint: /api/front/users/{userId}/transactions
+    AGORA COM PAGINACAO COMPLETA!
+    Se uma janela bate o limite de paginas, ela e dividida ao meio e buscada
+    de novo - o historico nunca e truncado em silencio.
+    """
+    try:
+        # Calcula datas
+        from datetime import datetime, timedelta
+
+        agora = ate or datetime.utcnow()
+        inicio = desde or agora - timedelta(days=dias)
+
+        # Endpoint descoberto
+        url = f'https://br.stripchat.com/api/front/users/{user_id}/transactions'
+
+        # PAGINACAO: busca todas as transacoes, janela por janela
+        todas_transacoes = {}
+        paginas = 0
+        completo = True
+        janelas = [(inicio, agora)]
+
+        while janelas:
+            janela_inicio, janela_fim = janelas.pop()
+            resultado = _buscar_janela_transacoes(url, all_cookies, janela_inicio, janela_fim)
+            paginas += resultado['paginas']
+
+            if resultado['cheia'] and janela_fim - janela_inicio > timedelta(hours=1):
+                # Janela grande demais para o limite de paginas: divide e busca de novo
+                meio = janela_inicio + (janela_fim - janela_inicio) / 2
+                janelas.append((meio, janela_fim))
+                janelas.append((janela_inicio, meio))
+                continue
+
+            for trans in resultado['transacoes']:
+                todas_transacoes[revenue_store.chave_transacao(trans)] = trans
+
+            response = resultado['response']
+            erro_rede = resultado.get('erro')
+            if response is not None or erro_rede or resultado['cheia']:
+                completo = False
+
+            if response is not None or erro_rede:
+                # Erro na requisicao mas ja temos algumas transacoes
+                if todas_transacoes:
+                    break
+
+                if erro_rede:
+                    return {'success': False, 'error': f'Erro: {erro_rede}'}
+
+                # Debug: captura resposta de erro
+                try:
+                    error_body = response.text[:500]
+                except:
+                    error_body = "Não foi possível ler corpo da resposta"
+
+                return {
+                    'success': False,
+                    'error': f'Status {response.status_code}',
+                    'details': error_body,
+                    'url': response.url
+                }
+
+        return {
+            'success': True,
+            'transacoes': sorted(todas_transacoes.values(), key=lambda x: x['date']),
+            'total': len(todas_transacoes),
+            'paginas': paginas,
+            'completo': completo and not janelas,
+            'inicio': inicio,
+            'fim': agora
+        }
+
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f'Erro: {str(e)}'
+        }
+
+
+def sincronizar_transacoes(user_id, all_cookies, dias=30):
+    """
+    Sync incremental: pede a API so o que ainda nao esta no revenue_store
+    (a partir do ultimo sync completo, com uma pequena sobreposicao), faz merge
+    por id e devolve os ultimos N dias a partir do armazenamento local.
+    """
+    from datetime import datetime, timedelta
+
+    agora = datetime.utcnow()
+    inicio_desejado = agora - timedelta(days=dias)
+    sobreposicao = timedelta(minutes=10)  # Pega transacoes que chegaram atrasadas
+
+    estado = revenue_store.estado_sync(user_id)
+    if estado and estado['cobertura_inicio'] <= inicio_desejado:
+        janelas = [(estado['sincronizado_ate'] - sobreposicao, agora)]
+    elif estado:
+        # Periodo pedido comeca antes do que ja temos: completa as duas pontas
+        janelas = [
+            (inicio_desejado, estado['cobertura_inicio'] + sobreposicao),
+            (estado['sincronizado_ate'] - sobreposicao, agora),
+        ]
+    else:
+        janelas = [(inicio_desejado, agora)]
+
+    paginas = 0
+    novas = 0
+    for desde, ate in janelas:
+        resultado = fetch_transacoes_periodo(user_id, all_cookies, desde=desde, ate=ate)
+        if not resultado['success']:
+            return resultado
+
+        paginas += resultado['paginas']
+        novas += revenue_store.salvar_transacoes(user_id, resultado['transacoes'])
+
+        # So avanca o high-water mark se a janela veio inteira
+        if resultado['completo']:
+            revenue_store.registrar_sync(user_id, desde, ate)
+
+    transacoes = revenue_store.carregar_transacoes(
+        user_id, desde=inicio_desejado.strftime('%Y-%m-%dT%H:%M:%S')
+    )
+
+    return {
+        'success': True,
+        'transacoes': transacoes,
+        'total': len(transacoes),
+        'novas': novas,
+        'paginas': paginas
+    }
+
+
+def _instantes_ns(transacoes):
+    """Instante UTC (ns desde a epoca) de cada transacao, numa unica conversao."""
+    return pd.to_datetime([t['date'] for t in transacoes], utc=True, format='ISO8601').as_unit('ns').asi8
+
+
+def ordenar_transacoes(transacoes):
+    """
+    Nova lista com as transacoes em ordem cronologica (pelo instante UTC,
+    estavel). A ordem de texto da data nao basta quando ha fusos diferentes.
+    Nao altera a lista recebida.
+    """
+    import numpy as np
+
+    if not transacoes:
+        return list(transacoes)
+    return [transacoes[i] for i in np.argsort(_instantes_ns(transacoes), kind='stable')]
+
+
+def agrupar_por_sessoes(transacoes, gap_horas=1):
+    """
+    Agrupa transacoes em sessoes baseado em gaps de tempo.
+    Se passar mais de {gap_horas} hora(s) entre transacoes = sessao nova.
+
+    Uma passada vetorizada: as datas sao convertidas uma unica vez e o id da
+    sessao sai de um cumsum sobre os gaps. Cada sessao e um registro compacto
+    (inicio, fim, tokens_total, n_transacoes, duracao_segundos) com o intervalo
+    [idx_inicio, idx_fim) das suas transacoes em `transacoes`, que precisa vir
+    em ordem cronologica (ver ordenar_transacoes); senao levanta ValueError.
+    """
+    import numpy as np
+
+    if not transacoes:
+        return []
+
+    instantes = _instantes_ns(transacoes)
+    tokens = np.fromiter((t.get('tokens', 0) for t in transacoes), dtype=np.int64, count=len(transacoes))
+
+    if (np.diff(instantes) < 0).any():
+        raise ValueError("transacoes fora de ordem cronologica (use ordenar_transacoes)")
+
+    # Gap maior que limite = nova sessao
+    gap_limite = int(pd.Timedelta(hours=gap_horas).value)
+    nova_sessao = np.empty(len(instantes), dtype=bool)
+    nova_sessao[0] = True
+    nova_sessao[1:] = np.diff(instantes) > gap_limite
+
+    idx_inicio = np.flatnonzero(nova_sessao)
+    idx_fim = np.append(idx_inicio[1:], len(instantes))
+
+    tokens_total = np.add.reduceat(tokens, idx_inicio)
+    inicios = pd.DatetimeIndex(instantes[idx_inicio], tz='UTC').to_pydatetime()
+    fins = pd.DatetimeIndex(instantes[idx_fim - 1], tz='UTC').to_pydatetime()
+    duracoes = (instantes[idx_fim - 1] - instantes[idx_inicio]) / 1e9
+
+    return [
+        {
+            'inicio': inicios[i],
+            'fim': fins[i],
+            'tokens_total': int(tokens_total[i]),
+            'n_transacoes': int(idx_fim[i] - idx_inicio[i]),
+            'duracao_segundos': float(duracoes[i]),
+            'idx_inicio': int(idx_inicio[i]),
+            'idx_fim': int(idx_fim[i])
+        }
+        for i in range(len(idx_inicio))
+    ]
+
+
+def calcular_duracao_sessao_inteligente(sessao):
+    """
+    Calcula duracao real estimada da sessao.
+    Se duracao entre primeira e ultima transacao < 5min, assume pelo menos 30min de live.
+    """
+    duracao_transacoes = sessao['duracao_segundos']
+
+    # Se duracao muito curta (varias gorjetas rapidas), assume tempo minimo
+    if duracao_transacoes < 300:  # Menos de 5 minutos
+        return max(1800, duracao_transacoes)  # Minimo 30min
+    else:
+        # Adiciona 15min no final (geralmente continua transmitindo apos ultima gorjeta)
+        return duracao_transacoes + 900
+
+
+
+
+def montar_frame_transacoes(transacoes, sessoes):
+    """
+    Tabela tipada das transacoes (fonte unica das analises da aba Revenue):
+    timestamp (datetime64 UTC), username (category), tokens (int64) e
+    session_id (int32, posicao da sessao em `sessoes`). Mesma ordem de
+    `transacoes` (por data), entao o intervalo [idx_inicio, idx_fim) de
+    cada sessao vale tambem para as linhas do frame.
+    """
+    import numpy as np
+
+    n = len(transacoes)
+    session_id = np.zeros(n, dtype=np.int32)
+    for i, sessao in enumerate(sessoes):
+        session_id[sessao['idx_inicio']:sessao['idx_fim']] = i
+
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime([t['date'] for t in transacoes], utc=True, format='ISO8601').as_unit('ns'),
+        'username': pd.Categorical([t.get('username') or None for t in transacoes]),
+        'tokens': np.fromiter((t.get('tokens', 0) for t in transacoes), dtype=np.int64, count=n),
+        'session_id': session_id
+    })
+
+
+def faturamento_mensal_df(df_transacoes):
+    """
+    Performance por mes (pela data local de inicio de cada sessao):
+    tokens, dias trabalhados e sessoes, do mes mais recente para o mais antigo.
+    """
+    from dateutil import tz
+
+    por_sessao = df_transacoes.groupby('session_id').agg(
+        inicio=('timestamp', 'min'),
+        tokens=('tokens', 'sum')
+    )
+    inicio_local = por_sessao['inicio'].dt.tz_convert(tz.tzlocal())
+    por_sessao['mes'] = inicio_local.dt.strftime('%Y-%m')
+    por_sessao['dia'] = inicio_local.dt.date
+
+    return por_sessao.groupby('mes').agg(
+        tokens=('tokens', 'sum'),
+        dias=('dia', 'nunique'),
+        sessoes=('tokens', 'size')
+    ).sort_index(ascending=False)
+
+
+def construir_indice_revenue(df_transacoes, sessoes):
+    """
+    Indice de agregados da aba Revenue, montado uma vez por sync.
+
+    Os filtros de periodo sempre selecionam um intervalo continuo de sessoes
+    (ordenadas por data), entao basta:
+    - inicio/fim de cada sessao em ns UTC (busca binaria do intervalo)
+    - somas acumuladas de tokens e horas por sessao
+    - sessoes agrupadas por dia local (limites de cada dia no array)
+    - totais por cliente por sessao, por dia e do historico todo
+    Qualquer periodo vira um lookup de intervalo + merge de poucos baldes.
+    """
+    import numpy as np
+
+    n = len(sessoes)
+    tokens = np.fromiter((s['tokens_total'] for s in sessoes), dtype=np.int64, count=n)
+    horas = np.fromiter((calcular_duracao_sessao_inteligente(s) / 3600 for s in sessoes), dtype=np.float64, count=n)
+
+    # Dia local de cada sessao (pela data de inicio, como no breakdown)
+    dias = []
+    dia_limites = []
+    for i, sessao in enumerate(sessoes):
+        dia = sessao['inicio'].astimezone().date()
+        if not dias or dias[-1] != dia:
+            dias.append(dia)
+            dia_limites.append(i)
+    dia_limites.append(n)
+
+    # Totais por cliente em cada sessao: {username: [tokens, transacoes]}
+    por_sessao_cliente = df_transacoes.groupby(['session_id', 'username'], observed=True, dropna=False)['tokens'].agg(['sum', 'size'])
+    clientes_sessao = [{} for _ in range(n)]
+    for (sessao_id, username, tokens_cliente, qtd) in zip(
+        por_sessao_cliente.index.get_level_values(0),
+        por_sessao_cliente.index.get_level_values(1).astype(object).fillna('Anônimo'),
+        por_sessao_cliente['sum'].tolist(),
+        por_sessao_cliente['size'].tolist()
+    ):
+        clientes_sessao[sessao_id][username] = [tokens_cliente, qtd]
+
+    clientes_dia = [
+        _somar_clientes(clientes_sessao[dia_limites[d]:dia_limites[d + 1]])
+        for d in range(len(dias))
+    ]
+
+    return {
+        'inicio_ns': np.array([pd.Timestamp(s['inicio']).value for s in sessoes], dtype=np.int64),
+        'fim_ns': np.array([pd.Timestamp(s['fim']).value for s in sessoes], dtype=np.int64),
+        'tokens': tokens,
+        'tokens_acum': np.concatenate(([0], np.cumsum(tokens))),
+        'horas_acum': np.concatenate(([0.0], np.cumsum(horas))),
+        'dias': dias,
+        'dia_limites': np.array(dia_limites, dtype=np.int64),
+        'clientes_sessao': clientes_sessao,
+        'clientes_dia': clientes_dia,
+        'clientes_total': _somar_clientes(clientes_dia)
+    }
+
+
+def _somar_clientes(baldes):
+    """Merge de baldes {username: [tokens, transacoes]}."""
+    total = {}
+    for balde in baldes:
+        for username, (tokens, qtd) in balde.items():
+            info = total.get(username)
+            if info is None:
+                total[username] = [tokens, qtd]
+            else:
+                info[0] += tokens
+                info[1] += qtd
+    return total
+
+
+def top_clientes_k(totais, k):
+    """
+    Top K clientes por tokens a partir de {username: [tokens, transacoes]}
+    (baldes do indice ou merge deles). Heap de tamanho K: O(n log K), sem
+    ordenar todos os clientes. Retorna [(username, tokens, transacoes)].
+    """
+    import heapq
+
+    melhores = heapq.nlargest(k, totais.items(), key=lambda item: item[1][0])
+    return [(username, tokens, qtd) for username, (tokens, qtd) in melhores]
+
+
+def sessoes_no_periodo(indice, desde=None, ate=None, campo='fim'):
+    """
+    Intervalo [lo, hi) das sessoes cujo `campo` ('inicio' ou 'fim') esta
+    entre desde e ate (datetimes com timezone, inclusivos). Busca binaria.
+    """
+    import numpy as np
+
+    valores = indice['inicio_ns'] if campo == 'inicio' else indice['fim_ns']
+    lo = int(np.searchsorted(valores, pd.Timestamp(desde).value, side='left')) if desde is not None else 0
+    hi = int(np.searchsorted(valores, pd.Timestamp(ate).value, side='right')) if ate is not None else len(valores)
+    return lo, max(lo, hi)
+
+
+def resumo_periodo(indice, lo, hi):
+    """
+    Totais das sessoes [lo, hi) pelas somas acumuladas, mais o resumo por dia
+    (data, tokens, horas, sessoes) em ordem cronologica.
+    """
+    import numpy as np
+
+    tokens_acum = indice['tokens_acum']
+    horas_acum = indice['horas_acum']
+    limites = indice['dia_limites']
+
+    por_dia = []
+    if hi > lo:
+        # Dias tocados pelo intervalo (limites sao crescentes)
+        d_ini = int(np.searchsorted(limites, lo, side='right')) - 1
+        d_fim = int(np.searchsorted(limites, hi - 1, side='right')) - 1
+        for d in range(d_ini, d_fim + 1):
+            a = max(lo, int(limites[d]))
+            b = min(hi, int(limites[d + 1]))
+            por_dia.append({
+                'data': indice['dias'][d],
+                'tokens': int(tokens_acum[b] - tokens_acum[a]),
+                'horas': float(horas_acum[b] - horas_acum[a]),
+                'sessoes': b - a
+            })
+
+    return {
+        'tokens': int(tokens_acum[hi] - tokens_acum[lo]),
+        'horas': float(horas_acum[hi] - horas_acum[lo]),
+        'sessoes': hi - lo,
+        'por_dia': por_dia
+    }
+
+
+def clientes_periodo(indice, lo, hi):
+    """
+    Totais por cliente {username: [tokens, transacoes]} das sessoes [lo, hi):
+    dias inteiros vem do balde diario, sessoes das pontas do balde por sessao.
+    """
+    import numpy as np
+
+    if hi <= lo:
+        return {}
+    if lo == 0 and hi == len(indice['tokens']):
+        return indice['clientes_total']
+
+    limites = indice['dia_limites']
+    baldes = []
+    d_ini = int(np.searchsorted(limites, lo, side='right')) - 1
+    d_fim = int(np.searchsorted(limites, hi - 1, side='right')) - 1
+    for d in range(d_ini, d_fim + 1):
+        a = int(limites[d])
+        b = int(limites[d + 1])
+        if lo <= a and b <= hi:
+            baldes.append(indice['clientes_dia'][d])
+        else:
+            baldes.extend(indice['clientes_sessao'][max(lo, a):min(hi, b)])
+    return _somar_clientes(baldes)
+
+
+# ============ SYNC + SNAPSHOT DA REVENUE ============
+# Intervalo (segundos) do sync automatico da Revenue em segundo plano
+REVENUE_SYNC_INTERVALO = int(ler_segredo("revenue_sync_intervalo", 900))
+
+
+def processar_dados_revenue(stipchat_data, transacoes, dias):
+    """Sessoes, frame tipado e indice de agregados a partir das transacoes."""
+    transacoes = ordenar_transacoes(transacoes)
+    sessoes = agrupar_por_sessoes(transacoes, gap_horas=1)
+    df_transacoes = montar_frame_transacoes(transacoes, sessoes)
+    return {
+        # So o que a interface usa (o payload 'data' completo nao vai para o disco)
+        'stipchat_data': {
+            'tokens': stipchat_data.get('tokens', 0),
+            'username': stipchat_data.get('username', ''),
+            'secondsOnline': stipchat_data.get('secondsOnline', 0)
+        },
+        'transacoes': transacoes,
+        'sessoes': sessoes,
+        'df_transacoes': df_transacoes,
+        'indice': construir_indice_revenue(df_transacoes, sessoes),
+        'dias': dias,
+        'atualizado_em': datetime.now()
+    }
+
+
+def sincronizar_revenue(cookies_dict, dias=30):
+    """
+    Sync completo da Revenue: stats da conta + transacoes (incremental),
+    processamento das analises e gravacao do snapshot compartilhado.
+    Nao usa st.* - roda no agendador em segundo plano.
+    """
+    # 1. Busca dados basicos (tokens totais, user info)
+    result = fetch_stipchat_stats_requests(None, all_cookies=cookies_dict)
+    if not result['success']:
+        return {'success': False, 'etapa': 'stats', 'error': result['error']}
+
+    user_id = result['data']['initial']['client']['user']['id']
+
+    # 2. Busca historico de transacoes
+    transacoes_result = sincronizar_transacoes(user_id, cookies_dict, dias=dias)
+    if not transacoes_result['success']:
+        return {'success': False, 'etapa': 'transacoes', 'error': transacoes_result['error']}
+
+    # 3. Agrupa em sessoes + analises, e grava o snapshot
+    dados = processar_dados_revenue(result, transacoes_result['transacoes'], dias)
+    try:
+        revenue_store.salvar_snapshot(dados)
+    except Exception as e:
+        logger.warning(f"Erro ao salvar snapshot da Revenue: {e}")
+
+    return {'success': True, 'dados': dados}
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _snapshot_revenue(mtime):
+    """Snapshot lido do disco uma vez por versao do arquivo e compartilhado entre sessoes."""
+    return revenue_store.carregar_snapshot()
+
+
+def carregar_snapshot_revenue():
+    """Retorna (dados, mtime) do ultimo snapshot, ou (None, None)."""
+    mtime = revenue_store.snapshot_mtime()
+    if mtime is None:
+        return None, None
+    return _snapshot_revenue(mtime), mtime
+
+
+def aplicar_dados_revenue(dados, mtime=None):
+    """Coloca as analises (sync ou snapshot) no session_state da sessao."""
+    st.session_state.stipchat_data = dados['stipchat_data']
+    st.session_state.transacoes_raw = dados['transacoes']
+    st.session_state.sessoes_data = dados['sessoes']
+    st.session_state.df_transacoes = dados['df_transacoes']
+    st.session_state.indice_revenue = dados['indice']
+    st.session_state.revenue_atualizado_em = dados.get('atualizado_em')
+    if mtime is not None:
+        st.session_state.revenue_snapshot_mtime = mtime
+
+
+def _executar_sync_agendado(estado):
+    """Rodada do agendador: usa os cookies salvos mais recentes e o periodo pedido."""
+    cookies_dict = carregar_cookies_salvos()
+    if not cookies_dict:
+        return {'success': False, 'etapa': 'cookies', 'error': 'Nenhum cookie salvo'}
+
+    resultado = sincronizar_revenue(cookies_dict, dias=estado.get('dias', 30))
+    if not resultado['success']:
+        logger.warning(f"Sync da Revenue falhou ({resultado['etapa']}): {resultado['error']}")
+    # A interface le so o snapshot; nao segura os dados aqui
+    return {k: v for k, v in resultado.items() if k != 'dados'}
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar_agendador_revenue():
+    """
+    Inicia (uma vez por processo) o worker que sincroniza a Revenue a cada
+    REVENUE_SYNC_INTERVALO segundos e grava o snapshot compartilhado.
+    Se o snapshot atual ainda e recente, a primeira rodada espera o restante.
+    """
+    dados, mtime = carregar_snapshot_revenue()
+    idade = time.time() - mtime if mtime else REVENUE_SYNC_INTERVALO
+    return revenue_store.iniciar_agendador(
+        _executar_sync_agendado,
+        intervalo=REVENUE_SYNC_INTERVALO,
+        atraso_inicial=max(0, REVENUE_SYNC_INTERVALO - idade),
+        estado_inicial={'dias': dados.get('dias', 30) if dados else 30}
+    )
+
+
+# ==================== COOKIES DA CONTA ====================
+
+def salvar_cookies(cookies_dict):
+    """Salva cookies em arquivo JSON local"""
+    COOKIES_FILE = 'cookies_saved.json'
+    with open(COOKIES_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cookies_dict, f, indent=2)
+
+
+def carregar_cookies_salvos():
+    """Carrega cookies salvos do arquivo"""
+    COOKIES_FILE = 'cookies_saved.json'
+    if os.path.exists(COOKIES_FILE):
+        try:
+            with open(COOKIES_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            return None
+    return None
@@ -0,0 +1,283 @@
+"""
+Armazenamento local (SQLite) das transacoes da Revenue API.
+
+Guarda cada transacao uma unica vez (chave = id da transacao) e o estado
+da ultima sincronizacao completa por usuario (high-water mark), para que
+o sync so peca a API o que e novo. Guarda tambem o snapshot (pickle
+versionado) das analises ja calculadas, compartilhado por todas as sessoes.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "revenue_local.db")
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "revenue_snapshot.pkl")
+
+# Incrementar sempre que mudar o formato de transacoes/sessoes/indice
+SNAPSHOT_VERSAO = 3
+
+_lock = threading.RLock()
+_inicializado = False
+
+
+def _conectar() -> sqlite3.Connection:
+    """Abre conexao com o banco local (cria as tabelas na primeira vez)."""
+    global _inicializado
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    if not _inicializado:
+        with _lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transacoes (
+                    user_id TEXT NOT NULL,
+                    transacao_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (user_id, transacao_id)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_transacoes_data ON transacoes (user_id, data)"
+            )
+            if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+                _normalizar_datas(conn)
+                conn.execute("PRAGMA user_version = 1")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_estado (
+                    user_id TEXT PRIMARY KEY,
+                    cobertura_inicio TEXT NOT NULL,
+                    sincronizado_ate TEXT NOT NULL
+                )
+            """)
+            conn.commit()
+            _inicializado = True
+    return conn
+
+
+def data_utc(valor: Any) -> str:
+    """
+    Data ISO normalizada para UTC com largura fixa (2025-01-01T12:00:00.000000Z),
+    para que ORDER BY/comparacao de texto na coluna `data` siga a ordem do tempo.
+    Sem fuso, assume UTC. Valor que nao e ISO volta como veio.
+    """
+    texto = str(valor or '')
+    try:
+        instante = datetime.fromisoformat(texto.replace('Z', '+00:00'))
+    except ValueError:
+        return texto
+    if instante.tzinfo is None:
+        instante = instante.replace(tzinfo=timezone.utc)
+    return instante.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _normalizar_datas(conn: sqlite3.Connection) -> None:
+    """Migra a coluna `data` gravada como veio da API para data_utc()."""
+    linhas = conn.execute("SELECT user_id, transacao_id, data FROM transacoes").fetchall()
+    conn.executemany(
+        "UPDATE transacoes SET data = ? WHERE user_id = ? AND transacao_id = ?",
+        [(data_utc(data), user_id, transacao_id) for user_id, transacao_id, data in linhas]
+    )
+
+
+def chave_transacao(trans: Dict[str, Any]) -> str:
+    """Id da transacao; sem id, usa hash estavel do conteudo."""
+    if trans.get('id') is not None:
+        return str(trans['id'])
+    conteudo = json.dumps(trans, sort_keys=True, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+# ============================================================================
+# TRANSAÇÕES
+# ============================================================================
+
+def salvar_transacoes(user_id: Any, transacoes: Iterable[Dict[str, Any]]) -> int:
+    """Faz merge das transacoes (upsert por id). Retorna quantas eram novas."""
+    registros = [
+        (str(user_id), chave_transacao(t), data_utc(t.get('date')), json.dumps(t, ensure_ascii=False))
+        for t in transacoes
+    ]
+    if not registros:
+        return 0
+    with _lock:
+        conn = _conectar()
+        try:
+            antes = conn.execute(
+                "SELECT COUNT(*) FROM transacoes WHERE user_id = ?", (str(user_id),)
+            ).fetchone()[0]
+            conn.executemany(
+                """
+                INSERT INTO transacoes (user_id, transacao_id, data, payload) VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id, transacao_id) DO UPDATE SET
+                    data = excluded.data,
+                    payload = excluded.payload
+                """,
+                registros
+            )
+            depois = conn.execute(
+                "SELECT COUNT(*) FROM transacoes WHERE user_id = ?", (str(user_id),)
+            ).fetchone()[0]
+            conn.commit()
+            return depois - antes
+        finally:
+            conn.close()
+
+
+def carregar_transacoes(user_id: Any, desde: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Transacoes do usuario (ordenadas por data), opcionalmente a partir de `desde` (ISO)."""
+    conn = _conectar()
+    try:
+        if desde:
+            rows = conn.execute(
+                "SELECT payload FROM transacoes WHERE user_id = ? AND data >= ? ORDER BY data",
+                (str(user_id), data_utc(desde))
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT payload FROM transacoes WHERE user_id = ? ORDER BY data",
+                (str(user_id),)
+            ).fetchall()
+    finally:
+        conn.close()
+    return [json.loads(r[0]) for r in rows]
+
+
+# ============================================================================
+# ESTADO DA SINCRONIZAÇÃO (HIGH-WATER MARK)
+# ============================================================================
+
+def estado_sync(user_id: Any) -> Optional[Dict[str, datetime]]:
+    """
+    Retorna {'cobertura_inicio', 'sincronizado_ate'} (datetimes UTC naive):
+    o intervalo que ja foi baixado por completo. None se nunca sincronizou.
+    """
+    conn = _conectar()
+    try:
+        row = conn.execute(
+            "SELECT cobertura_inicio, sincronizado_ate FROM sync_estado WHERE user_id = ?",
+            (str(user_id),)
+        ).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return None
+    return {
+        'cobertura_inicio': datetime.fromisoformat(row[0]),
+        'sincronizado_ate': datetime.fromisoformat(row[1]),
+    }
+
+
+def registrar_sync(user_id: Any, inicio: datetime, fim: datetime) -> None:
+    """
+    Registra que o intervalo [inicio, fim] foi baixado por completo.
+    So chamar quando a busca terminou sem truncar/falhar.
+    """
+    with _lock:
+        conn = _conectar()
+        try:
+            conn.execute(
+                """
+                INSERT INTO sync_estado (user_id, cobertura_inicio, sincronizado_ate) VALUES (?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    cobertura_inicio = MIN(sync_estado.cobertura_inicio, excluded.cobertura_inicio),
+                    sincronizado_ate = MAX(sync_estado.sincronizado_ate, excluded.sincronizado_ate)
+                """,
+                (str(user_id), inicio.isoformat(), fim.isoformat())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# ============================================================================
+# SNAPSHOT DAS ANALISES (TRANSAÇÕES + SESSÕES JA CALCULADAS)
+# ============================================================================
+
+def salvar_snapshot(dados: Dict[str, Any]) -> None:
+    """Grava o snapshot em disco (arquivo temporario + rename, nunca fica pela metade)."""
+    conteudo = {
+        'versao': SNAPSHOT_VERSAO,
+        'salvo_em': datetime.utcnow(),
+        'dados': dados,
+    }
+    tmp = f"{SNAPSHOT_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with _lock:
+        with open(tmp, 'wb') as f:
+            pickle.dump(conteudo, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, SNAPSHOT_FILE)
+
+
+def carregar_snapshot() -> Optional[Dict[str, Any]]:
+    """Ultimo snapshot salvo; None se nao existe, esta corrompido ou e de outra versao."""
+    try:
+        with open(SNAPSHOT_FILE, 'rb') as f:
+            conteudo = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(conteudo, dict) or conteudo.get('versao') != SNAPSHOT_VERSAO:
+        return None
+    return conteudo['dados']
+
+
+def snapshot_mtime() -> Optional[float]:
+    """Data de modificacao do snapshot (para detectar que ha um mais novo)."""
+    try:
+        return os.path.getmtime(SNAPSHOT_FILE)
+    except OSError:
+        return None
+
+
+# ============================================================================
+# AGENDADOR (SYNC EM SEGUNDO PLANO)
+# ============================================================================
+
+def iniciar_agendador(
+    executar: Callable[[Dict[str, Any]], Dict[str, Any]],
+    intervalo: float = 900,
+    atraso_inicial: float = 0,
+    estado_inicial: Optional[Dict[str, Any]] = None
+) -> threading.Thread:
+    """
+    Inicia a thread (daemon) que chama executar(estado) a cada `intervalo`
+    segundos, fora do script do Streamlit. `thread.acordar.set()` antecipa a
+    proxima execucao; `thread.estado` guarda parametros (ex.: dias) e o
+    resultado da ultima rodada para a interface mostrar.
+    """
+    estado = dict(estado_inicial or {})
+    estado.update({'rodando': False, 'ultima_execucao': None, 'ultimo_resultado': None})
+    acordar = threading.Event()
+
+    def _loop():
+        espera = atraso_inicial
+        while True:
+            acordar.wait(espera)
+            acordar.clear()
+            estado['rodando'] = True
+            try:
+                estado['ultimo_resultado'] = executar(estado)
+            except Exception as e:
+                logger.warning(f"Falha no sync da Revenue em segundo plano: {e}")
+                estado['ultimo_resultado'] = {'success': False, 'etapa': 'erro', 'error': str(e)}
+            finally:
+                estado['rodando'] = False
+                estado['ultima_execucao'] = datetime.now()
+            espera = intervalo
+
+    thread = threading.Thread(target=_loop, name="revenue-sync", daemon=True)
+    thread.acordar = acordar
+    thread.estado = estado
+    thread.start()
+    return thread